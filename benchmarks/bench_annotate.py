@@ -0,0 +1,117 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for :meth:`cozmo.annotate.ImageAnnotator.annotate_image`.
+
+A synthetic QVGA camera image is annotated with three visible cubes, two
+faces and some static text, both at its original size and scaled up 2x as
+the viewers do.  Unchanged annotations are drawn from a cached overlay, so
+the cost of redrawing them is measured separately by moving the cubes
+every frame.  Finally three viewers annotate each new
+:class:`cozmo.world.CameraImage` at the same size, sharing the result.
+
+Run with ``python benchmarks/bench_annotate.py``
+'''
+
+import asyncio
+import time
+
+from PIL import Image
+
+from cozmo import annotate
+from cozmo import objects
+from cozmo import util
+from cozmo import world as cozmo_world
+
+
+class BenchCube(objects.LightCube):
+    # Skips LightCube's constructor, which needs a connected robot
+    last_observed_image_box = None
+    descriptive_name = 'LightCube1 id=1'
+
+    def __init__(self, box):
+        self.last_observed_image_box = box
+
+
+class BenchFace:
+    known_expression = 'happy'
+    expression_score = 80
+    name = 'Bench'
+
+    def __init__(self, face_id, box):
+        self.face_id = face_id
+        self.last_observed_image_box = box
+        x, y = box.top_left_x, box.top_left_y
+        self.left_eye = [util.Vector2(x + 10, y + 15), util.Vector2(x + 20, y + 15), util.Vector2(x + 15, y + 20)]
+        self.right_eye = [util.Vector2(x + 30, y + 15), util.Vector2(x + 40, y + 15), util.Vector2(x + 35, y + 20)]
+        self.nose = [util.Vector2(x + 25, y + 20), util.Vector2(x + 22, y + 30), util.Vector2(x + 28, y + 30)]
+        self.mouth = [util.Vector2(x + 15, y + 38), util.Vector2(x + 35, y + 38), util.Vector2(x + 25, y + 42)]
+
+
+class BenchWorld:
+    def __init__(self):
+        self.visible_objects = [BenchCube(util.ImageBox(20 + i * 90, 60, 70, 70)) for i in range(3)]
+        self.visible_faces = [BenchFace(i, util.ImageBox(40 + i * 140, 140, 50, 50)) for i in range(2)]
+        self.visible_pets = []
+
+
+def make_image():
+    return Image.linear_gradient('L').resize((320, 240)).convert('RGB')
+
+
+def run(repeat=200):
+    '''Returns (annotate ms, annotate scaled 2x ms, annotate with moving cubes ms,
+    three viewers annotating moving cubes ms).'''
+    loop = asyncio.new_event_loop()
+    try:
+        world = BenchWorld()
+        annotator = annotate.ImageAnnotator(world, loop=loop)
+        annotator.add_static_text('text', 'Benchmark', position=annotate.TOP_LEFT)
+        image = make_image()
+        results = []
+        for scale in (1, 2):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                annotator.annotate_image(image, scale=scale)
+            results.append((time.perf_counter() - start) * 1000 / repeat)
+
+        start = time.perf_counter()
+        for i in range(repeat):
+            for cube in world.visible_objects:
+                cube.last_observed_image_box = cube.last_observed_image_box._replace(top_left_y=60 + i % 2)
+            annotator.annotate_image(image, scale=1)
+        results.append((time.perf_counter() - start) * 1000 / repeat)
+
+        start = time.perf_counter()
+        for i in range(repeat):
+            for cube in world.visible_objects:
+                cube.last_observed_image_box = cube.last_observed_image_box._replace(top_left_y=60 + i % 2)
+            camera_image = cozmo_world.CameraImage(image, annotator, i)
+            for _ in range(3):
+                camera_image.annotate_image(scale=2)
+        results.append((time.perf_counter() - start) * 1000 / repeat)
+        return tuple(results)
+    finally:
+        loop.close()
+
+
+def main():
+    annotate_ms, scaled_ms, moving_ms, viewers_ms = run()
+    print('annotate_image 3 cubes 2 faces: %6.3f ms, scaled 2x %6.3f ms, moving cubes %6.3f ms' %
+          (annotate_ms, scaled_ms, moving_ms))
+    print('3 viewers of moving cubes scaled 2x: %6.3f ms per image' % viewers_ms)
+
+
+if __name__ == '__main__':
+    main()
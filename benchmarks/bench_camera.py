@@ -0,0 +1,107 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for the mini-JPEG to JPEG conversion in :mod:`cozmo.camera`.
+
+Synthetic gray and color payloads roughly the size of a QVGA frame are
+converted repeatedly and the achievable frames/sec reported.  The gray
+payload is also split into ImageChunk messages and reassembled by a
+:class:`cozmo.camera.Camera`, including the conversion but not decoding.
+
+Run with ``python benchmarks/bench_camera.py``
+'''
+
+import asyncio
+import time
+
+import numpy as np
+
+from cozmo import camera
+from cozmo._clad import _clad_to_game_cozmo
+
+
+# Approximate encoded sizes of a QVGA frame from the robot
+GRAY_PAYLOAD_SIZE = 8 * 1024
+COLOR_PAYLOAD_SIZE = 14 * 1024
+
+# The amount of image data in each ImageChunk message
+CHUNK_SIZE = 1024
+
+
+class BenchConn:
+    def send_msg(self, msg):
+        pass
+
+
+class BenchRobot:
+    conn = BenchConn()
+
+
+def make_mini(size, is_color, seed=0):
+    rng = np.random.RandomState(seed)
+    data = rng.randint(0, 256, size=size).astype(np.uint8)
+    data[0] = 1 if is_color else 0
+    data[-1] = 0
+    return data
+
+
+def run(convert, mini, width, height, repeat=200):
+    '''Returns frames/sec for ``convert`` over ``repeat`` calls.'''
+    start = time.perf_counter()
+    for _ in range(repeat):
+        convert(mini, width, height)
+    return repeat / (time.perf_counter() - start)
+
+
+def make_chunks(mini, image_id):
+    count = (len(mini) + CHUNK_SIZE - 1) // CHUNK_SIZE
+    return [_clad_to_game_cozmo.ImageChunk(
+                imageId=image_id,
+                imageEncoding=_clad_to_game_cozmo.ImageEncoding.JPEGMinimizedGray,
+                resolution=camera._clad_res.QVGA,
+                imageChunkCount=count,
+                chunkId=i,
+                data=mini[i * CHUNK_SIZE:(i + 1) * CHUNK_SIZE].tolist())
+            for i in range(count)]
+
+
+def run_reassembly(mini, repeat=200):
+    '''Returns frames/sec reassembling ``mini`` from ImageChunk messages.'''
+    loop = asyncio.new_event_loop()
+    try:
+        cam = camera.Camera(BenchRobot(), loop=loop)
+        cam.lazy_decoding_enabled = True
+        images = [make_chunks(mini, image_id) for image_id in range(2)]
+        start = time.perf_counter()
+        for i in range(repeat):
+            for chunk in images[i % 2]:
+                cam._recv_msg_image_chunk(None, msg=chunk)
+        return repeat / (time.perf_counter() - start)
+    finally:
+        loop.close()
+
+
+def main():
+    width, height = camera.RESOLUTIONS[camera._clad_res.QVGA]
+    gray = make_mini(GRAY_PAYLOAD_SIZE, False)
+    color = make_mini(COLOR_PAYLOAD_SIZE, True)
+    print('gray  %6d bytes %10.0f frames/sec' %
+          (len(gray), run(camera._minigray_to_jpeg, gray, width, height)))
+    print('color %6d bytes %10.0f frames/sec' %
+          (len(color), run(camera._minicolor_to_jpeg, color, width // 2, height)))
+    print('gray chunk reassembly %10.0f frames/sec' % run_reassembly(gray))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for CLAD frame decoding.
+
+Feeds a synthetic ~1MB burst of interleaved RobotState and ImageChunk frames
+to :class:`cozmo.clad_protocol.CLADProtocol` in a single ``data_received``
+call and reports decoded messages/sec.  The pre-offset parser (which re-sliced
+the receive buffer for every frame) is included for comparison.
+
+Full CLAD decoding of ImageChunk payloads dominates the first measurement, so
+a second "framing only" pass swaps in a trivial decode union to isolate the
+cost of splitting the stream into frames.
+
+Run with ``python benchmarks/bench_clad_protocol.py``
+'''
+
+import struct
+import time
+
+from cozmo import clad_protocol
+from cozmo._clad import _clad_to_game_cozmo, _clad_to_game_iface
+
+
+BURST_SIZE = 1024 * 1024
+
+
+def _frame(**kw):
+    msg_buf = _clad_to_game_iface.MessageEngineToGame(**kw).pack()
+    return struct.pack('H', len(msg_buf)) + msg_buf
+
+
+def make_burst(size=BURST_SIZE):
+    '''Returns (data, msg_count) for a burst of roughly ``size`` bytes.'''
+    pair = (_frame(RobotState=_clad_to_game_iface.RobotState()) +
+            _frame(ImageChunk=_clad_to_game_cozmo.ImageChunk(data=[0x55] * 1000)))
+    count = size // len(pair)
+    return pair * count, count * 2
+
+
+class CountingProtocol(clad_protocol.CLADProtocol):
+    clad_decode_union = _clad_to_game_iface.MessageEngineToGame
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def msg_received(self, msg):
+        self.count += 1
+
+
+class SlicingProtocol(CountingProtocol):
+    '''The original parser, which copies the remaining buffer per frame.'''
+
+    def data_received(self, data):
+        self._buf.extend(data)
+        while True:
+            msg = self.decode_msg()
+            if msg is None:
+                return
+            self.msg_received(msg)
+
+    def decode_msg(self):
+        if len(self._buf) < 2:
+            return None
+        msg_size = struct.unpack_from('H', self._buf)[0]
+        if len(self._buf) < 2 + msg_size:
+            return None
+        buf, self._buf = self._buf[2:2+msg_size], self._buf[2+msg_size:]
+        return self.clad_decode_union.unpack(buf)
+
+
+class _NullMsg:
+    tag_name = 'Null'
+
+
+class _NullUnion:
+    '''Stand-in decode union that skips CLAD unpacking entirely.'''
+    @staticmethod
+    def unpack(buf):
+        return _NullMsg
+
+
+def run(protocol_cls, data, expected_count, repeat=3, decode_union=None):
+    '''Returns the best messages/sec out of ``repeat`` runs.'''
+    best = None
+    for _ in range(repeat):
+        proto = protocol_cls()
+        if decode_union is not None:
+            proto.clad_decode_union = decode_union
+        start = time.perf_counter()
+        proto.data_received(data)
+        elapsed = time.perf_counter() - start
+        assert proto.count == expected_count
+        rate = expected_count / elapsed
+        best = rate if best is None else max(best, rate)
+    return best
+
+
+def main():
+    data, count = make_burst()
+    print('burst: %d bytes, %d messages' % (len(data), count))
+    for cls in (SlicingProtocol, CountingProtocol):
+        print('%-18s %10.0f msgs/sec' % (cls.__name__, run(cls, data, count)))
+
+    print('framing only:')
+    for cls in (SlicingProtocol, CountingProtocol):
+        rate = run(cls, data, count, decode_union=_NullUnion)
+        print('%-18s %10.0f msgs/sec' % (cls.__name__, rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for :meth:`cozmo.event.Dispatcher.dispatch_event`.
+
+Mimics RobotState traffic: an internal message event is dispatched to a
+robot-like dispatcher, which has a world-like child and a couple of
+registered handlers, and the resulting public event is dispatched on to
+listeners.  Reports events/sec including the time to drain the event loop.
+
+Run with ``python benchmarks/bench_event.py``
+'''
+
+import asyncio
+import time
+
+from cozmo import event
+
+
+class _MsgBenchRobotState(event.Event):
+    '''Internal protocol message'''
+    msg = 'Message data'
+
+
+class EvtBenchRobotStateUpdated(event.Event):
+    '''Robot state updated'''
+    robot = 'The robot'
+
+
+class BenchWorld(event.Dispatcher):
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self.count = 0
+
+    def _recv_default_handler(self, evt, **kw):
+        self.count += 1
+
+    def recv_default_handler(self, evt, **kw):
+        pass
+
+
+class BenchRobot(event.Dispatcher):
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self.world = BenchWorld(dispatch_parent=self, loop=self._loop)
+        self._add_child_dispatcher(self.world)
+        self.state = None
+
+    def _recv_msg_bench_robot_state(self, evt, *, msg):
+        self.state = msg
+        self.dispatch_event(EvtBenchRobotStateUpdated, robot=self)
+
+
+def make_robot(loop, num_handlers=2):
+    robot = BenchRobot(loop=loop)
+    for _ in range(num_handlers):
+        robot.add_event_handler(EvtBenchRobotStateUpdated, lambda evt, **kw: None)
+    return robot
+
+
+def run(num_events=20000):
+    '''Returns the events/sec achieved dispatching ``num_events`` messages.'''
+    loop = asyncio.new_event_loop()
+    try:
+        robot = make_robot(loop)
+
+        async def drain():
+            while robot.world.count < num_events:
+                await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        for i in range(num_events):
+            robot.dispatch_event(_MsgBenchRobotState, msg=i)
+        loop.run_until_complete(drain())
+        return num_events / (time.perf_counter() - start)
+    finally:
+        loop.close()
+
+
+def main():
+    print('RobotState-style dispatch %10.0f events/sec' % run())
+
+
+if __name__ == '__main__':
+    main()
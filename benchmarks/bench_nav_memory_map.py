@@ -0,0 +1,98 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for building and querying a :class:`cozmo.nav_memory_map.NavMemoryMapGrid`.
+
+A synthetic quad stream, similar in shape to a map Cozmo has explored for a
+while, is deserialized into a grid, queried with random points (individually, and
+as a 10k point batch such as a sampled trajectory) and rasterized at 10mm
+resolution.
+
+Run with ``python benchmarks/bench_nav_memory_map.py``
+'''
+
+import random
+import time
+
+import numpy as np
+
+from cozmo import nav_memory_map
+
+
+ROOT_DEPTH = 8
+ROOT_SIZE = 2560.0
+
+
+def make_quads(rng, depth, split_chance=0.6):
+    '''Returns a random depth-first list of (content, depth) leaf quads.'''
+    # the top few levels are always split, as in an explored map
+    if depth == 0 or (depth < ROOT_DEPTH - 2 and rng.random() > split_chance):
+        return [(rng.randrange(8), depth)]
+    quads = []
+    for _ in range(4):
+        quads.extend(make_quads(rng, depth - 1, split_chance))
+    return quads
+
+
+def build(quads):
+    grid = nav_memory_map.NavMemoryMapGrid(1, ROOT_DEPTH, ROOT_SIZE, 0.0, 0.0)
+    for content, depth in quads:
+        grid._add_quad(content, depth)
+    return grid
+
+
+def run(num_queries=100000, seed=0):
+    '''Returns (quad count, builds/sec, queries/sec, batch ms, rasterizations/sec).'''
+    rng = random.Random(seed)
+    quads = make_quads(rng, ROOT_DEPTH)
+
+    repeat = 5
+    start = time.perf_counter()
+    for _ in range(repeat):
+        grid = build(quads)
+    builds_per_sec = repeat / (time.perf_counter() - start)
+
+    half = ROOT_SIZE * 0.5
+    points = [(rng.uniform(-half, half), rng.uniform(-half, half)) for _ in range(num_queries)]
+    start = time.perf_counter()
+    for x, y in points:
+        grid.get_content(x, y)
+    queries_per_sec = num_queries / (time.perf_counter() - start)
+
+    xs = np.array([x for x, y in points[:10000]])
+    ys = np.array([y for x, y in points[:10000]])
+    repeat = 20
+    start = time.perf_counter()
+    for _ in range(repeat):
+        grid.get_content_many(xs, ys)
+    batch_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        # bypass the cache in to_grid
+        grid._rasterize(10.0, None)
+    rasters_per_sec = repeat / (time.perf_counter() - start)
+
+    return len(quads), builds_per_sec, queries_per_sec, batch_ms, rasters_per_sec
+
+
+def main():
+    num_quads, builds_per_sec, queries_per_sec, batch_ms, rasters_per_sec = run()
+    print('%d quads: %8.1f builds/sec %10.0f get_content/sec' %
+          (num_quads, builds_per_sec, queries_per_sec))
+    print('get_content_many 10k points %6.2f ms, to_grid %8.1f/sec' % (batch_ms, rasters_per_sec))
+
+
+if __name__ == '__main__':
+    main()
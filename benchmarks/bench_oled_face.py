@@ -0,0 +1,49 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for :func:`cozmo.oled_face.convert_image_to_screen_data`.
+
+Converts a synthetic gradient image the size of Cozmo's face (128 x 32, as
+returned by :func:`cozmo.oled_face.dimensions`) to screen data, as programs
+animating the face do for every frame.
+
+Run with ``python benchmarks/bench_oled_face.py``
+'''
+
+import time
+
+from PIL import Image
+
+from cozmo import oled_face
+
+
+def make_image():
+    return Image.linear_gradient('L').resize(oled_face.dimensions())
+
+
+def run(repeat=500):
+    '''Returns conversions/sec.'''
+    image = make_image()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        oled_face.convert_image_to_screen_data(image)
+    return repeat / (time.perf_counter() - start)
+
+
+def main():
+    print('convert_image_to_screen_data 128x32 %8.0f images/sec' % run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for :class:`cozmo.planning.GridPlanner`.
+
+Plans across a 2m x 2m map at 10mm resolution (a 200x200 grid) scattered
+with cubes, then measures replanning after the robot has moved along the
+route and a few more cells have become blocked.
+
+Run with ``python benchmarks/bench_planning.py``
+'''
+
+import random
+import time
+
+from cozmo import nav_memory_map
+from cozmo import planning
+from cozmo import util
+from cozmo.nav_memory_map import NodeContentTypes
+
+
+MAP_SIZE = 2000.0
+RESOLUTION = 10.0
+# deep enough that leaves are at least as fine as the planning grid
+ROOT_DEPTH = 8
+
+
+def make_map(blocked):
+    '''Returns a map with cubes in each blocked (col, row) cell, subdivided down
+    to 10mm leaves only around them, as the engine does.'''
+    size = 2560.0
+    grid = nav_memory_map.NavMemoryMapGrid(1, ROOT_DEPTH, size, 0.0, 0.0)
+    clear = NodeContentTypes.ClearOfCliff.id
+    cube = NodeContentTypes.ObstacleCube.id
+    half = MAP_SIZE * 0.5
+    leaf = size / (1 << ROOT_DEPTH)
+
+    def add(depth, x, y):
+        node_half = leaf * (1 << depth) * 0.5
+        if x + node_half <= -half or x - node_half >= half or y + node_half <= -half or y - node_half >= half:
+            # entirely outside the benchmark area, so leave it unknown
+            grid._add_quad(NodeContentTypes.Unknown.id, depth)
+            return
+        min_col = (x - node_half + half) // RESOLUTION
+        max_col = (x + node_half + half) // RESOLUTION
+        min_row = (y - node_half + half) // RESOLUTION
+        max_row = (y + node_half + half) // RESOLUTION
+        if not any(min_col <= col < max_col and min_row <= row < max_row for col, row in blocked):
+            grid._add_quad(clear, depth)
+            return
+        if depth == 0:
+            grid._add_quad(cube, 0)
+            return
+        offset = node_half * 0.5
+        add(depth - 1, x + offset, y + offset)
+        add(depth - 1, x + offset, y - offset)
+        add(depth - 1, x - offset, y + offset)
+        add(depth - 1, x - offset, y - offset)
+
+    add(ROOT_DEPTH, 0.0, 0.0)
+    return grid
+
+
+def random_cubes(rng, count):
+    blocked = set()
+    for _ in range(count):
+        col = rng.randrange(10, 185)
+        row = rng.randrange(10, 185)
+        for dc in range(5):
+            for dr in range(5):
+                blocked.add((col + dc, row + dr))
+    return blocked
+
+
+def run(seed=0):
+    '''Returns (setup ms, plan ms, replan ms).'''
+    rng = random.Random(seed)
+    blocked = random_cubes(rng, 60)
+    start = util.pose_z_angle(-950, -950, 0, util.degrees(0), origin_id=1)
+    goal = util.pose_z_angle(950, 950, 0, util.degrees(0), origin_id=1)
+
+    nav_map = make_map(blocked)
+    repeat = 5
+    setup = 0.0
+    elapsed = 0.0
+    for _ in range(repeat):
+        # bypass the cache in to_grid, so rasterizing is included in the setup
+        nav_map._raster_cache.clear()
+        t = time.perf_counter()
+        planner = planning.GridPlanner(nav_map, resolution_mm=RESOLUTION)
+        setup += time.perf_counter() - t
+        t = time.perf_counter()
+        path = planner.plan(start, goal)
+        elapsed += time.perf_counter() - t
+    setup_ms = setup * 1000 / repeat
+    plan_ms = elapsed * 1000 / repeat
+
+    # move 20 cells along the route, and block a cell a little further on
+    x, y = path.points[40]
+    blocked.add((int((x + MAP_SIZE * 0.5) // RESOLUTION), int((y + MAP_SIZE * 0.5) // RESOLUTION)))
+    planner.update_map(make_map(blocked))
+    moved = util.pose_z_angle(path.points[20][0], path.points[20][1], 0, util.degrees(0), origin_id=1)
+    t = time.perf_counter()
+    planner.plan(moved, goal)
+    replan_ms = (time.perf_counter() - t) * 1000
+
+    return setup_ms, plan_ms, replan_ms
+
+
+def main():
+    setup_ms, plan_ms, replan_ms = run()
+    print('2m x 2m at 10mm: setup %6.2f ms, plan %6.2f ms, replan %6.2f ms' % (setup_ms, plan_ms, replan_ms))
+
+
+if __name__ == '__main__':
+    main()
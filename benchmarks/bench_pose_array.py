@@ -0,0 +1,109 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark comparing :class:`cozmo.util.PoseArray` with per-Pose math.
+
+Transforms a batch of observed object poses into the robot's frame of
+reference, and converts them to matrices, one :class:`cozmo.util.Pose` at a
+time and then as a single :class:`cozmo.util.PoseArray`.  The PoseArray
+operations are timed on their own, and including converting from and to
+lists of poses.
+
+Run with ``python benchmarks/bench_pose_array.py``
+'''
+
+import math
+import random
+import time
+
+from cozmo import util
+
+
+def random_poses(rng, count):
+    return [util.pose_z_angle(rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(0, 50),
+                              util.radians(rng.uniform(-math.pi, math.pi)), origin_id=1)
+            for _ in range(count)]
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run(num_poses=500, repeat=50, seed=0):
+    '''Returns a list of (name, Pose ms, PoseArray ms, PoseArray with conversion ms) for each operation.'''
+    rng = random.Random(seed)
+    poses = random_poses(rng, num_poses)
+    robot = random_poses(rng, 1)[0]
+    pose_array = util.PoseArray.from_poses(poses)
+
+    def scalar_compose():
+        return [robot.define_pose_relative_this(pose) for pose in poses]
+
+    def array_compose():
+        return util.PoseArray.from_poses(poses).compose(robot).to_poses()
+
+    def scalar_relative():
+        # the inverse of define_pose_relative_this, done one pose at a time
+        angle = -robot.rotation.angle_z.radians
+        cos_angle = math.cos(angle)
+        sin_angle = math.sin(angle)
+        rx, ry, rz = robot.position.x_y_z
+        result = []
+        for pose in poses:
+            x, y, z = pose.position.x_y_z
+            dx = x - rx
+            dy = y - ry
+            result.append(util.pose_z_angle(cos_angle * dx - sin_angle * dy,
+                                            sin_angle * dx + cos_angle * dy, z - rz,
+                                            pose.rotation.angle_z - robot.rotation.angle_z))
+        return result
+
+    def array_relative():
+        return util.PoseArray.from_poses(poses).relative_to(robot).to_poses()
+
+    def array_distance():
+        return util.PoseArray.from_poses(poses).distance_to(robot)
+
+    def scalar_distance():
+        rx, ry, rz = robot.position.x_y_z
+        return [math.sqrt((p.position.x - rx) ** 2 + (p.position.y - ry) ** 2 + (p.position.z - rz) ** 2)
+                for p in poses]
+
+    def scalar_matrices():
+        return [pose.to_matrix() for pose in poses]
+
+    def array_matrices():
+        return util.PoseArray.from_poses(poses).to_matrices()
+
+    return [('compose', timed(scalar_compose, repeat),
+             timed(lambda: pose_array.compose(robot), repeat), timed(array_compose, repeat)),
+            ('relative_to', timed(scalar_relative, repeat),
+             timed(lambda: pose_array.relative_to(robot), repeat), timed(array_relative, repeat)),
+            ('distance_to', timed(scalar_distance, repeat),
+             timed(lambda: pose_array.distance_to(robot), repeat), timed(array_distance, repeat)),
+            ('to_matrix', timed(scalar_matrices, repeat),
+             timed(pose_array.to_matrices, repeat), timed(array_matrices, repeat))]
+
+
+def main():
+    for name, scalar_ms, array_ms, converting_ms in run():
+        print('%-12s 500 poses: Pose %7.3f ms, PoseArray %7.3f ms (%5.1fx), with conversion %7.3f ms' %
+              (name, scalar_ms, array_ms, scalar_ms / array_ms, converting_ms))
+
+
+if __name__ == '__main__':
+    main()
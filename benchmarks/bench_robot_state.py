@@ -0,0 +1,72 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for handling RobotState messages in :class:`cozmo.robot.Robot`.
+
+Dispatches synthetic RobotState messages to a robot, as the connection does
+for each one received, with a handler for
+:class:`cozmo.robot.EvtRobotStateUpdated` that reads the robot's pose and
+head angle.  Reports messages/sec with and without the handler.
+
+Run with ``python benchmarks/bench_robot_state.py``
+'''
+
+import asyncio
+import time
+
+from cozmo import _clad
+from cozmo import robot
+from cozmo._clad import _clad_to_game_anki, _clad_to_game_iface
+
+
+class BenchConn:
+    def send_msg(self, msg):
+        pass
+
+
+def make_robot_state(i):
+    return _clad_to_game_iface.RobotState(
+        pose=_clad_to_game_anki.PoseStruct3d(x=float(i), y=20.0, q0=1.0, originID=1),
+        headAngle_rad=0.3, liftHeight_mm=40.0, batteryVoltage=4.5)
+
+
+def run(num_messages=20000):
+    '''Returns (msgs/sec, msgs/sec with a handler reading the state).'''
+    loop = asyncio.new_event_loop()
+    try:
+        bench_robot = robot.Robot(BenchConn(), 1, True, loop=loop)
+        messages = [make_robot_state(i) for i in range(100)]
+        results = []
+        for with_handler in (False, True):
+            if with_handler:
+                def on_state(evt, **kw):
+                    evt.robot.pose
+                    evt.robot.head_angle
+                bench_robot.add_event_handler(robot.EvtRobotStateUpdated, on_state)
+            start = time.perf_counter()
+            for i in range(num_messages):
+                bench_robot.dispatch_event(_clad._MsgRobotState, msg=messages[i % 100])
+            results.append(num_messages / (time.perf_counter() - start))
+        return tuple(results)
+    finally:
+        loop.close()
+
+
+def main():
+    rate, handled_rate = run()
+    print('RobotState %10.0f msgs/sec, with handler %10.0f msgs/sec' % (rate, handled_rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Micro-benchmark for creating the :mod:`cozmo.util` value types.
+
+Measures the cost of building every value the robot exposes from a
+RobotState message, of decoding an observed object's pose, and of common
+Angle / Pose arithmetic, along with the memory allocated per RobotState.
+
+Run with ``python benchmarks/bench_util.py``
+'''
+
+import time
+import tracemalloc
+
+from cozmo import robot
+from cozmo import util
+from cozmo._clad import _clad_to_game_anki, _clad_to_game_iface
+
+
+def make_robot_state():
+    return _clad_to_game_iface.RobotState(
+        pose=_clad_to_game_anki.PoseStruct3d(x=10.0, y=20.0, z=0.5, q0=0.9, q1=0.0, q2=0.0, q3=0.43, originID=1),
+        poseAngle_rad=0.9, posePitch_rad=0.01, headAngle_rad=0.3, liftHeight_mm=40.0,
+        leftWheelSpeed_mmps=50.0, rightWheelSpeed_mmps=55.0)
+
+
+def build_robot_state(msg):
+    return [build(msg) for build in robot._robot_state_builders.values()]
+
+
+def timed(func, arg, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def run(repeat=20000):
+    '''Returns (RobotState us, object pose us, arithmetic us, bytes per RobotState).'''
+    msg = make_robot_state()
+    robot_state_us = timed(build_robot_state, msg, repeat)
+    object_pose_us = timed(util.Pose._create_from_clad, msg.pose, repeat)
+
+    a = util.pose_z_angle(10, 20, 0, util.degrees(30), origin_id=1)
+    b = util.pose_z_angle(5, -5, 0, util.degrees(10), origin_id=1)
+
+    def arithmetic(angle):
+        a.define_pose_relative_this(b)
+        (angle + angle) * 0.5 - angle
+        a.rotation.angle_z
+
+    arithmetic_us = timed(arithmetic, util.degrees(45), repeat)
+
+    count = 1000
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build_robot_state(msg) for _ in range(count)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+
+    return robot_state_us, object_pose_us, arithmetic_us, allocated / count
+
+
+def main():
+    robot_state_us, object_pose_us, arithmetic_us, bytes_per_state = run()
+    print('RobotState values %6.2f us (%d bytes), object pose %6.2f us, arithmetic %6.2f us' %
+          (robot_state_us, bytes_per_state, object_pose_us, arithmetic_us))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Runs the benchmark suite and compares the results with tracked baselines.
+
+Each ``bench_*.py`` script in this directory measures one of the SDK's hot
+paths using synthetic inputs, so the suite runs offline.  This script runs
+them all (or those named on the command line), reports every metric next to
+its baseline from ``baselines.json``, and exits with a non-zero status if
+any metric is more than ``--tolerance`` worse than its baseline.
+
+Each benchmark is run ``--repeat`` times and its best result kept, to
+reduce noise.  Rates (units ending in ``/s``) are better when higher, and
+times are better when lower.
+
+Baselines depend on the machine they were recorded on.  Record new ones
+with ``--save`` after a deliberate change to performance, or when moving to
+a different machine.
+
+Run with ``python benchmarks/run_benchmarks.py [--save] [--tolerance 0.25] [name ...]``
+'''
+
+import argparse
+import collections
+import json
+import os
+import platform
+import sys
+
+import bench_annotate
+import bench_camera
+import bench_clad_protocol
+import bench_event
+import bench_nav_memory_map
+import bench_oled_face
+import bench_planning
+import bench_pose_array
+import bench_robot_state
+import bench_util
+
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+#: A single result: the metric's name, its value and its unit.
+Metric = collections.namedtuple('Metric', 'name value unit')
+
+
+def clad_protocol_metrics():
+    data, count = bench_clad_protocol.make_burst()
+    decode = bench_clad_protocol.run(bench_clad_protocol.CountingProtocol, data, count)
+    framing = bench_clad_protocol.run(bench_clad_protocol.CountingProtocol, data, count,
+                                      decode_union=bench_clad_protocol._NullUnion)
+    return [Metric('decode', decode, 'msgs/s'), Metric('framing', framing, 'msgs/s')]
+
+
+def event_metrics():
+    return [Metric('dispatch', bench_event.run(), 'events/s')]
+
+
+def robot_state_metrics():
+    rate, handled_rate = bench_robot_state.run()
+    return [Metric('dispatch', rate, 'msgs/s'), Metric('dispatch_with_handler', handled_rate, 'msgs/s')]
+
+
+def util_metrics():
+    robot_state_us, object_pose_us, arithmetic_us, _ = bench_util.run()
+    return [Metric('robot_state_values', robot_state_us, 'us'),
+            Metric('object_pose', object_pose_us, 'us'),
+            Metric('arithmetic', arithmetic_us, 'us')]
+
+
+def camera_metrics():
+    width, height = bench_camera.camera.RESOLUTIONS[bench_camera.camera._clad_res.QVGA]
+    gray = bench_camera.make_mini(bench_camera.GRAY_PAYLOAD_SIZE, False)
+    color = bench_camera.make_mini(bench_camera.COLOR_PAYLOAD_SIZE, True)
+    return [Metric('minigray_to_jpeg',
+                   bench_camera.run(bench_camera.camera._minigray_to_jpeg, gray, width, height), 'frames/s'),
+            Metric('minicolor_to_jpeg',
+                   bench_camera.run(bench_camera.camera._minicolor_to_jpeg, color, width // 2, height),
+                   'frames/s'),
+            Metric('chunk_reassembly', bench_camera.run_reassembly(gray), 'frames/s')]
+
+
+def annotate_metrics():
+    annotate_ms, scaled_ms, moving_ms, viewers_ms = bench_annotate.run()
+    return [Metric('annotate_image', annotate_ms, 'ms'), Metric('annotate_image_scaled', scaled_ms, 'ms'),
+            Metric('annotate_image_moving', moving_ms, 'ms'), Metric('three_viewers', viewers_ms, 'ms')]
+
+
+def nav_memory_map_metrics():
+    _, builds_per_sec, queries_per_sec, batch_ms, rasters_per_sec = bench_nav_memory_map.run()
+    return [Metric('build', builds_per_sec, 'builds/s'),
+            Metric('get_content', queries_per_sec, 'queries/s'),
+            Metric('get_content_many', batch_ms, 'ms'),
+            Metric('to_grid', rasters_per_sec, 'grids/s')]
+
+
+def oled_face_metrics():
+    return [Metric('convert_image_to_screen_data', bench_oled_face.run(), 'images/s')]
+
+
+def planning_metrics():
+    setup_ms, plan_ms, replan_ms = bench_planning.run()
+    return [Metric('setup', setup_ms, 'ms'), Metric('plan', plan_ms, 'ms'), Metric('replan', replan_ms, 'ms')]
+
+
+def pose_array_metrics():
+    return [Metric(name, array_ms, 'ms') for name, _, array_ms, _ in bench_pose_array.run(repeat=500)]
+
+
+#: The benchmarks in the suite, by name.
+BENCHMARKS = collections.OrderedDict([
+    ('clad_protocol', clad_protocol_metrics),
+    ('event', event_metrics),
+    ('robot_state', robot_state_metrics),
+    ('util', util_metrics),
+    ('camera', camera_metrics),
+    ('annotate', annotate_metrics),
+    ('nav_memory_map', nav_memory_map_metrics),
+    ('oled_face', oled_face_metrics),
+    ('planning', planning_metrics),
+    ('pose_array', pose_array_metrics),
+])
+
+
+def higher_is_better(unit):
+    return unit.endswith('/s')
+
+
+def best_of(metric_func, repeat):
+    best = collections.OrderedDict()
+    for _ in range(repeat):
+        for metric in metric_func():
+            current = best.get(metric.name)
+            if current is None:
+                best[metric.name] = metric
+            elif higher_is_better(metric.unit) == (metric.value > current.value):
+                best[metric.name] = metric
+    return list(best.values())
+
+
+def change(value, baseline, unit):
+    '''Returns the relative change from the baseline, positive for an improvement.'''
+    if higher_is_better(unit):
+        return value / baseline - 1
+    return baseline / value - 1
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)['metrics']
+
+
+def save_baselines(path, results):
+    data = {
+        'machine': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.machine(),
+        },
+        'metrics': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the SDK benchmark suite.')
+    parser.add_argument('names', nargs='*',
+                        help='benchmarks to run (default: all): %s' % ', '.join(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs of each benchmark, keeping the best result')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='fraction a metric may be worse than its baseline')
+    parser.add_argument('--save', action='store_true',
+                        help='record the results as the new baselines')
+    parser.add_argument('--baselines', default=BASELINES_PATH,
+                        help='the baselines file')
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark %s' % name)
+
+    baselines = load_baselines(args.baselines)
+    results = dict(baselines)
+    regressions = []
+    for name in args.names or BENCHMARKS:
+        for metric in best_of(BENCHMARKS[name], args.repeat):
+            key = '%s.%s' % (name, metric.name)
+            results[key] = {'value': metric.value, 'unit': metric.unit}
+            baseline = baselines.get(key)
+            if baseline is None:
+                print('%-48s %12.3f %-9s (no baseline)' % (key, metric.value, metric.unit))
+                continue
+            delta = change(metric.value, baseline['value'], metric.unit)
+            print('%-48s %12.3f %-9s baseline %12.3f %+7.1f%%' %
+                  (key, metric.value, metric.unit, baseline['value'], delta * 100))
+            if delta < -args.tolerance:
+                regressions.append(key)
+
+    if args.save:
+        save_baselines(args.baselines, results)
+        print('Saved baselines to %s' % args.baselines)
+    elif regressions:
+        print('%d regression(s): %s' % (len(regressions), ', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -83,6 +83,7 @@ setup(
         '3dviewer': ['PyOpenGL>=3.1',
                      'Pillow>=3.3', 'numpy>=1.11'],
         'camera': ['Pillow>=3.3', 'numpy>=1.11'],
+        'record': ['zstandard'],
         'test': ['tox', 'pytest'],
     }
 )
@@ -69,9 +69,13 @@ from . import lights
 from . import nav_memory_map
 from . import objects
 from . import oled_face
+from . import planning
+from . import record
 from . import robot
 from . import robot_alignment
 from . import run
+from . import sim
+from . import streaming
 from . import util
 from . import world
 
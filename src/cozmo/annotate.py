@@ -24,6 +24,11 @@ along with user-defined custom annotations.
 
 The ImageAnnotator instance can be accessed as
 :attr:`cozmo.world.World.image_annotator`.
+
+Annotators that declare a :meth:`Annotator.dependency_key` are drawn onto a
+transparent overlay, which is cached and reused for as long as their keys
+(and the size of the image) stay the same, so unchanged annotations cost
+little more than a single paste per frame.
 '''
 
 # __all__ should order by constants, event classes, other classes, functions.
@@ -36,10 +41,12 @@ __all__ = ['DEFAULT_OBJECT_COLORS',
 
 
 import collections
+import collections.abc
 import functools
+import threading
 
 try:
-    from PIL import Image, ImageDraw
+    from PIL import Image, ImageDraw, ImageFont
 except (ImportError, SyntaxError):
     # may get SyntaxError if accidentally importing old Python 2 version of PIL
     ImageDraw = None
@@ -112,6 +119,11 @@ class ImageText:
         self.outline_color = outline_color
         self.full_outline = full_outline
 
+    def _key(self):
+        # Changes whenever the rendered text would
+        return (self.text, self.position, self.align, self.color, self.font,
+                self.line_spacing, self.outline_color, self.full_outline)
+
     def render(self, draw, bounds):
         '''Renders the text onto an image within the specified bounding box.
 
@@ -124,7 +136,10 @@ class ImageText:
             The same :class:`PIL.ImageDraw.ImageDraw` object as was passed-in with text applied.
         '''
         (bx1, by1, bx2, by2) = bounds
-        text_width, text_height = draw.textsize(self.text, font=self.font)
+        font = self.font
+        if font is None:
+            font = _default_font()
+        text_width, text_height = _text_size(draw, self.text, font)
 
         if self.position & TOP:
             y = by1
@@ -138,7 +153,7 @@ class ImageText:
 
         # helper method for each draw call below
         def _draw_text(pos, color):
-            draw.text(pos, self.text, font=self.font, fill=color,
+            draw.text(pos, self.text, font=font, fill=color,
                       align=self.align, spacing=self.line_spacing)
 
         if self.outline_color is not None:
@@ -158,6 +173,32 @@ class ImageText:
         return draw
 
 
+_default_fonts = []
+
+def _default_font():
+    # Loading the default font is relatively slow, and would otherwise be
+    # repeated for every ImageDraw that text is rendered with.
+    if not _default_fonts:
+        _default_fonts.append(ImageFont.load_default())
+    return _default_fonts[0]
+
+
+def _text_key(text):
+    if text is None:
+        return None
+    if isinstance(text, ImageText):
+        return text._key()
+    return tuple(t._key() for t in text)
+
+
+def _text_size(draw, text, font):
+    if hasattr(draw, 'textsize'):
+        return draw.textsize(text, font=font)
+    # Pillow 10 removed textsize; the bounding box from the origin is equivalent
+    x1, y1, x2, y2 = draw.multiline_textbbox((0, 0), text, font=font)
+    return x2, y2
+
+
 def add_img_box_to_image(image, box, color, text=None):
     '''Draw a box on an image and optionally add text.
 
@@ -178,7 +219,7 @@ def add_img_box_to_image(image, box, color, text=None):
     x2, y2 = box.right_x, box.bottom_y
     d.rectangle([x1, y1, x2, y2], outline=color)
     if text is not None:
-        if isinstance(text, collections.Iterable):
+        if isinstance(text, collections.abc.Iterable):
             for t in text:
                 t.render(d, (x1, y1, x2, y2))
         else:
@@ -226,6 +267,11 @@ class Annotator:
     '''Annotation base class
 
     Subclasses of Annotator handle applying a single annotation to an image.
+
+    Subclasses that can describe everything their annotation depends on
+    should also override :meth:`dependency_key`, so that the annotation is
+    only redrawn when it changes.  The annotators provided here stop
+    returning a key when a subclass overrides their :meth:`apply`.
     '''
     #: int: The priority of the annotator - Annotators with higher numbered 
     #: priorities are applied first.
@@ -249,6 +295,20 @@ class Annotator:
         # should be overriden by a subclass
         raise NotImplementedError()
 
+    def dependency_key(self):
+        '''Returns a value that changes whenever the annotation would.
+
+        If a key is returned then :meth:`apply` is called with a transparent
+        RGBA overlay, instead of the camera image, which is cached and
+        reused for subsequent images until the key (compared with ``==``),
+        or the size of the image, changes.
+
+        Returns:
+            A value describing the annotation's current state, or None (the
+            default) to apply the annotation directly to every image.
+        '''
+        return None
+
     def __hash__(self):
         return id(self)
 
@@ -277,6 +337,14 @@ class ObjectAnnotator(Annotator):
                 box *= scale
             add_img_box_to_image(image, box, color, text=text)
 
+    def dependency_key(self):
+        if type(self).apply is not ObjectAnnotator.apply:
+            # The key can't describe what an overridden apply() draws
+            return None
+        return (tuple(self.object_colors.items()),
+                [(obj.__class__, obj.last_observed_image_box, _text_key(self.label_for_obj(obj)))
+                 for obj in self.world.visible_objects])
+
     def label_for_obj(self, obj):
         '''Fetch a label to display for the object.
 
@@ -311,6 +379,14 @@ class FaceAnnotator(Annotator):
             add_polygon_to_image(image, obj.nose, scale, self.box_color)
             add_polygon_to_image(image, obj.mouth, scale, self.box_color)
 
+    def dependency_key(self):
+        if type(self).apply is not FaceAnnotator.apply:
+            return None
+        return (self.box_color,
+                [(obj.last_observed_image_box, _text_key(self.label_for_face(obj)),
+                  obj.left_eye, obj.right_eye, obj.nose, obj.mouth)
+                 for obj in self.world.visible_faces])
+
     def label_for_face(self, obj):
         '''Fetch a label to display for the face.
 
@@ -348,6 +424,13 @@ class PetAnnotator(Annotator):
                 box *= scale
             add_img_box_to_image(image, box, self.box_color, text=text)
 
+    def dependency_key(self):
+        if type(self).apply is not PetAnnotator.apply:
+            return None
+        return (self.box_color,
+                [(obj.last_observed_image_box, _text_key(self.label_for_pet(obj)))
+                 for obj in self.world.visible_pets])
+
     def label_for_pet(self, obj):
         '''Fetch a label to display for the pet.
 
@@ -369,6 +452,11 @@ class TextAnnotator(Annotator):
         d = ImageDraw.Draw(image)
         self.text.render(d, (0, 0, image.width, image.height))
 
+    def dependency_key(self):
+        if type(self).apply is not TextAnnotator.apply:
+            return None
+        return self.text._key()
+
 
 class _AnnotatorHelper(Annotator):
     def __init__(self, img_annotator, wrapped):
@@ -420,7 +508,14 @@ class ImageAnnotator(event.Dispatcher):
     Annotators each have a priority number associated with them. Annotators
     with a larger priority number are rendered first and may be overdrawn by those
     with a lower/smaller priority number.
+
+    Consecutive (by priority) enabled annotators that provide a
+    :meth:`Annotator.dependency_key` share an overlay, which is only redrawn
+    when one of their keys changes.
     '''
+    # The maximum number of overlays kept, one per group of cacheable annotators
+    _MAX_OVERLAYS = 8
+
     def __init__(self, world, **kw):
         super().__init__(**kw)
         #: :class:`cozmo.world.World`: World object that created the annotator.
@@ -428,6 +523,16 @@ class ImageAnnotator(event.Dispatcher):
 
         self._annotators = {}
         self._sorted_annotators = []
+        # Maps each group of annotators, image size and scale to the
+        # annotators' (keys, overlay region, offset)
+        self._overlays = {}
+        self._overlay_hit_count = 0
+        self._overlay_miss_count = 0
+        # Updated by cozmo.world.CameraImage, which caches annotated images,
+        # possibly from several threads
+        self._annotated_image_hit_count = 0
+        self._annotated_image_miss_count = 0
+        self._annotated_image_count_lock = threading.Lock()
         self.add_annotator('objects', ObjectAnnotator(self))
         self.add_annotator('faces', FaceAnnotator(self))
         self.add_annotator('pets', PetAnnotator(self))
@@ -439,6 +544,56 @@ class ImageAnnotator(event.Dispatcher):
     def _sort_annotators(self):
         self._sorted_annotators = sorted(self._annotators.values(),
                 key=lambda an: an.priority, reverse=True)
+        self._overlays.clear()
+
+    def _annotation_state(self):
+        # Describes every annotation that annotate_image would currently
+        # draw, or returns None if an enabled annotator has no dependency key.
+        if not self.annotation_enabled:
+            return ()
+        state = []
+        for an in self._sorted_annotators:
+            if an.enabled:
+                key = an.dependency_key()
+                if key is None:
+                    return None
+                state.append((an, key))
+        return state
+
+    def _count_annotated_image(self, hit):
+        with self._annotated_image_count_lock:
+            if hit:
+                self._annotated_image_hit_count += 1
+            else:
+                self._annotated_image_miss_count += 1
+
+    def _apply_overlay(self, image, scale, group):
+        # Draws a group of cacheable annotators onto image via a cached overlay
+        if not group:
+            return
+        overlay_key = (tuple(an for an, _ in group), image.size, scale)
+        keys = [key for _, key in group]
+        cached = self._overlays.get(overlay_key)
+        if cached is not None and cached[0] == keys:
+            self._overlay_hit_count += 1
+            _, region, offset = cached
+        else:
+            self._overlay_miss_count += 1
+            overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
+            for an, _ in group:
+                an.apply(overlay, scale)
+            # Only the area actually drawn on needs to be kept and pasted
+            bbox = overlay.getbbox()
+            if bbox is None:
+                region = offset = None
+            else:
+                region = overlay.crop(bbox)
+                offset = bbox[:2]
+            if len(self._overlays) >= self._MAX_OVERLAYS:
+                self._overlays.clear()
+            self._overlays[overlay_key] = (keys, region, offset)
+        if region is not None:
+            image.paste(region, offset, region)
 
     def add_annotator(self, name, annotator):
         '''Adds a new annotator for display.
@@ -571,8 +726,40 @@ class ImageAnnotator(event.Dispatcher):
         if not self.annotation_enabled:
             return image
 
+        group = []
         for an in self._sorted_annotators:
-            if an.enabled:
+            if not an.enabled:
+                continue
+            key = an.dependency_key()
+            if key is None:
+                # Preserve the drawing order around uncacheable annotators
+                self._apply_overlay(image, scale, group)
+                group = []
                 an.apply(image, scale)
+            else:
+                group.append((an, key))
+        self._apply_overlay(image, scale, group)
 
         return image
+
+    @property
+    def overlay_hit_count(self):
+        '''int: The number of times cached annotations were reused.'''
+        return self._overlay_hit_count
+
+    @property
+    def overlay_miss_count(self):
+        '''int: The number of times cached annotations had to be redrawn.'''
+        return self._overlay_miss_count
+
+    @property
+    def annotated_image_hit_count(self):
+        '''int: The number of times :meth:`cozmo.world.CameraImage.annotate_image`
+        reused a previously annotated image.'''
+        return self._annotated_image_hit_count
+
+    @property
+    def annotated_image_miss_count(self):
+        '''int: The number of times :meth:`cozmo.world.CameraImage.annotate_image`
+        had to annotate the image.'''
+        return self._annotated_image_miss_count
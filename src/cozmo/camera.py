@@ -29,8 +29,11 @@ has identified.
 '''
 
 # __all__ should order by constants, event classes, other classes, functions.
-__all__ = ['EvtNewRawCameraImage', 'EvtRobotObservedMotion', 'CameraConfig', 'Camera']
+__all__ = ['EvtNewRawCameraImage', 'EvtRobotObservedMotion', 'CameraConfig',
+           'CameraFrame', 'Camera']
 
+import collections
+import concurrent.futures
 import functools
 import io
 
@@ -87,7 +90,8 @@ class EvtNewRawCameraImage(event.Event):
     See also :class:`~cozmo.world.EvtNewCameraImage` which provides access
     to both the raw image and a scaled and annotated version.
     '''
-    image = 'A PIL.Image.Image object'
+    image = 'A PIL.Image.Image object, or None if lazy decoding is enabled'
+    frame = 'A CameraFrame object holding the encoded image'
 
 
 class EvtRobotObservedMotion(event.Event):
@@ -209,6 +213,108 @@ class CameraConfig:
         return self._max_gain
 
 
+class _ImageBufferPool:
+    '''Recycles the buffers that image chunks are reassembled into.
+
+    Buffers are pooled by size, which is fixed per image resolution, and at
+    most ``max_free_per_size`` unused buffers of each size are retained.
+    '''
+
+    def __init__(self, max_free_per_size=4):
+        self._max_free_per_size = max_free_per_size
+        self._free = collections.defaultdict(list)
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def acquire(self, size):
+        free = self._free[size]
+        if free:
+            self.hit_count += 1
+            return free.pop()
+        self.miss_count += 1
+        return np.empty(size, dtype=np.uint8)
+
+    def release(self, buf):
+        free = self._free[len(buf)]
+        if len(free) < self._max_free_per_size:
+            free.append(buf)
+
+
+class CameraFrame:
+    '''A single encoded image from Cozmo's camera, decoded on demand.
+
+    The frame holds the JPEG data received from the robot and only decodes
+    it the first time the pixels are accessed via :attr:`image` or
+    :attr:`array`; the decoded result is cached.
+
+    Programs that just forward the images elsewhere can use
+    :attr:`jpeg_bytes` without ever decoding them.
+
+    Frames are created by the :class:`Camera`, and are not generally
+    constructed directly.
+
+    Args:
+        jpeg_data (:class:`numpy.ndarray`): The JPEG encoded image data.
+            Any zero padding following the end of the image is ignored.
+        is_color_image (bool): True if the image is in color.
+        size (tuple of int): The (width, height) of the decoded image.
+    '''
+
+    def __init__(self, jpeg_data, is_color_image, size):
+        # Trim any zero padding left after the JPEG end-of-image marker
+        padding = np.argmax(jpeg_data[::-1] != 0)
+        self._jpeg_data = jpeg_data[:len(jpeg_data) - padding]
+        self._jpeg_bytes = None
+        self._image = None
+        self._array = None
+
+        #: bool: True if the image is in color.
+        self.is_color_image = is_color_image
+
+        #: tuple of int: The (width, height) of the decoded image.
+        self.size = size
+
+    def __repr__(self):
+        return '<%s size=%s is_color_image=%s is_decoded=%s>' % (self.__class__.__name__,
+                self.size, self.is_color_image, self.is_decoded)
+
+    @property
+    def jpeg_bytes(self):
+        '''bytes: The JPEG encoded image, as received from the robot.
+
+        Color images are sent at half width, so the JPEG data of a color
+        image is half the width of the decoded :attr:`image`.
+        '''
+        if self._jpeg_bytes is None:
+            self._jpeg_bytes = self._jpeg_data.tobytes()
+        return self._jpeg_bytes
+
+    @property
+    def is_decoded(self):
+        '''bool: True if the image has already been decoded.'''
+        return self._image is not None
+
+    @property
+    @_require_img_processing
+    def image(self):
+        ''':class:`PIL.Image.Image`: The decoded RGB image.'''
+        if self._image is None:
+            image = Image.open(io.BytesIO(self._jpeg_data)).convert('RGB')
+            # Color images need to be resized to the proper resolution
+            if self.is_color_image:
+                image = image.resize(self.size)
+            self._image = image
+        return self._image
+
+    @property
+    @_require_img_processing
+    def array(self):
+        ''':class:`numpy.ndarray`: The decoded RGB image as a height x width x 3 array.'''
+        if self._array is None:
+            self._array = np.asarray(self.image)
+        return self._array
+
+
 class Camera(event.Dispatcher):
     '''Represents Cozmo's camera.
 
@@ -222,6 +328,10 @@ class Camera(event.Dispatcher):
         The camera will not receive any image data unless you
         explicitly enable it by setting :attr:`Camera.image_stream_enabled`
         to ``True``
+
+    By default completed images are decoded on the event loop as they arrive;
+    call :meth:`enable_background_decoding` to move that work onto a pool of
+    workers instead.
     '''
 
     def __init__(self, robot, **kw):
@@ -234,6 +344,22 @@ class Camera(event.Dispatcher):
         self._exposure_ms = 0
         self._auto_exposure_enabled = True
 
+        self._decode_executor = None
+        self._owns_decode_executor = False
+        self._max_pending_decodes = 0
+        self._pending_decodes = collections.deque()
+        self._decode_drop_count = 0
+        self._buffer_pool = _ImageBufferPool()
+        self._partial_data = None
+        self._partial_frame_drop_count = 0
+
+        #: bool: If True, received images aren't decoded until their pixels
+        #: are accessed, and the ``image`` parameter of
+        #: :class:`EvtNewRawCameraImage` events is None (use its ``frame``
+        #: instead).  Useful for programs that only need image timestamps
+        #: or forward the JPEG data elsewhere.
+        self.lazy_decoding_enabled = False
+
         if np is None:
             logger.warning("Camera image processing not available due to missing NumPy or Pillow packages: %s" % _img_processing_available)
         else:
@@ -291,9 +417,60 @@ class Camera(event.Dispatcher):
                                                       gain=gain)
         self.robot.conn.send_msg(msg)
 
+    def enable_background_decoding(self, max_workers=2, max_pending=4, executor=None):
+        '''Decode completed camera images on a worker pool instead of the event loop.
+
+        Fixing up and decoding each JPEG image (and resizing color images)
+        otherwise runs on the same event loop that handles all other messages
+        from the robot, which can delay event dispatch at high frame rates.
+
+        Images are still dispatched as :class:`EvtNewRawCameraImage`
+        events on the event loop, in the order they were received.
+
+        Args:
+            max_workers (int): The number of worker threads to decode with.
+                Ignored if an ``executor`` is supplied.
+            max_pending (int): The maximum number of images that may be
+                waiting to be decoded.  If the workers fall behind, the oldest
+                pending image is dropped to make room for each new one.
+            executor (:class:`concurrent.futures.Executor`): An optional
+                executor to submit decode jobs to, e.g. a
+                :class:`concurrent.futures.ProcessPoolExecutor`.  The caller
+                remains responsible for shutting it down.
+        Raises:
+            :class:`ValueError` if max_pending is less than 1.
+        '''
+        if max_pending < 1:
+            raise ValueError('max_pending must be at least 1 (got %s)' % max_pending)
+
+        self.disable_background_decoding()
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+            self._owns_decode_executor = True
+        self._decode_executor = executor
+        self._max_pending_decodes = max_pending
+
+    def disable_background_decoding(self):
+        '''Return to decoding camera images directly on the event loop.
+
+        Any images still waiting to be decoded are discarded.
+        '''
+        executor = self._decode_executor
+        if executor is None:
+            return
+
+        self._decode_executor = None
+        while self._pending_decodes:
+            self._pending_decodes.popleft().cancel()
+        if self._owns_decode_executor:
+            executor.shutdown(wait=False)
+            self._owns_decode_executor = False
+
     #### Private Methods ####
 
     def _reset_partial_state(self):
+        if self._partial_data is not None:
+            self._buffer_pool.release(self._partial_data)
         self._partial_data = None
         self._partial_image_id = None
         self._partial_invalid = False
@@ -376,6 +553,34 @@ class Camera(event.Dispatcher):
         '''int: The current camera exposure setting in milliseconds.'''
         return self._exposure_ms
 
+    @property
+    def is_background_decoding_enabled(self):
+        '''bool: True if images are being decoded on a worker pool.
+
+        See :meth:`enable_background_decoding`.
+        '''
+        return self._decode_executor is not None
+
+    @property
+    def decode_drop_count(self):
+        '''int: The number of images dropped because the background decode workers fell behind.'''
+        return self._decode_drop_count
+
+    @property
+    def partial_frame_drop_count(self):
+        '''int: The number of images discarded because chunks of them were lost.'''
+        return self._partial_frame_drop_count
+
+    @property
+    def buffer_pool_hit_count(self):
+        '''int: The number of images reassembled into a recycled buffer.'''
+        return self._buffer_pool.hit_count
+
+    @property
+    def buffer_pool_miss_count(self):
+        '''int: The number of images that needed a newly allocated buffer.'''
+        return self._buffer_pool.miss_count
+
     #### Private Event Handlers ####
 
     def _recv_msg_image_chunk(self, evt, *, msg):
@@ -384,12 +589,14 @@ class Camera(event.Dispatcher):
         if self._partial_image_id is not None and msg.chunkId == 0:
             if not self._partial_invalid:
                 logger.debug("Lost final chunk of image; discarding")
+                self._partial_frame_drop_count += 1
             self._partial_image_id = None
 
         if self._partial_image_id is None:
             if msg.chunkId != 0:
                 if not self._partial_invalid:
                     logger.debug("Received chunk of broken image")
+                    self._partial_frame_drop_count += 1
                 self._partial_invalid = True
                 return
             # discard any previous in-progress image
@@ -397,19 +604,26 @@ class Camera(event.Dispatcher):
             self._partial_image_id = msg.imageId
             self._partial_metadata = msg
 
-            max_size = msg.imageChunkCount * _clad_to_game_cozmo.ImageConstants.IMAGE_CHUNK_SIZE
             width, height = RESOLUTIONS[msg.resolution]
             max_size = width * height * 3 # 3 bytes (RGB) per pixel
-            self._partial_data = np.empty(max_size, dtype=np.uint8)
+            self._partial_data = self._buffer_pool.acquire(max_size)
 
         if msg.chunkId != (self._last_chunk_id + 1) or msg.imageId != self._partial_image_id:
             logger.debug("Image missing chunks; discarding (last_chunk_id=%d partial_image_id=%s)",
                     self._last_chunk_id, self._partial_image_id)
             self._reset_partial_state()
             self._partial_invalid = True
+            self._partial_frame_drop_count += 1
             return
 
         offset = self._partial_size
+        if offset + len(msg.data) > len(self._partial_data):
+            logger.debug("Image larger than expected for its resolution; discarding")
+            self._reset_partial_state()
+            self._partial_invalid = True
+            self._partial_frame_drop_count += 1
+            return
+
         self._partial_data[offset:offset+len(msg.data)] = msg.data
         self._partial_size += len(msg.data)
         self._last_chunk_id = msg.chunkId
@@ -438,142 +652,201 @@ class Camera(event.Dispatcher):
                             right_img_pos=util.Vector2(msg.right_img_x, msg.right_img_y))
 
     def _process_completed_image(self):
-        data = self._partial_data[0:self._partial_size]
-        
-        # The first byte of the image is whether or not it is in color
-        is_color_image = data[0] != 0
-        
-        if self._partial_metadata.imageEncoding ==  _clad_to_game_cozmo.ImageEncoding.JPEGMinimizedGray:
-            width, height = RESOLUTIONS[self._partial_metadata.resolution]
-            
-            if is_color_image:
-                # Color images are half width
-                width = width // 2
-                data = _minicolor_to_jpeg(data, width, height)
-            else:
-                data = _minigray_to_jpeg(data, width, height)
-                
-        image = Image.open(io.BytesIO(data)).convert('RGB')
-
-        # Color images need to be resized to the proper resolution
-        if is_color_image:
-            size = RESOLUTIONS[self._partial_metadata.resolution]
-            image = image.resize(size)
-        
-        self._latest_image = image
-        self.dispatch_event(EvtNewRawCameraImage, image=image)
+        # Take ownership of the reassembly buffer; it's returned to the pool
+        # once the frame has been loaded from it.
+        buf = self._partial_data
+        self._partial_data = None
+        data = buf[0:self._partial_size]
+        data.flags.writeable = False
+        metadata = self._partial_metadata
+
+        decode = not self.lazy_decoding_enabled
+        if self._decode_executor is None:
+            try:
+                frame = _load_frame(data, metadata.imageEncoding, metadata.resolution, decode)
+            finally:
+                self._buffer_pool.release(buf)
+            self._dispatch_frame(frame)
+            return
+
+        if len(self._pending_decodes) >= self._max_pending_decodes:
+            # Workers have fallen behind; drop the oldest image still pending.
+            # If it's already being decoded, its result will just be ignored.
+            self._pending_decodes.popleft().cancel()
+            self._decode_drop_count += 1
+
+        fut = self._decode_executor.submit(_load_frame, data,
+                                           metadata.imageEncoding, metadata.resolution, decode)
+        self._pending_decodes.append(fut)
+        fut.add_done_callback(functools.partial(self._on_decode_done, buf))
+
+    def _on_decode_done(self, buf, fut):
+        # Called from a worker thread (or immediately if cancelled)
+        self._loop.call_soon_threadsafe(self._finish_decode, buf)
+
+    def _finish_decode(self, buf):
+        self._buffer_pool.release(buf)
+        self._dispatch_completed_decodes()
+
+    def _dispatch_completed_decodes(self):
+        # Dispatch images strictly in the order they were received, waiting
+        # on any earlier image that's still being decoded.
+        while self._pending_decodes and self._pending_decodes[0].done():
+            fut = self._pending_decodes.popleft()
+            if fut.cancelled():
+                continue
+            try:
+                frame = fut.result()
+            except (OSError, ValueError) as exc:
+                logger.warning("Failed to decode camera image: %s", exc)
+                continue
+            self._dispatch_frame(frame)
+
+    def _dispatch_frame(self, frame):
+        image = frame.image if frame.is_decoded else None
+        self.dispatch_event(EvtNewRawCameraImage, image=image, frame=frame)
 
 
     #### Public Event Handlers ####
 
 
+# JPEG headers prepended to the miniGray / miniColor encoded image data.
+# These should be 'exactly' what is used by the miniGrayToJpeg and
+# miniColorToJpeg functions in encodedImage.cpp.  The height and width are
+# patched in at offset 0x5E for each image.
+_MINIGRAY_JPEG_HEADER = bytes([
+    0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01,
+    0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43, 0x00, 0x10, 0x0B, 0x0C, 0x0E, 0x0C, 0x0A, 0x10, #// 0x19 = QTable
+    0x0E, 0x0D, 0x0E, 0x12, 0x11, 0x10, 0x13, 0x18, 0x28, 0x1A, 0x18, 0x16, 0x16, 0x18, 0x31, 0x23,
+    0x25, 0x1D, 0x28, 0x3A, 0x33, 0x3D, 0x3C, 0x39, 0x33, 0x38, 0x37, 0x40, 0x48, 0x5C, 0x4E, 0x40,
+    0x44, 0x57, 0x45, 0x37, 0x38, 0x50, 0x6D, 0x51, 0x57, 0x5F, 0x62, 0x67, 0x68, 0x67, 0x3E, 0x4D,
+
+    #//0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x00, 0xF0, #// 0x5E = Height x Width
+    0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x01, 0x28, #// 0x5E = Height x Width
+
+    #//0x01, 0x40, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
+    0x01, 0x90, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
+
+    0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04,
+    0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x10, 0x00, 0x02, 0x01, 0x03, 0x03, 0x02, 0x04, 0x03,
+    0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D, 0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12,
+    0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
+    0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0A, 0x16,
+    0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28, 0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39,
+    0x3A, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
+    0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79,
+    0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98,
+    0x99, 0x9A, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
+    0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4,
+    0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA,
+    0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA, 0xFF, 0xDA, 0x00, 0x08, 0x01, 0x01,
+    0x00, 0x00, 0x3F, 0x00
+])
+
+_MINICOLOR_JPEG_HEADER = bytes([
+    0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01,
+    0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43, 0x00, 0x10, 0x0B, 0x0C, 0x0E, 0x0C, 0x0A, 0x10, # 0x19 = QTable
+    0x0E, 0x0D, 0x0E, 0x12, 0x11, 0x10, 0x13, 0x18, 0x28, 0x1A, 0x18, 0x16, 0x16, 0x18, 0x31, 0x23,
+    0x25, 0x1D, 0x28, 0x3A, 0x33, 0x3D, 0x3C, 0x39, 0x33, 0x38, 0x37, 0x40, 0x48, 0x5C, 0x4E, 0x40,
+    0x44, 0x57, 0x45, 0x37, 0x38, 0x50, 0x6D, 0x51, 0x57, 0x5F, 0x62, 0x67, 0x68, 0x67, 0x3E, 0x4D,
+    0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 17, # 8+3*components
+    0x08, 0x00, 0xF0, # 0x5E = Height x Width
+    0x01, 0x40,
+    0x03, # 3 components
+    0x01, 0x21, 0x00, # Y 2x1 res
+    0x02, 0x11, 0x00, # Cb
+    0x03, 0x11, 0x00, # Cr
+    0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
+    0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04,
+    0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x10, 0x00, 0x02, 0x01, 0x03, 0x03, 0x02, 0x04, 0x03,
+    0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D, 0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12,
+    0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
+    0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0A, 0x16,
+    0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28, 0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39,
+    0x3A, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
+    0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79,
+    0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98,
+    0x99, 0x9A, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
+    0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4,
+    0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA,
+    0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA,
+    0xFF, 0xDA, 0x00, 12,
+    0x03, # 3 components
+    0x01, 0x00, # Y
+    0x02, 0x00, # Cb same AC/DC
+    0x03, 0x00, # Cr same AC/DC
+    0x00, 0x3F, 0x00
+])
+
+# Offset of the big-endian height and width in the JPEG headers
+_JPEG_HEADER_SIZE_OFFSET = 0x5e
+
+
+@_require_img_processing
+def _load_frame(data, image_encoding, resolution, decode=True):
+    '''Converts completed image data from the robot to a CameraFrame.
+
+    The image is only decoded up front if ``decode`` is True.
+
+    This is a module level function so that it can be run by a process pool.
+    '''
+    # The first byte of the image is whether or not it is in color
+    is_color_image = data[0] != 0
+
+    if image_encoding == _clad_to_game_cozmo.ImageEncoding.JPEGMinimizedGray:
+        width, height = RESOLUTIONS[resolution]
+
+        if is_color_image:
+            # Color images are half width
+            width = width // 2
+            data = _minicolor_to_jpeg(data, width, height)
+        else:
+            data = _minigray_to_jpeg(data, width, height)
+    else:
+        # The frame must own a copy of the data, as the buffer it was
+        # reassembled in gets recycled for subsequent images.
+        data = np.array(data)
+
+    frame = CameraFrame(data, is_color_image, RESOLUTIONS[resolution])
+    if decode:
+        frame.image
+    return frame
+
+
 @_require_img_processing
 def _minigray_to_jpeg(minigray, width, height):
         "Converts miniGrayToJpeg format to normal jpeg format"
-        #This should be 'exactly' what is done in the miniGrayToJpeg function in encodedImage.cpp
-        header50 = np.array([
-              0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01,
-              0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43, 0x00, 0x10, 0x0B, 0x0C, 0x0E, 0x0C, 0x0A, 0x10, #// 0x19 = QTable
-              0x0E, 0x0D, 0x0E, 0x12, 0x11, 0x10, 0x13, 0x18, 0x28, 0x1A, 0x18, 0x16, 0x16, 0x18, 0x31, 0x23,
-              0x25, 0x1D, 0x28, 0x3A, 0x33, 0x3D, 0x3C, 0x39, 0x33, 0x38, 0x37, 0x40, 0x48, 0x5C, 0x4E, 0x40,
-              0x44, 0x57, 0x45, 0x37, 0x38, 0x50, 0x6D, 0x51, 0x57, 0x5F, 0x62, 0x67, 0x68, 0x67, 0x3E, 0x4D,
-
-              #//0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x00, 0xF0, #// 0x5E = Height x Width
-              0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x01, 0x28, #// 0x5E = Height x Width
-
-              #//0x01, 0x40, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
-              0x01, 0x90, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
-
-              0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04,
-              0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x10, 0x00, 0x02, 0x01, 0x03, 0x03, 0x02, 0x04, 0x03,
-              0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D, 0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12,
-              0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
-              0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0A, 0x16,
-              0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28, 0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39,
-              0x3A, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
-              0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79,
-              0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98,
-              0x99, 0x9A, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
-              0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4,
-              0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA,
-              0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA, 0xFF, 0xDA, 0x00, 0x08, 0x01, 0x01,
-              0x00, 0x00, 0x3F, 0x00
-            ], dtype=np.uint8)
-        
-        return _mini_to_jpeg_helper(minigray, width, height, header50)
+        return _mini_to_jpeg_helper(minigray, width, height, _MINIGRAY_JPEG_HEADER)
 
 @_require_img_processing
 def _minicolor_to_jpeg(minicolor, width, height):
         "Converts miniColorToJpeg format to normal jpeg format"
-        #This should be 'exactly' what is done in the miniColorToJpeg function in encodedImage.cpp
-        header = np.array([
-             0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01,
-             0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43, 0x00, 0x10, 0x0B, 0x0C, 0x0E, 0x0C, 0x0A, 0x10, # 0x19 = QTable
-             0x0E, 0x0D, 0x0E, 0x12, 0x11, 0x10, 0x13, 0x18, 0x28, 0x1A, 0x18, 0x16, 0x16, 0x18, 0x31, 0x23,
-             0x25, 0x1D, 0x28, 0x3A, 0x33, 0x3D, 0x3C, 0x39, 0x33, 0x38, 0x37, 0x40, 0x48, 0x5C, 0x4E, 0x40,
-             0x44, 0x57, 0x45, 0x37, 0x38, 0x50, 0x6D, 0x51, 0x57, 0x5F, 0x62, 0x67, 0x68, 0x67, 0x3E, 0x4D,
-             0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 17, # 8+3*components
-             0x08, 0x00, 0xF0, # 0x5E = Height x Width
-             0x01, 0x40,
-             0x03, # 3 components
-             0x01, 0x21, 0x00, # Y 2x1 res
-             0x02, 0x11, 0x00, # Cb
-             0x03, 0x11, 0x00, # Cr
-             0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
-             0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04,
-             0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x10, 0x00, 0x02, 0x01, 0x03, 0x03, 0x02, 0x04, 0x03,
-             0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D, 0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12,
-             0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
-             0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0A, 0x16,
-             0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28, 0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39,
-             0x3A, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
-             0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79,
-             0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98,
-             0x99, 0x9A, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
-             0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4,
-             0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA,
-             0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA,
-             0xFF, 0xDA, 0x00, 12,
-             0x03, # 3 components
-             0x01, 0x00, # Y
-             0x02, 0x00, # Cb same AC/DC
-             0x03, 0x00, # Cr same AC/DC
-             0x00, 0x3F, 0x00
-            ], dtype=np.uint8)
-
-        return _mini_to_jpeg_helper(minicolor, width, height, header)
+        return _mini_to_jpeg_helper(minicolor, width, height, _MINICOLOR_JPEG_HEADER)
 
 @_require_img_processing
 def _mini_to_jpeg_helper(mini, width, height, header):
-        bufferIn = mini.tolist()
+        mini = np.asarray(mini, dtype=np.uint8)
         currLen = len(mini)
 
         headerLength = len(header)
         # For worst case expansion
-        bufferOut = np.array([0] * (currLen*2 + headerLength), dtype=np.uint8)
+        bufferOut = np.zeros(currLen*2 + headerLength, dtype=np.uint8)
+        bufferOut[:headerLength] = np.frombuffer(header, dtype=np.uint8)
 
-        for i in range(headerLength):
-            bufferOut[i] = header[i]
+        off = _JPEG_HEADER_SIZE_OFFSET
+        bufferOut[off:off+4] = (height >> 8, height & 0xff, width >> 8, width & 0xff)
 
-        bufferOut[0x5e] = height >> 8
-        bufferOut[0x5f] = height & 0xff
-        bufferOut[0x60] = width  >> 8
-        bufferOut[0x61] = width  & 0xff
         # Remove padding at the end
-        while (bufferIn[currLen-1] == 0xff):
+        while currLen > 0 and mini[currLen-1] == 0xff:
             currLen -= 1
 
-        off = headerLength
-        for i in range(currLen-1):
-            bufferOut[off] = bufferIn[i+1]
-            off += 1
-            if (bufferIn[i+1] == 0xff):
-                bufferOut[off] = 0
-                off += 1
+        # Skip the leading color flag byte and stuff a zero after every 0xFF
+        payload = mini[1:currLen]
+        payload = np.insert(payload, np.flatnonzero(payload == 0xff) + 1, 0)
 
+        off = headerLength + len(payload)
+        bufferOut[headerLength:off] = payload
         bufferOut[off] = 0xff
-        off += 1
-        bufferOut[off] = 0xD9
+        bufferOut[off+1] = 0xD9
 
-        bufferOut[:off]
-        return np.asarray(bufferOut)
+        return bufferOut
@@ -24,6 +24,18 @@ from . import logger_protocol
 
 LOG_ALL = 'all'
 
+# messages are prefixed by a 2 byte length
+_MSG_SIZE = struct.Struct('H')
+
+# The directions messages are recorded with, published as
+# cozmo.record.FROM_ENGINE and cozmo.record.TO_ENGINE
+_FROM_ENGINE = 0
+_TO_ENGINE = 1
+
+# Consumed bytes are only trimmed from the head of the receive buffer once
+# at least this many have accumulated (or the buffer has been fully drained).
+_COMPACT_THRESHOLD = 64 * 1024
+
 if sys.byteorder != 'little':
     raise ImportError("Cozmo SDK doesn't support byte order '%s' - contact Anki support to request this", sys.byteorder)
 
@@ -36,10 +48,16 @@ class CLADProtocol(asyncio.Protocol):
     clad_encode_union = None
     _clad_log_which = None
 
+    # A cozmo.record.Recorder that every message sent and received is written
+    # to, if the connection is being recorded.
+    _recorder = None
+
     def __init__(self):
         super().__init__()
 
         self._buf = bytearray()
+        # read offset of the next undecoded frame in self._buf
+        self._buf_offset = 0
         self._abort_connection = False  # abort connection on failed handshake, ignore subsequent messages!
 
     def connection_made(self, transport):
@@ -48,39 +66,62 @@ class CLADProtocol(asyncio.Protocol):
 
     def connection_lost(self, exc):
         logger_protocol.debug("Connnection to transport lost: %s" % exc)
+        if self._recorder is not None:
+            self._recorder.close()
 
     def data_received(self, data):
         self._buf.extend(data)
         # pull clad messages out
 
-        while not self._abort_connection:
-            msg = self.decode_msg()
-            # must compare msg against None, not just "if not msg" as the latter
-            # would match against any message with len==0 (which is the case
-            # for deliberately empty messages where the tag alone is the signal).
-            if msg is None:
-                return
-            name = msg.tag_name
-            if self._clad_log_which is LOG_ALL or (self._clad_log_which is not None and name in self._clad_log_which):
-                logger_protocol.debug('RECV  %s',  msg._data)
-            self.msg_received(msg)
+        try:
+            while not self._abort_connection:
+                msg = self.decode_msg()
+                # must compare msg against None, not just "if not msg" as the latter
+                # would match against any message with len==0 (which is the case
+                # for deliberately empty messages where the tag alone is the signal).
+                if msg is None:
+                    return
+                name = msg.tag_name
+                if self._clad_log_which is LOG_ALL or (self._clad_log_which is not None and name in self._clad_log_which):
+                    logger_protocol.debug('RECV  %s',  msg._data)
+                self.msg_received(msg)
+        finally:
+            self._compact_buf()
 
     def decode_msg(self):
-        if len(self._buf) < 2:
+        offset = self._buf_offset
+        available = len(self._buf) - offset
+        if available < 2:
             return None
 
         # TODO: handle error
-        # messages are prefixed by a 2 byte length
-        msg_size = struct.unpack_from('H', self._buf)[0]
-        if len(self._buf) < 2 + msg_size:
+        msg_size = _MSG_SIZE.unpack_from(self._buf, offset)[0]
+        if available < 2 + msg_size:
             return None
 
-        buf, self._buf = self._buf[2:2+msg_size], self._buf[2+msg_size:]
-
-        try:
-            return self.clad_decode_union.unpack(buf)
-        except ValueError as e:
-            logger_protocol.warn("Failed to decode CLAD message for buflen=%d: %s", len(buf), e)
+        start = offset + 2
+        end = start + msg_size
+        # advance before decoding so a malformed frame can't be re-read
+        self._buf_offset = end
+
+        # decode straight out of the receive buffer; the views must be released
+        # before returning, as the bytearray can't be resized while exported.
+        with memoryview(self._buf) as view, view[start:end] as buf:
+            if self._recorder is not None:
+                self._recorder.write_frame(_FROM_ENGINE, buf)
+            try:
+                return self.clad_decode_union.unpack(buf)
+            except ValueError as e:
+                logger_protocol.warn("Failed to decode CLAD message for buflen=%d: %s", msg_size, e)
+
+    def _compact_buf(self):
+        # Drop already-decoded frames from the head of the receive buffer.
+        if self._buf_offset == len(self._buf):
+            del self._buf[:]
+            self._buf_offset = 0
+        elif self._buf_offset >= _COMPACT_THRESHOLD:
+            del self._buf[:self._buf_offset]
+            self._buf_offset = 0
 
     def eof_received(self):
         logger_protocol.info("EOF received on connection")
@@ -93,6 +134,8 @@ class CLADProtocol(asyncio.Protocol):
         msg = self.clad_encode_union(**{name: msg})
         msg_buf = msg.pack()
         msg_size = struct.pack('H', len(msg_buf))
+        if self._recorder is not None:
+            self._recorder.write_frame(_TO_ENGINE, msg_buf)
 
         self._send_mutex.acquire()
         try:
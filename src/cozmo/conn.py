@@ -176,6 +176,11 @@ class CozmoConnection(event.Dispatcher, clad_protocol.CLADProtocol):
             for k in sorted(self.device_info.keys())])
         return '<%s %s>' % (self.__class__.__name__, info)
 
+    def _stop_dispatcher(self):
+        super()._stop_dispatcher()
+        for robot_obj in self._robots.values():
+            robot_obj._stop_dispatcher()
+
     def connection_made(self, transport):
         super().connection_made(transport)
         self._is_connected = True
@@ -31,6 +31,9 @@ The event can be observed in a number of different ways:
    to observe, which will cause the supplied function to be called every time
    the specified event occurs (use the :func:`oneshot` decorator
    to only have the handler called once)
+#. By calling :meth:`~Dispatcher.stream` on the object to observe, which
+   returns an :class:`EventStream` that can be iterated over with
+   ``async for`` to receive every occurrence of the event in turn.
 #. By sub-classing a type and implementing a receiver method.
    For example, subclass the :class:`cozmo.objects.LightCube` type and implement `evt_object_tapped`.
    Note that the factory attribute would need to be updated on the
@@ -75,14 +78,18 @@ of messages the World object receives.
 '''
 
 # __all__ should order by constants, event classes, other classes, functions.
-__all__ = ['Event', 'Dispatcher', 'Filter', 'Handler',
+__all__ = ['OVERFLOW_BLOCK', 'OVERFLOW_COALESCE', 'OVERFLOW_DROP_OLDEST',
+    'Event', 'Dispatcher', 'EventStream', 'Filter', 'Handler',
     'oneshot', 'filter_handler', 'wait_for_first']
 
 
 import asyncio
 import collections
+import functools
 import inspect
 import re
+import sys
+import threading
 import weakref
 
 from . import base
@@ -97,10 +104,48 @@ def _uncamelcase(name):
     s1 = _first_cap_re.sub(r'\1_\2', name)
     return _all_cap_re.sub(r'\1_\2', s1).lower()
 
+#: string: :class:`EventStream` overflow policy that discards the oldest
+#: buffered event to make room for a new one.
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+
+#: string: :class:`EventStream` overflow policy that replaces the newest
+#: buffered event with the new one.
+OVERFLOW_COALESCE = 'coalesce'
+
+#: string: :class:`EventStream` overflow policy that holds up dispatch of
+#: further events to the dispatcher until the consumer catches up.
+OVERFLOW_BLOCK = 'block'
+
+_OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE, OVERFLOW_BLOCK)
+
 registered_events = {}
 
 active_dispatchers = weakref.WeakSet()
 
+# Dispatch plans, computed on first use.  Each cache is cleared once it
+# reaches _MAX_DISPATCH_PLANS entries, so that classes created dynamically
+# don't grow it without bound.
+_MAX_DISPATCH_PLANS = 4096
+# Maps an event class to the tuple of Event classes in its MRO.
+_event_class_chains = {}
+# Maps an event class to the name of its recv_* handler method.
+_handler_method_names = {}
+# Maps a (receiver class, event class) pair to a tuple of
+# (handler method names, default handler name or None, all candidate names).
+_obj_dispatch_plans = {}
+
+
+def _cache_plan(cache, key, plan):
+    if len(cache) >= _MAX_DISPATCH_PLANS:
+        cache.clear()
+    cache[key] = plan
+
+# Events are dispatched inline, rather than via a Task, until a handler
+# returns a coroutine.  Events dispatched by handlers while another dispatch
+# is underway on the same thread are queued here and dispatched once it
+# completes (or awaits), in the same order separate Tasks would have run.
+_inline_dispatch = threading.local()
+
 class _rprop:
     def __init__(self, value):
         self._value = value
@@ -201,25 +246,34 @@ class Event(metaclass=_AutoRegister):
 
     @classmethod
     def _handler_method_name(cls):
-        name = 'recv_' + _uncamelcase(cls.event_name)
-        if cls._internal:
-            name = '_' + name
+        name = _handler_method_names.get(cls)
+        if name is None:
+            name = 'recv_' + _uncamelcase(cls.event_name)
+            if cls._internal:
+                name = '_' + name
+            _cache_plan(_handler_method_names, cls, name)
         return name
 
     def _dispatch_to_func(self, f):
         return f(self, **self._params())
 
     def _dispatch_to_obj(self, obj, fallback_to_default=True):
-        for cls in self._parent_event_classes():
-            f = getattr(obj, cls._handler_method_name(), None)
+        names, default_name, all_names = _obj_dispatch_plan(obj.__class__, self.__class__)
+        instance_dict = getattr(obj, '__dict__', None)
+        if instance_dict:
+            for name in all_names:
+                if name in instance_dict:
+                    # A handler was assigned to the object itself, rather
+                    # than its class, so look up every name on the object.
+                    names, default_name = all_names[:-1], all_names[-1]
+                    break
+        for name in names:
+            f = getattr(obj, name, None)
             if f and not self._is_filtered(f):
                 return self._dispatch_to_func(f)
 
-        if fallback_to_default:
-            name = 'recv_default_handler'
-            if self._internal:
-                name = '_' + name
-            f = getattr(obj, name, None)
+        if fallback_to_default and default_name is not None:
+            f = getattr(obj, default_name, None)
             if f and not self._is_filtered(f):
                 return f(self, **self._params())
 
@@ -237,9 +291,38 @@ class Event(metaclass=_AutoRegister):
         return True
 
     def _parent_event_classes(self):
-        for cls in self.__class__.__mro__:
-            if cls != Event and issubclass(cls, Event):
-                yield cls
+        return _event_class_chain(self.__class__)
+
+
+def _event_class_chain(event_cls):
+    # The event class and its Event superclasses, most specific first.
+    chain = _event_class_chains.get(event_cls)
+    if chain is None:
+        chain = tuple(cls for cls in event_cls.__mro__
+                      if cls != Event and issubclass(cls, Event))
+        _cache_plan(_event_class_chains, event_cls, chain)
+    return chain
+
+
+def _obj_dispatch_plan(obj_cls, event_cls):
+    # Resolves which handler methods a class of receiver defines for a class
+    # of event, so that dispatch needn't probe for every possible name.
+    # Methods are looked up on the class; all_names lists every handler name
+    # (the default handler last) for receivers with handlers of their own.
+    key = (obj_cls, event_cls)
+    plan = _obj_dispatch_plans.get(key)
+    if plan is None:
+        default_name = 'recv_default_handler'
+        if event_cls._internal:
+            default_name = '_' + default_name
+        all_names = tuple(cls._handler_method_name() for cls in _event_class_chain(event_cls))
+        all_names += (default_name,)
+        names = tuple(name for name in all_names[:-1] if hasattr(obj_cls, name))
+        if not hasattr(obj_cls, default_name):
+            default_name = None
+        plan = (names, default_name, all_names)
+        _cache_plan(_obj_dispatch_plans, key, plan)
+    return plan
 
 
 def _register_dynamic_event_type(event_name, attrs):
@@ -278,6 +361,11 @@ class Dispatcher(base.Base):
         self._dispatch_parent = dispatch_parent
         self._dispatch_children = []
         self._dispatch_handlers = collections.defaultdict(list)
+        # Maps event classes to the handlers registered for them (or any of
+        # their superclasses); cleared whenever a handler is added or removed.
+        self._dispatch_handler_cache = {}
+        # The Task finishing the most recent dispatch that awaited a coroutine.
+        self._pending_dispatch = None
         if not loop:
             raise ValueError("Loop was not supplied to "+self.__class__.__name__)
         self._loop = loop or asyncio.get_event_loop()
@@ -337,6 +425,7 @@ class Dispatcher(base.Base):
 
         handler = Handler(self, event, f)
         self._dispatch_handlers[event.event_name].append(handler)
+        self._dispatch_handler_cache.clear()
         return handler
 
     def remove_event_handler(self, event, f):
@@ -359,11 +448,13 @@ class Dispatcher(base.Base):
             for i, h in enumerate(self._dispatch_handlers[event.event_name]):
                 if h == f:
                     del self._dispatch_handlers[event.event_name][i]
+                    self._dispatch_handler_cache.clear()
                     return
         else:
             for i, h in enumerate(self._dispatch_handlers[event.event_name]):
                 if h.f == f:
                     del self._dispatch_handlers[event.event_name][i]
+                    self._dispatch_handler_cache.clear()
                     return
         raise ValueError("No matching handler found for %s (%s)" % (event.event_name, f) )
 
@@ -376,9 +467,12 @@ class Dispatcher(base.Base):
             event (:class:`Event`): An class or instance of :class:`Event`
             kw (dict): If a class is passed to event, then the remaining keywords
                 are passed to it to create an instance of the event.
+        Handlers are called immediately unless one of them is a coroutine,
+        in which case the remainder of the dispatch is completed by a Task.
+
         Returns:
-            A :class:`asyncio.Task` or :class:`asyncio.Future` that will
-            complete once all event handlers have been called.
+            A :class:`asyncio.Future` that will complete once all event
+            handlers have been called.
         Raises:
             :class:`TypeError` if an invalid event is supplied.
         '''
@@ -399,20 +493,44 @@ class Dispatcher(base.Base):
             return
         event._delivered_to.add(id(self))
 
-        handlers = set()
-        for cls in event._parent_event_classes():
-            for handler in self._dispatch_handlers[cls.event_name]:
-                if event._is_filtered(handler.f):
-                    continue
-
-                if getattr(handler.f, '_oneshot_handler', False):
-                    # Disable oneshot events prior to actual dispatch
-                    handler.disable()
-                handlers.add(handler)
+        handlers = []
+        for handler in self._registered_handlers(event_cls):
+            if event._is_filtered(handler.f):
+                continue
 
-        return asyncio.ensure_future(self._dispatch_event(event, handlers), loop=self._loop)
+            if getattr(handler.f, '_oneshot_handler', False):
+                # Disable oneshot events prior to actual dispatch
+                handler.disable()
+            handlers.append(handler)
+
+        fut = asyncio.Future(loop=self._loop)
+        item = (self, self._dispatch_steps(event, handlers), fut)
+        queue = getattr(_inline_dispatch, 'queue', None)
+        if queue is not None:
+            # Already dispatching; this event goes next once that's done.
+            queue.append(item)
+        else:
+            _run_dispatch_queue(collections.deque((item,)))
+        return fut
+
+    def _registered_handlers(self, event_cls):
+        # Returns the handlers registered for the event class or any of its
+        # superclasses, without duplicates.
+        handlers = self._dispatch_handler_cache.get(event_cls)
+        if handlers is None:
+            handlers = []
+            for cls in _event_class_chain(event_cls):
+                for handler in self._dispatch_handlers.get(cls.event_name, ()):
+                    if handler not in handlers:
+                        handlers.append(handler)
+            handlers = tuple(handlers)
+            self._dispatch_handler_cache[event_cls] = handlers
+        return handlers
+
+    def _dispatch_steps(self, event, handlers):
+        # A generator that dispatches the event, yielding any coroutines
+        # returned by handlers which must be awaited before continuing.
 
-    async def _dispatch_event(self, event, handlers):
         # iterate through events from child->parent
         # update the dispatched_to set for each event so each handler
         # only receives the most specific event if they are monitoring for both.
@@ -425,7 +543,7 @@ class Dispatcher(base.Base):
                 else:
                     result = event._dispatch_to_func(handler.f)
                     if asyncio.iscoroutine(result):
-                        await result
+                        yield result
 
             # dispatch to children
             for child in self._dispatch_children:
@@ -434,7 +552,7 @@ class Dispatcher(base.Base):
             # dispatch to self methods
             result = event._dispatch_to_obj(self)
             if asyncio.iscoroutine(result):
-                await result
+                yield result
 
             # dispatch to parent dispatcher
             if self._dispatch_parent:
@@ -443,6 +561,44 @@ class Dispatcher(base.Base):
         except exceptions.StopPropogation:
             pass
 
+    def _start_dispatch(self, steps, fut):
+        coro = None
+        pending = self._pending_dispatch
+        if pending is None or pending.done():
+            # run synchronous handlers inline
+            try:
+                coro = next(steps)
+            except StopIteration:
+                fut.set_result(None)
+                return
+            except Exception as exc:
+                fut.set_exception(exc)
+                return
+        # else an earlier event is still being dispatched; queue behind it
+
+        task = asyncio.ensure_future(self._finish_dispatch(steps, coro), loop=self._loop)
+        task.add_done_callback(functools.partial(_copy_future_state, fut))
+        self._pending_dispatch = task
+
+    async def _finish_dispatch(self, steps, coro):
+        while True:
+            if coro is not None:
+                try:
+                    await coro
+                except exceptions.StopPropogation:
+                    steps.close()
+                    return
+
+            queue = collections.deque()
+            _inline_dispatch.queue = queue
+            try:
+                coro = next(steps, None)
+            finally:
+                # dispatch any events queued by the handlers just called
+                _run_dispatch_queue(queue)
+            if coro is None:
+                return
+
     def _abort_event_futures(self, exc):
         '''Sets an exception on all pending Future handlers
 
@@ -459,6 +615,12 @@ class Dispatcher(base.Base):
                 if not handler.f.done():
                     handler.f.set_exception(exc)
                 handler.disable()
+            else:
+                # Streams register either a bound method, or a wrapper
+                # pointing back to the stream when filtered
+                stream = getattr(handler.f, '_event_stream', getattr(handler.f, '__self__', None))
+                if isinstance(stream, EventStream):
+                    stream._abort(exc)
 
     async def wait_for(self, event_or_filter, timeout=30):
         '''Waits for the specified event to be sent to the current object.
@@ -488,6 +650,55 @@ class Dispatcher(base.Base):
              return await asyncio.wait_for(f, timeout, loop=self._loop)
         return await f
 
+    def stream(self, event_or_filter, maxlen=100, overflow=OVERFLOW_DROP_OLDEST):
+        '''Returns an asynchronous iterator over events sent to the current object.
+
+        Unlike repeatedly calling :meth:`wait_for`, no events are missed
+        between iterations; they're buffered until the consumer is ready
+        for them.  Events that had to be discarded because the consumer
+        fell behind are counted in :attr:`EventStream.dropped_count`.
+
+        Eg::
+
+            async with robot.stream(cozmo.robot.EvtRobotStateUpdated, maxlen=10) as states:
+                async for evt in states:
+                    record(evt.robot.pose)
+
+        Args:
+            event_or_filter (:class:`Event`): Either a :class:`Event` class
+                or a :class:`Filter` instance to receive.
+            maxlen (int): The maximum number of events to buffer.
+            overflow (string): What to do with a new event when the buffer is
+                full; one of :data:`OVERFLOW_DROP_OLDEST`,
+                :data:`OVERFLOW_COALESCE` or :data:`OVERFLOW_BLOCK`.
+        Returns:
+            An :class:`EventStream`, which should be closed when no longer required.
+        Raises:
+            :class:`ValueError` if an invalid maxlen or overflow policy is supplied.
+        '''
+        return EventStream(self, event_or_filter, maxlen=maxlen, overflow=overflow)
+
+
+def _run_dispatch_queue(queue):
+    _inline_dispatch.queue = queue
+    try:
+        while queue:
+            dispatcher, steps, fut = queue.popleft()
+            dispatcher._start_dispatch(steps, fut)
+    finally:
+        _inline_dispatch.queue = None
+
+
+def _copy_future_state(dest, src):
+    if dest.done():
+        return
+    if src.cancelled():
+        dest.cancel()
+    elif src.exception() is not None:
+        dest.set_exception(src.exception())
+    else:
+        dest.set_result(None)
+
 
 def oneshot(f):
     '''Event handler decorator; causes the handler to only be dispatched to once.'''
@@ -566,6 +777,151 @@ class Filter:
         return True
 
 
+class EventStream:
+    '''An asynchronous iterator over the events received by a :class:`Dispatcher`.
+
+    Returned by :meth:`Dispatcher.stream`; a single event handler is
+    registered for the lifetime of the stream, which buffers up to
+    ``maxlen`` events until they're consumed.
+
+    The stream can be used as an asynchronous context manager, which closes
+    the stream on exit.
+    '''
+
+    def __init__(self, dispatcher, event_or_filter, maxlen=100, overflow=OVERFLOW_DROP_OLDEST):
+        if maxlen < 1:
+            raise ValueError('maxlen must be at least 1 (got %s)' % maxlen)
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy %s' % overflow)
+
+        self._loop = dispatcher._loop
+        self._buffer = collections.deque()
+        self._maxlen = maxlen
+        self._overflow = overflow
+        self._dropped_count = 0
+        self._closed = False
+        self._exc = None
+        self._waiter = None
+        self._space_waiter = None
+
+        if overflow == OVERFLOW_BLOCK:
+            f = self._recv_event_blocking
+        else:
+            f = self._recv_event
+
+        if isinstance(event_or_filter, Filter):
+            f = filter_handler(event_or_filter)(self._filterable(f))
+            event = event_or_filter._event
+        else:
+            event = event_or_filter
+
+        self._handler = dispatcher.add_event_handler(event, f)
+
+    def __repr__(self):
+        return '<%s event=%s buffered=%d dropped=%d closed=%s>' % (self.__class__.__name__,
+                self._handler.evt.event_name, len(self._buffer), self._dropped_count, self._closed)
+
+    def __len__(self):
+        return len(self._buffer)
+
+    if sys.version_info < (3, 5, 2):
+        # Python 3.5.1 and earlier expect __aiter__ to return an awaitable
+        async def __aiter__(self):
+            return self
+    else:
+        def __aiter__(self):
+            return self
+
+    async def __anext__(self):
+        while not self._buffer:
+            if self._exc is not None:
+                raise self._exc
+            if self._closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.Future(loop=self._loop)
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+        evt = self._buffer.popleft()
+        _wake(self._space_waiter)
+        return evt
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def dropped_count(self):
+        '''int: The number of events discarded because the buffer was full.
+
+        Always zero for streams using :data:`OVERFLOW_BLOCK`.
+        '''
+        return self._dropped_count
+
+    @property
+    def closed(self):
+        '''bool: True if the stream has been closed.'''
+        return self._closed
+
+    def close(self):
+        '''Stops receiving events.
+
+        Any events already buffered can still be consumed, after which
+        iteration stops.
+        '''
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._handler.disable()
+        except ValueError:
+            # already removed by the dispatcher
+            pass
+        _wake(self._waiter)
+        _wake(self._space_waiter)
+
+    def _abort(self, exc):
+        self._exc = exc
+        self.close()
+
+    def _filterable(self, f):
+        # filter_handler annotates the function it's passed, which isn't
+        # possible for a bound method, so wrap it.
+        def handler(evt, **kw):
+            return f(evt, **kw)
+        handler._event_stream = self
+        return handler
+
+    def _recv_event(self, evt, **kw):
+        if len(self._buffer) >= self._maxlen:
+            self._dropped_count += 1
+            if self._overflow == OVERFLOW_DROP_OLDEST:
+                self._buffer.popleft()
+            else:
+                self._buffer.pop()
+        self._buffer.append(evt)
+        _wake(self._waiter)
+
+    async def _recv_event_blocking(self, evt, **kw):
+        while len(self._buffer) >= self._maxlen and not self._closed:
+            # shared by every blocked dispatch, which wake in the order they blocked
+            if self._space_waiter is None or self._space_waiter.done():
+                self._space_waiter = asyncio.Future(loop=self._loop)
+            await self._space_waiter
+        if not self._closed:
+            self._buffer.append(evt)
+            _wake(self._waiter)
+
+
+def _wake(waiter):
+    if waiter is not None and not waiter.done():
+        waiter.set_result(None)
+
+
 async def wait_for_first(*futures, discard_remaining=True, loop=None):
     '''Wait the first of a set of futures to complete.
 
@@ -27,11 +27,21 @@ with a positive frequency so that the data is streamed to the SDK.
 '''
 
 # __all__ should order by constants, event classes, other classes, functions.
-__all__ = ['EvtNewNavMemoryMap',
-           'NavMemoryMapGrid', 'NavMemoryMapGridNode',
+__all__ = ['EvtNavMemoryMapChanged', 'EvtNewNavMemoryMap',
+           'NavMemoryMapGrid', 'NavMemoryMapGridNode', 'NavMemoryMapRaster',
            'NodeContentTypes']
 
+from array import array
 from collections import namedtuple
+import math
+
+_numpy_available = True
+
+try:
+    import numpy as np
+except ImportError as exc:
+    np = None
+    _numpy_available = exc
 
 from . import event
 from . import logger
@@ -39,11 +49,27 @@ from . import util
 from ._clad import CladEnumWrapper, _clad_to_game_iface
 
 
+def _require_numpy():
+    if _numpy_available is not True:
+        raise ImportError("Nav memory map rasterization not available: %s" % _numpy_available)
+
+
 class EvtNewNavMemoryMap(event.Event):
     '''Dispatched when a new memory map is received.'''
     nav_memory_map = 'A NavMemoryMapGrid object'
 
 
+class EvtNavMemoryMapChanged(event.Event):
+    '''Dispatched after :class:`EvtNewNavMemoryMap` when the new map differs from the previous one.
+
+    Only the regions listed in ``changed_nodes`` need to be updated by
+    anything that tracks the map's contents.
+    '''
+    nav_memory_map = 'The new NavMemoryMapGrid object'
+    previous_nav_memory_map = 'The previous NavMemoryMapGrid object, or None for the first map'
+    changed_nodes = 'A list of the NavMemoryMapGridNode nodes in the new map that differ from the previous map'
+
+
 class _NodeContentType(namedtuple('_NodeContentType', 'name id')):
     # Tuple mapping between CLAD ENodeContentTypeEnum name and ID
     # All instances will be members of ActionResults
@@ -106,34 +132,73 @@ class NavMemoryMapGridNode:
         +---+----+---+
         |   | X->|   |
         +---+----+---+
+
+    Nodes are lightweight views onto the arrays stored by the grid, and are
+    created on demand by :meth:`NavMemoryMapGrid.get_node`,
+    :attr:`NavMemoryMapGrid.root_node` etc.
     """
-    def __init__(self, depth, size, center, parent):
-        #: int: The depth of this node. I.e. how far down the quad-tree is it.
-        self.depth = depth
+    __slots__ = ('_grid', '_index')
 
-        #: float: The size (width or length) of this square node.
-        self.size = size
+    def __init__(self, grid, index):
+        self._grid = grid
+        self._index = index
 
-        #: :class:`~cozmo.util.Vector3`: The center of this node.
-        self.center = center  # type: util.Vector3
+    def __repr__(self):
+        return '<%s center: %s size: %s content: %s>' % (
+            self.__class__.__name__, self.center, self.size, self.content)
 
-        #: :class:`NavMemoryMapGridNode`: The parent of this node. Is ``None`` for the root node.
-        self.parent = parent  # type: NavMemoryMapGridNode
+    def __eq__(self, other):
+        if not isinstance(other, NavMemoryMapGridNode):
+            return NotImplemented
+        return self._grid is other._grid and self._index == other._index
 
-        #: list of :class:`NavMemoryMapGridNode`: ``None`` for leaf nodes, a list of 4
-        #: child nodes otherwise.
-        self.children = None
+    def __hash__(self):
+        return hash((id(self._grid), self._index))
 
-        #: An attribute of :class:`NodeContentTypes`: The content type in this
-        #: node. Only leaf nodes have content, this is ``None`` for all other
-        #: nodes.
-        self.content = None  # type: _NodeContentType
+    @property
+    def depth(self):
+        """int: The depth of this node. I.e. how far down the quad-tree is it."""
+        return self._grid._depth[self._index]
 
-        self._next_child = 0  # Used when building to track which branch to follow
+    @property
+    def size(self):
+        """float: The size (width or length) of this square node."""
+        return self._grid._node_size(self._index)
 
-    def __repr__(self):
-        return '<%s center: %s size: %s content: %s>' % (
-            self.__class__.__name__, self.center, self.size, self.content)
+    @property
+    def center(self):
+        """:class:`~cozmo.util.Vector3`: The center of this node."""
+        grid = self._grid
+        return util.Vector3(grid._center_x[self._index], grid._center_y[self._index], 0.0)
+
+    @property
+    def parent(self):
+        """:class:`NavMemoryMapGridNode`: The parent of this node. Is ``None`` for the root node."""
+        parent = self._grid._parent[self._index]
+        if parent < 0:
+            return None
+        return NavMemoryMapGridNode(self._grid, parent)
+
+    @property
+    def children(self):
+        """list of :class:`NavMemoryMapGridNode`: ``None`` for leaf nodes, a list of 4
+        child nodes otherwise.
+        """
+        first_child = self._grid._first_child[self._index]
+        if first_child < 0:
+            return None
+        return [NavMemoryMapGridNode(self._grid, first_child + i) for i in range(4)]
+
+    @property
+    def content(self):
+        """An attribute of :class:`NodeContentTypes`: The content type in this
+        node. Only leaf nodes have content, this is ``None`` for all other
+        nodes.
+        """
+        content = self._grid._content[self._index]
+        if content < 0:
+            return None
+        return NodeContentTypes.find_by_id(content)
 
     def contains_point(self, x, y):
         """Test if the node contains the given x,y coordinates.
@@ -145,24 +210,7 @@ class NavMemoryMapGridNode:
         Returns:
             bool: True if the node contains the point, False otherwise.
         """
-        half_size = self.size * 0.5
-        dist_x = abs(self.center.x - x)
-        dist_y = abs(self.center.y - y)
-        return (dist_x <= half_size) and (dist_y <= half_size)
-
-    def _get_node(self, x, y, assumed_in_bounds):
-        if not assumed_in_bounds and not self.contains_point(x, y):
-            # point is out of bounds
-            return None
-
-        if self.children is None:
-            return self
-        else:
-            x_offset = 2 if x < self.center.x else 0
-            y_offset = 1 if y < self.center.y else 0
-            child_node = self.children[x_offset+y_offset]
-            # child node is by definition in bounds / on boundary
-            return child_node._get_node(x, y, True)
+        return self._grid._node_contains_point(self._index, x, y)
 
     def get_node(self, x, y):
         """Get the node at the given x,y coordinates.
@@ -175,7 +223,10 @@ class NavMemoryMapGridNode:
             :class:`NavMemoryMapGridNode`: The smallest node that includes the
             point. Will be ``None`` if the point is outside of the map.
         """
-        return self._get_node(x, y, assumed_in_bounds=False)
+        index = self._grid._find_node(x, y, self._index)
+        if index < 0:
+            return None
+        return NavMemoryMapGridNode(self._grid, index)
 
     def get_content(self, x, y):
         """Get the node's content at the given x,y coordinates.
@@ -189,74 +240,40 @@ class NavMemoryMapGridNode:
             Will be :attr:`NodeContentTypes.Unknown` if the point is outside of
             the map.
         """
-        node = self.get_node(x, y)
-        if node:
-            return node.content
-        else:
-            return NodeContentTypes.Unknown
-
-    def _add_child(self, content, depth):
-        """Add a child node to the quad tree.
-
-        The quad-tree is serialized to a flat list of nodes, we deserialize
-        back to a quad-tree structure here, with the depth of each node
-        indicating where it is placed.
-
-        Args:
-            content (:class:`_NodeContentType`): The content to store in the leaf node
-            depth (int): The depth that this leaf node is located at.
-
-        Returns:
-            bool: True if parent should use the next child for future _add_child
-            calls (this is an internal implementation detail of h
-        """
-        if depth > self.depth:
-            logger.error("NavMemoryMapGridNode depth %s > %s", depth, self.depth)
-        if self._next_child > 3:
-            logger.error("NavMemoryMapGridNode _next_child %s (>3) at depth %s", self._next_child, self.depth)
-
-        if self.depth == depth:
-            if self.content is not None:
-                logger.error("NavMemoryMapGridNode: Clobbering %s at depth %s with %s",
-                             self.content, self.depth, content)
-            self.content = content
-            # This node won't be further subdivided, and is now full
-            return True
-
-        if self.children is None:
-            # Create 4 child nodes for quad-tree structure
-            next_depth = self.depth - 1
-            next_size = self.size * 0.5
-            offset = next_size * 0.5
-            center1 = util.Vector3(self.center.x + offset, self.center.y + offset, self.center.z)
-            center2 = util.Vector3(self.center.x + offset, self.center.y - offset, self.center.z)
-            center3 = util.Vector3(self.center.x - offset, self.center.y + offset, self.center.z)
-            center4 = util.Vector3(self.center.x - offset, self.center.y - offset, self.center.z)
-            self.children = [NavMemoryMapGridNode(next_depth, next_size, center1, self),
-                             NavMemoryMapGridNode(next_depth, next_size, center2, self),
-                             NavMemoryMapGridNode(next_depth, next_size, center3, self),
-                             NavMemoryMapGridNode(next_depth, next_size, center4, self)]
-        if self.children[self._next_child]._add_child(content, depth):
-            # Child node is now full, start using the next child
-            self._next_child += 1
-
-        if self._next_child > 3:
-            # All children are now full - parent should start using the next child
-            return True
-        else:
-            # Empty children remain - parent can keep using this child
-            return False
+        return self._grid._content_at(self._grid._find_node(x, y, self._index))
 
 
 class NavMemoryMapGrid:
-    """A navigation memory map, stored as a quad-tree."""
+    """A navigation memory map, stored as a quad-tree.
+
+    The nodes of the tree are stored in parallel arrays, in the order they
+    were created, with the 4 children of each node stored consecutively.
+    """
     def __init__(self, origin_id, root_depth, root_size, root_center_x, root_center_y):
         #: int: The origin ID for the map. Only maps and :class:`~cozmo.util.Pose`
         #: objects of the same origin ID are in the same coordinate frame and
         #: can therefore be compared.
         self.origin_id = origin_id
-        root_center = util.Vector3(root_center_x, root_center_y, 0.0)
-        self._root_node = NavMemoryMapGridNode(root_depth, root_size, root_center, None)
+        self._root_depth = root_depth
+        self._root_size = root_size
+        self._center = util.Vector3(root_center_x, root_center_y, 0.0)
+
+        # Per-node arrays - content is -1 for nodes without content, and
+        # first_child and parent are -1 where there's no such node.
+        self._depth = array('b', (root_depth,))
+        self._content = array('b', (-1,))
+        self._first_child = array('i', (-1,))
+        self._parent = array('i', (-1,))
+        self._center_x = array('d', (root_center_x,))
+        self._center_y = array('d', (root_center_y,))
+
+        # The node that the next quad received will be stored in, and the
+        # parents of that node, used while building the map.
+        self._next_node = 0
+        self._build_path = []
+
+        # Rasterized copies of the map, keyed by resolution and content map
+        self._raster_cache = {}
 
     def __repr__(self):
         return '<%s center: %s size: %s>' % (
@@ -265,17 +282,17 @@ class NavMemoryMapGrid:
     @property
     def root_node(self):
         """:class:`NavMemoryMapGridNode`: The root node for the grid, contains all other nodes."""
-        return self._root_node
+        return NavMemoryMapGridNode(self, 0)
 
     @property
     def size(self):
         """float: The size (width or length) of the square grid."""
-        return self._root_node.size
+        return self._root_size
 
     @property
     def center(self):
         """:class:`~cozmo.util.Vector3`: The center of this map."""
-        return self._root_node.center
+        return self._center
 
     def contains_point(self, x, y):
         """Test if the map contains the given x,y coordinates.
@@ -287,7 +304,7 @@ class NavMemoryMapGrid:
         Returns:
             bool: True if the map contains the point, False otherwise.
         """
-        return self._root_node.contains_point(x,y)
+        return self._node_contains_point(0, x, y)
 
     def get_node(self, x, y):
         """Get the node at the given x,y coordinates.
@@ -300,7 +317,10 @@ class NavMemoryMapGrid:
             :class:`NavMemoryMapGridNode`: The smallest node that includes the
             point. Will be ``None`` if the point is outside of the map.
         """
-        return self._root_node.get_node(x, y)
+        index = self._find_node(x, y, 0)
+        if index < 0:
+            return None
+        return NavMemoryMapGridNode(self, index)
 
     def get_content(self, x, y):
         """Get the map's content at the given x,y coordinates.
@@ -314,9 +334,344 @@ class NavMemoryMapGrid:
             Will be :attr:`NodeContentTypes.Unknown` if the point is outside of
             the map.
         """
-        return self._root_node.get_content(x, y)
+        return self._content_at(self._find_node(x, y, 0))
+
+    def changed_since(self, previous):
+        """Compare this map to an earlier map, to find the regions that have changed.
+
+        Args:
+            previous (:class:`NavMemoryMapGrid`): The earlier map, or ``None``.
+
+        Returns:
+            list of :class:`NavMemoryMapGridNode`: The nodes in this map whose
+            content, or subdivision into child nodes, differs from the same
+            region in ``previous``.  Just the root node if the maps cover
+            different areas or are in different coordinate frames, and empty
+            if the maps are identical.
+        """
+        if (previous is None or previous.origin_id != self.origin_id or
+                previous._root_depth != self._root_depth or
+                previous._root_size != self._root_size or
+                previous._center_x[0] != self._center_x[0] or
+                previous._center_y[0] != self._center_y[0]):
+            return [self.root_node]
+
+        first_child = self._first_child
+        content = self._content
+        previous_first_child = previous._first_child
+        previous_content = previous._content
+
+        # Walk both trees together, depth first, in the same order as the nodes
+        # are serialized
+        changed = []
+        pending = [(0, 0)]
+        while pending:
+            index, previous_index = pending.pop()
+            child = first_child[index]
+            previous_child = previous_first_child[previous_index]
+            if child < 0 and previous_child < 0:
+                if content[index] != previous_content[previous_index]:
+                    changed.append(index)
+            elif child >= 0 and previous_child >= 0:
+                for i in (3, 2, 1, 0):
+                    pending.append((child + i, previous_child + i))
+            else:
+                # One of the nodes has been split or merged
+                changed.append(index)
+        return [NavMemoryMapGridNode(self, index) for index in changed]
+
+    def get_content_many(self, xs, ys):
+        """Get the map's content at many x,y coordinates at once.
+
+        Much faster than calling :meth:`get_content` for each point, for
+        example when checking the points along a path for obstacles.
+
+        Args:
+            xs (:class:`numpy.ndarray`): x coordinates for the points
+            ys (:class:`numpy.ndarray`): y coordinates for the points, the
+                same shape as xs
+
+        Returns:
+            :class:`numpy.ndarray`: An array of content ids (the ``id`` of
+            the :class:`NodeContentTypes` attributes), the same shape as xs.
+            Points outside of the map are :attr:`NodeContentTypes.Unknown`.
+        Raises:
+            :class:`ImportError` if NumPy isn't available.
+            :class:`ValueError` if xs and ys are different shapes.
+        """
+        _require_numpy()
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if xs.shape != ys.shape:
+            raise ValueError('xs and ys must be the same shape (got %s and %s)' % (xs.shape, ys.shape))
+
+        flat_x = xs.ravel()
+        flat_y = ys.ravel()
+        first_child = np.frombuffer(self._first_child, dtype=np.int32)
+        center_x = np.frombuffer(self._center_x, dtype=np.float64)
+        center_y = np.frombuffer(self._center_y, dtype=np.float64)
+
+        # Descend one level at a time for all of the points that haven't
+        # reached a leaf yet
+        half_size = self._root_size * 0.5
+        in_bounds = np.flatnonzero((np.abs(flat_x - self._center.x) <= half_size) &
+                                   (np.abs(flat_y - self._center.y) <= half_size))
+        nodes = np.zeros(len(in_bounds), dtype=np.intp)
+        active = np.arange(len(in_bounds))
+        while len(active):
+            current = nodes[active]
+            children = first_child[current]
+            is_split = children >= 0
+            active = active[is_split]
+            current = current[is_split]
+            points = in_bounds[active]
+            nodes[active] = (children[is_split] +
+                             np.where(flat_x[points] < center_x[current], 2, 0) +
+                             np.where(flat_y[points] < center_y[current], 1, 0))
+
+        result = np.full(len(flat_x), NodeContentTypes.Unknown.id, dtype=np.int8)
+        content = np.frombuffer(self._content, dtype=np.int8)[nodes]
+        result[in_bounds] = np.where(content < 0, NodeContentTypes.Unknown.id, content)
+        return result.reshape(xs.shape)
+
+    def to_grid(self, resolution_mm, content_map=None):
+        """Rasterize the map into a dense 2D array of content.
+
+        The result is cached, so repeated calls with the same arguments are
+        cheap.
+
+        Args:
+            resolution_mm (float): The width and length of each cell in millimeters.
+            content_map (dict): Maps attributes of :class:`NodeContentTypes` to
+                the value (0-255) to store for that content.  Content types
+                missing from the map are stored as 0. If ``None``, the
+                content's id is stored.
+
+        Returns:
+            :class:`NavMemoryMapRaster`: The rasterized map.  Each cell holds
+            the content at its center, or 0 if its center is outside the map.
+        Raises:
+            :class:`ImportError` if NumPy isn't available.
+            :class:`ValueError` if resolution_mm isn't positive.
+        """
+        _require_numpy()
+        if resolution_mm <= 0:
+            raise ValueError('resolution_mm must be positive (got %s)' % resolution_mm)
+
+        if content_map is None:
+            cache_key = (resolution_mm, None)
+        else:
+            cache_key = (resolution_mm, tuple(sorted((c.id, v) for c, v in content_map.items())))
+        raster = self._raster_cache.get(cache_key)
+        if raster is None:
+            raster = self._rasterize(resolution_mm, content_map)
+            self._raster_cache[cache_key] = raster
+        return raster
+
+    def _leaf_arrays(self):
+        # Returns (indices, content ids) of all leaf nodes, with unfilled
+        # leaves in an incomplete map treated as Unknown.
+        indices = np.flatnonzero(np.frombuffer(self._first_child, dtype=np.int32) < 0)
+        content = np.frombuffer(self._content, dtype=np.int8)[indices]
+        return indices, np.where(content < 0, NodeContentTypes.Unknown.id, content)
+
+    def _leaf_quads(self):
+        # Returns (center x, center y, half size, content id) arrays for all
+        # leaf nodes, as used for rasterizing and rendering the map.
+        indices, content = self._leaf_arrays()
+        half_sizes = 0.5 * self._root_size * (0.5 ** (
+                self._root_depth - np.frombuffer(self._depth, dtype=np.int8)[indices]))
+        center_x = np.frombuffer(self._center_x, dtype=np.float64)[indices]
+        center_y = np.frombuffer(self._center_y, dtype=np.float64)[indices]
+        return center_x, center_y, half_sizes, content
+
+    def _rasterize(self, resolution_mm, content_map):
+        if content_map is None:
+            values = None
+        else:
+            max_id = max(NodeContentTypes._id_to_entry_type)
+            values = np.zeros(max_id + 1, dtype=np.uint8)
+            for content, value in content_map.items():
+                values[content.id] = value
+
+        num_cells = int(math.ceil(self._root_size / resolution_mm))
+        origin_x = self._center.x - self._root_size * 0.5
+        origin_y = self._center.y - self._root_size * 0.5
+
+        center_x, center_y, half_sizes, content = self._leaf_quads()
+        if values is not None:
+            content = values[content]
+
+        # Cells belong to the leaf containing their center, with leaves
+        # including their lower edges, as with get_content.
+        def cell_range(low, origin):
+            cells = np.ceil((low - origin) / resolution_mm - 0.5).astype(np.intp)
+            return np.clip(cells, 0, num_cells)
+        col_start = cell_range(center_x - half_sizes, origin_x)
+        col_end = cell_range(center_x + half_sizes, origin_x)
+        row_start = cell_range(center_y - half_sizes, origin_y)
+        row_end = cell_range(center_y + half_sizes, origin_y)
+
+        data = np.zeros((num_cells, num_cells), dtype=np.uint8)
+        for value, r0, r1, c0, c1 in zip(content.tolist(), row_start.tolist(), row_end.tolist(),
+                                         col_start.tolist(), col_end.tolist()):
+            data[r0:r1, c0:c1] = value
+        data.flags.writeable = False
+        return NavMemoryMapRaster(data, resolution_mm, origin_x, origin_y, self.origin_id)
+
+    def _node_size(self, index):
+        # Each level down the tree halves the size
+        return self._root_size * (0.5 ** (self._root_depth - self._depth[index]))
+
+    def _node_contains_point(self, index, x, y):
+        half_size = self._node_size(index) * 0.5
+        dist_x = abs(self._center_x[index] - x)
+        dist_y = abs(self._center_y[index] - y)
+        return (dist_x <= half_size) and (dist_y <= half_size)
+
+    def _find_node(self, x, y, index):
+        # Returns the index of the leaf node containing x,y, searching down
+        # from the node at index, or -1 if the point is out of bounds.
+        center_x = self._center_x
+        center_y = self._center_y
+        half_size = self._node_size(index) * 0.5
+        if abs(center_x[index] - x) > half_size or abs(center_y[index] - y) > half_size:
+            # point is out of bounds
+            return -1
+        first_child = self._first_child
+        child = first_child[index]
+        while child >= 0:
+            # child node is by definition in bounds / on boundary
+            x_offset = 2 if x < center_x[index] else 0
+            y_offset = 1 if y < center_y[index] else 0
+            index = child + x_offset + y_offset
+            child = first_child[index]
+        return index
+
+    def _content_at(self, index):
+        if index < 0:
+            return NodeContentTypes.Unknown
+        content = self._content[index]
+        if content < 0:
+            return None
+        return NodeContentTypes.find_by_id(content)
+
+    def _split_node(self, index):
+        # Append 4 child nodes for the node at index, returning the index of the first
+        first_child = len(self._depth)
+        child_depth = self._depth[index] - 1
+        offset = self._node_size(index) * 0.25
+        center_x = self._center_x[index]
+        center_y = self._center_y[index]
+        self._depth.extend((child_depth,) * 4)
+        self._content.extend((-1,) * 4)
+        self._first_child.extend((-1,) * 4)
+        self._parent.extend((index,) * 4)
+        self._center_x.extend((center_x + offset, center_x + offset, center_x - offset, center_x - offset))
+        self._center_y.extend((center_y + offset, center_y - offset, center_y + offset, center_y - offset))
+        self._first_child[index] = first_child
+        return first_child
 
     def _add_quad(self, content, depth):
-        # Convert content int to our enum representation
-        content = NodeContentTypes.find_by_id(content)
-        self._root_node._add_child(content, depth)
+        """Add a leaf node to the quad tree.
+
+        The quad-tree is serialized to a flat, depth-first list of leaf nodes;
+        we deserialize back to a quad-tree structure here, with the depth of
+        each node indicating where it is placed.
+
+        Args:
+            content (int): The id of the content to store in the leaf node
+            depth (int): The depth that this leaf node is located at.
+        """
+        index = self._next_node
+        if index < 0:
+            logger.error("NavMemoryMapGrid: Ignoring quad at depth %s - map is already complete", depth)
+            return
+
+        path = self._build_path
+        node_depth = self._depth
+        if depth > node_depth[index]:
+            logger.error("NavMemoryMapGridNode depth %s > %s", depth, node_depth[index])
+        while node_depth[index] > depth:
+            path.append(index)
+            index = self._split_node(index)
+        self._content[index] = content
+
+        # Move on to the next sibling, or the parent's next sibling once all
+        # of a node's children are full
+        first_child = self._first_child
+        while path:
+            if index - first_child[path[-1]] < 3:
+                self._next_node = index + 1
+                return
+            index = path.pop()
+        self._next_node = -1
+
+
+class NavMemoryMapRaster:
+    """A :class:`NavMemoryMapGrid` rasterized into a dense grid of cells.
+
+    Returned by :meth:`NavMemoryMapGrid.to_grid`.
+    """
+    def __init__(self, data, resolution_mm, origin_x, origin_y, origin_id):
+        #: :class:`numpy.ndarray`: A read-only rows x columns array of ``uint8``
+        #: content values. Rows run along the Y axis and columns along the X
+        #: axis, so the value for cell ``(row, col)`` is ``data[row, col]``.
+        self.data = data
+
+        #: float: The width and length of each cell in millimeters.
+        self.resolution_mm = resolution_mm
+
+        #: float: The X coordinate of the lower edge of the first column.
+        self.origin_x = origin_x
+
+        #: float: The Y coordinate of the lower edge of the first row.
+        self.origin_y = origin_y
+
+        #: int: The origin ID of the map that was rasterized.
+        self.origin_id = origin_id
+
+    def __repr__(self):
+        return '<%s shape: %s resolution_mm: %s origin: (%s, %s)>' % (
+            self.__class__.__name__, self.data.shape, self.resolution_mm,
+            self.origin_x, self.origin_y)
+
+    @property
+    def extent(self):
+        """tuple of float: The (min_x, max_x, min_y, max_y) bounds of the grid."""
+        rows, cols = self.data.shape
+        return (self.origin_x, self.origin_x + cols * self.resolution_mm,
+                self.origin_y, self.origin_y + rows * self.resolution_mm)
+
+    def world_to_index(self, x, y):
+        """Convert world coordinates to the indices of the cell containing them.
+
+        Accepts scalars or NumPy arrays of coordinates.  The indices are not
+        clipped, so may be outside of the grid for points outside of the map.
+
+        Args:
+            x (float): x coordinate(s) for the point(s)
+            y (float): y coordinate(s) for the point(s)
+
+        Returns:
+            A tuple of (row, col) indices.
+        """
+        row = np.floor((np.asarray(y) - self.origin_y) / self.resolution_mm).astype(np.intp)
+        col = np.floor((np.asarray(x) - self.origin_x) / self.resolution_mm).astype(np.intp)
+        return row, col
+
+    def index_to_world(self, row, col):
+        """Convert cell indices to the world coordinates of the cell centers.
+
+        Accepts scalars or NumPy arrays of indices.
+
+        Args:
+            row (int): Row index(es) of the cell(s)
+            col (int): Column index(es) of the cell(s)
+
+        Returns:
+            A tuple of (x, y) coordinates.
+        """
+        x = self.origin_x + (np.asarray(col) + 0.5) * self.resolution_mm
+        y = self.origin_y + (np.asarray(row) + 0.5) * self.resolution_mm
+        return x, y
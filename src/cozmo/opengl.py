@@ -20,6 +20,10 @@ platforms. It also depends on the Pillow library for image processing.
 The easiest way to make use of this viewer is to call :func:`cozmo.run_program`
 with `use_3d_viewer=True` or :func:`cozmo.run.connect_with_3dviewer`.
 
+The 3D models and textures are parsed the first time the viewer is run, and
+cached in the user's cache directory (e.g. ``~/.cache/cozmo/3dviewer`` on
+Linux) so that later runs start faster.  The cache can safely be deleted.
+
 Warning:
     This package requires Python to have the PyOpenGL package installed, along
     with an implementation of GLUT (OpenGL Utility Toolkit).
@@ -45,14 +49,22 @@ __all__ = ['DynamicTexture', 'LoadedObjFile', 'OpenGLViewer', 'OpenGLWindow',
 
 
 import collections
+import ctypes
+import hashlib
+import io
+import json
 import math
+import os
+import shutil
+import sys
 import time
-from pkg_resources import resource_stream
+from pkg_resources import resource_stream, resource_string
 
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
 
+import numpy as np
 from PIL import Image
 
 from .exceptions import InvalidOpenGLGlutImplementation, RobotBusy
@@ -148,11 +160,183 @@ class DynamicTexture:
         self._height = image_height
 
 
+class _VertexBuffer:
+    """An OpenGL vertex buffer object (VBO) of interleaved float32 vertex data.
+
+    Each vertex is a position, optionally followed by a normal, a texture
+    coordinate and an RGBA color, in that order.  The whole buffer is drawn
+    with a handful of OpenGL calls, rather than one call per vertex as with
+    glBegin / glEnd.
+
+    Args:
+        normals (bool): True if each vertex has a normal.
+        tex_coords (bool): True if each vertex has a texture coordinate.
+        colors (bool): True if each vertex has a color.
+    """
+
+    def __init__(self, normals=False, tex_coords=False, colors=False):
+        self._vbo = glGenBuffers(1)
+        self._normals = normals
+        self._tex_coords = tex_coords
+        self._colors = colors
+        self._normal_offset = 3
+        self._tex_coord_offset = self._normal_offset + (3 if normals else 0)
+        self._color_offset = self._tex_coord_offset + (2 if tex_coords else 0)
+
+        #: int: The number of floats in each vertex.
+        self.vertex_size = self._color_offset + (4 if colors else 0)
+
+        #: int: The number of vertices in the buffer.
+        self.vertex_count = 0
+
+    def update(self, vertices, usage=GL_STATIC_DRAW):
+        """Replace the contents of the buffer.
+
+        Args:
+            vertices (:class:`numpy.ndarray`): The vertex data, with one row
+                of :attr:`vertex_size` values per vertex.
+            usage (int): A hint as to how often the buffer will be updated,
+                e.g. GL_STATIC_DRAW or GL_DYNAMIC_DRAW.
+        """
+        vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, self.vertex_size)
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, usage)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.vertex_count = len(vertices)
+
+    def bind(self):
+        """Bind the buffer, and point OpenGL's vertex arrays at it, ready for drawing."""
+        stride = self.vertex_size * 4
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, stride, ctypes.c_void_p(0))
+        if self._normals:
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glNormalPointer(GL_FLOAT, stride, ctypes.c_void_p(self._normal_offset * 4))
+        if self._tex_coords:
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glTexCoordPointer(2, GL_FLOAT, stride, ctypes.c_void_p(self._tex_coord_offset * 4))
+        if self._colors:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(4, GL_FLOAT, stride, ctypes.c_void_p(self._color_offset * 4))
+
+    def unbind(self):
+        """Unbind the buffer, after drawing."""
+        glDisableClientState(GL_VERTEX_ARRAY)
+        if self._normals:
+            glDisableClientState(GL_NORMAL_ARRAY)
+        if self._tex_coords:
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        if self._colors:
+            glDisableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, mode, first=0, count=None):
+        """Draw vertices from the buffer, which must be bound.
+
+        Args:
+            mode (int): The primitives to draw, e.g. GL_TRIANGLES.
+            first (int): The index of the first vertex to draw.
+            count (int): The number of vertices to draw, or None for all of
+                the remaining vertices.
+        """
+        if count is None:
+            count = self.vertex_count - first
+        if count > 0:
+            glDrawArrays(mode, first, count)
+
+
+def _default_cache_dir():
+    # The per-user cache directory, following each platform's conventions
+    if sys.platform in ('win32', 'cygwin'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'cozmo', 'Cache')
+    elif sys.platform.startswith('darwin'):
+        return os.path.expanduser(os.path.join('~', 'Library', 'Caches', 'cozmo'))
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(base, 'cozmo')
+
+
+# The directory that parsed assets are cached in, or None to disable caching.
+_asset_cache_dir = os.path.join(_default_cache_dir(), '3dviewer')
+
+# Changes whenever the format of the cached data changes
+_ASSET_CACHE_VERSION = 1
+
+
+def _load_cached_asset(filename, parse):
+    """Load the parsed contents of an asset, from the cache if possible.
+
+    Parsed assets are cached as a directory of ``.npy`` arrays, which are
+    memory-mapped when loaded, alongside a JSON file of everything else.
+    The directory is named after a hash of the asset, so any change to the
+    asset is picked up.
+
+    Args:
+        filename (str): The filename of the asset to load.
+        parse (callable): Called with the contents of the asset if it isn't
+            cached, returning a (metadata, arrays) tuple where metadata can
+            be serialized to JSON and arrays is a dict of named
+            :class:`numpy.ndarray`.
+
+    Returns:
+        tuple: The (metadata, arrays) tuple returned by parse.
+    """
+    resource_path = '/'.join(('assets', filename))  # Note: Deliberately not os.path.join, for use with pkg_resources
+    data = resource_string(_resource_package, resource_path)
+
+    cache_path = None
+    if _asset_cache_dir is not None:
+        digest = hashlib.sha1(data)
+        digest.update(str(_ASSET_CACHE_VERSION).encode('ascii'))
+        cache_path = os.path.join(_asset_cache_dir, '%s-%s' % (filename, digest.hexdigest()))
+        try:
+            with open(os.path.join(cache_path, 'metadata.json')) as f:
+                cached = json.load(f)
+            arrays = {name: np.load(os.path.join(cache_path, name + '.npy'), mmap_mode='r')
+                      for name in cached['arrays']}
+            return cached['metadata'], arrays
+        except (OSError, ValueError, KeyError):
+            # Not cached yet (or the cache is unreadable)
+            pass
+
+    metadata, arrays = parse(data)
+
+    if cache_path is not None:
+        # Write to a temporary directory and then rename it, so that other
+        # processes never see a partially written entry.
+        temp_path = '%s.%d.tmp' % (cache_path, os.getpid())
+        try:
+            os.makedirs(temp_path, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(os.path.join(temp_path, name + '.npy'), array)
+            with open(os.path.join(temp_path, 'metadata.json'), 'w') as f:
+                json.dump({'metadata': metadata, 'arrays': sorted(arrays)}, f)
+            # Replace any broken entry left by an earlier run
+            shutil.rmtree(cache_path, ignore_errors=True)
+            os.rename(temp_path, cache_path)
+        except OSError as e:
+            logger.debug("Unable to cache %s in %s: %s", filename, cache_path, e)
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+    return metadata, arrays
+
+
+def _decode_texture(data):
+    # Returns the RGBA pixels of an image
+    with Image.open(io.BytesIO(data)) as image:
+        pixels = np.asarray(image.convert("RGBA"))
+    return {}, {'rgba': pixels}
+
+
 def LoadMtlFile(filename):
     """Load a .mtl material file, and return the contents as a dictionary.
 
     Supports the subset of MTL required for the Cozmo 3D viewer assets.
 
+    Texture maps are decoded once and cached as raw pixels, so they are
+    quick to load on later runs.
+
     Args:
         filename (str): The filename of the file to load.
 
@@ -182,12 +366,9 @@ def LoadMtlFile(filename):
             raise ValueError("mtl file must start with newmtl statement")
         elif attribute_name == 'map_Kd':
             # Diffuse texture map - load the image into memory
-            image_name = values[1]
-            image_resource_path = '/'.join(('assets', image_name))  # Note: Deliberately not os.path.join, for use with pkg_resources
-            image_file_data = resource_stream(_resource_package, image_resource_path)
-            with Image.open(image_file_data) as image:
-                image_width, image_height = image.size
-                image = image.convert("RGBA").tobytes("raw", "RGBA")
+            _, arrays = _load_cached_asset(values[1], _decode_texture)
+            image = arrays['rgba']
+            image_height, image_width = image.shape[:2]
 
             # Bind the image as a texture that can be used for rendering
             texture_id =  glGenTextures(1)
@@ -205,6 +386,121 @@ def LoadMtlFile(filename):
     return contents
 
 
+def _parse_obj_file(data):
+    """Parse the contents of an OBJ file into arrays, for :class:`LoadedObjFile`."""
+    vertices = []
+    normals = []
+    tex_coords = []
+    # The position, normal and texture coordinate index of each vertex of each face
+    face_indices = []
+    face_sizes = []
+    face_meshes = []
+    face_materials = []
+    mesh_names = []
+    material_names = []
+    mtllib = None
+
+    mesh_index = None
+    material_index = None
+
+    def _index_of(names, name):
+        try:
+            return names.index(name)
+        except ValueError:
+            names.append(name)
+            return len(names) - 1
+
+    group_name = None
+    material = None
+
+    for line in data.splitlines():
+        line = line.decode("utf-8")  # Convert bytes to string
+        if line.startswith('#'):
+            # ignore comments in the file
+            continue
+
+        values = line.split()
+        if not values:
+            # ignore empty lines
+            continue
+
+        if values[0] == 'v':
+            # vertex position
+            vertices.append(values[1:4])
+        elif values[0] == 'vn':
+            # vertex normal
+            normals.append(values[1:4])
+        elif values[0] == 'vt':
+            # texture coordinate
+            tex_coords.append(values[1:3])
+        elif values[0] in ('usemtl', 'usemat'):
+            # material
+            material = values[1]
+            material_index = None
+        elif values[0] == 'mtllib':
+            # material library (a filename)
+            mtllib = values[1]
+        elif values[0] == 'f':
+            # A face made up of 3 or 4 vertices - e.g. `f v1 v2 v3` or `f v1 v2 v3 v4`
+            # where each vertex definition is multiple indexes seperated by
+            # slashes and can follow the following formats:
+            # position_index
+            # position_index/tex_coord_index
+            # position_index/tex_coord_index/normal_index
+            # position_index//normal_index
+            for vertex in values[1:]:
+                vertex_components = vertex.split('/')
+
+                position = int(vertex_components[0])
+
+                # There's only a texture coordinate if there's at least 2 entries and the 2nd entry is non-zero length
+                if len(vertex_components) >= 2 and len(vertex_components[1]) > 0:
+                    tex_coord = int(vertex_components[1])
+                else:
+                    # OBJ file indexing starts at 1, so use 0 to indicate no entry
+                    tex_coord = 0
+
+                # There's only a normal if there's at least 2 entries and the 2nd entry is non-zero length
+                if len(vertex_components) >= 3 and len(vertex_components[2]) > 0:
+                    normal = int(vertex_components[2])
+                else:
+                    # OBJ file indexing starts at 1, so use 0 to indicate no entry
+                    normal = 0
+
+                face_indices.append((position, normal, tex_coord))
+
+            if mesh_index is None:
+                mesh_index = _index_of(mesh_names, group_name)
+            if material_index is None:
+                material_index = _index_of(material_names, material)
+            face_sizes.append(len(values) - 1)
+            face_meshes.append(mesh_index)
+            face_materials.append(material_index)
+        elif values[0] == 'o':
+            # object name - ignore
+            pass
+        elif values[0] == 'g':
+            # group name (for a sub-mesh)
+            group_name = values[1]
+            mesh_index = None
+        elif values[0] == 's':
+            # smooth shading (1..20, and 'off') - ignore
+            pass
+        else:
+            logger.warning("LoadedObjFile Ignoring unhandled type '%s' in line %s",
+                           values[0], values)
+
+    metadata = {'mtllib': mtllib, 'mesh_names': mesh_names, 'material_names': material_names}
+    arrays = {'vertices': np.array(vertices, dtype=np.float32).reshape(-1, 3),
+              'normals': np.array(normals, dtype=np.float32).reshape(-1, 3),
+              'tex_coords': np.array(tex_coords, dtype=np.float32).reshape(-1, 2),
+              'face_indices': np.array(face_indices, dtype=np.int32).reshape(-1, 3),
+              'face_sizes': np.array(face_sizes, dtype=np.int32),
+              'face_meshes': np.array(face_meshes, dtype=np.int32),
+              'face_materials': np.array(face_materials, dtype=np.int32)}
+    return metadata, arrays
+
+
 class LoadedObjFile:
     """The loaded / parsed contents of a 3D Wavefront OBJ file.
 
@@ -213,108 +509,111 @@ class LoadedObjFile:
     Cozmo and Cube assets, and does not attempt to exhaustively support every
     possible setting.
 
+    The parsed file is cached as packed arrays, keyed by a hash of the file,
+    so later runs can load them directly without parsing the file again.
+
     Args:
         filename (str): The filename of the OBJ file to load.
     """
     def __init__(self, filename):
-        # list: The vertices (each vertex stored as list of 3 floats).
-        self.vertices = []
-        # list: The vertex normals (each normal stored as list of 3 floats).
-        self.normals = []
-        # list: The texture coordinates (each coordinate stored as list of 2 floats).
-        self.tex_coords = []
-        # dict: The faces for each mesh, indexed by mesh name.
-        self.mesh_faces = {}
+        metadata, arrays = _load_cached_asset(filename, _parse_obj_file)
+
+        # numpy.ndarray: The vertices (an N x 3 array of float32).
+        self.vertices = arrays['vertices']
+        # numpy.ndarray: The vertex normals (an N x 3 array of float32).
+        self.normals = arrays['normals']
+        # numpy.ndarray: The texture coordinates (an N x 2 array of float32).
+        self.tex_coords = arrays['tex_coords']
 
         # dict: A dictionary mapping named MTL attributes to values.
         self.mtl = None
+        if metadata['mtllib'] is not None:
+            self.mtl = LoadMtlFile(metadata['mtllib'])
+
+        # The faces are stored as the (position, normal, texture coordinate)
+        # indices of each of their vertices in turn, along with the number of
+        # vertices, the mesh and the material of each face.
+        self._face_indices = arrays['face_indices']
+        self._face_sizes = arrays['face_sizes']
+        self._face_meshes = arrays['face_meshes']
+        self._face_materials = arrays['face_materials']
+        self._mesh_names = metadata['mesh_names']
+        self._material_names = metadata['material_names']
+        self._mesh_faces = None
 
-        group_name = None
-        material = None
-
-        resource_path = '/'.join(('assets', filename))  # Note: Deliberately not os.path.join, for use with pkg_resources
-        file_data = resource_stream(_resource_package, resource_path)
-
-        for line in file_data:
-            line = line.decode("utf-8")  # Convert bytes to string
-            if line.startswith('#'):
-                # ignore comments in the file
-                continue
-
-            values = line.split()
-            if not values:
-                # ignore empty lines
-                continue
-
-            if values[0] == 'v':
-                # vertex position
-                v = list(map(float, values[1:4]))
-                self.vertices.append(v)
-            elif values[0] == 'vn':
-                # vertex normal
-                v = list(map(float, values[1:4]))
-                self.normals.append(v)
-            elif values[0] == 'vt':
-                # texture coordinate
-                self.tex_coords.append(list(map(float, values[1:3])))
-            elif values[0] in ('usemtl', 'usemat'):
-                # material
-                material = values[1]
-            elif values[0] == 'mtllib':
-                # material library (a filename)
-                self.mtl = LoadMtlFile(values[1])
-            elif values[0] == 'f':
-                # A face made up of 3 or 4 vertices - e.g. `f v1 v2 v3` or `f v1 v2 v3 v4`
-                # where each vertex definition is multiple indexes seperated by
-                # slashes and can follow the following formats:
-                # position_index
-                # position_index/tex_coord_index
-                # position_index/tex_coord_index/normal_index
-                # position_index//normal_index
-
-                positions = []
-                tex_coords = []
-                normals = []
-
-                for vertex in values[1:]:
-                    vertex_components = vertex.split('/')
-
-                    positions.append(int(vertex_components[0]))
-
-                    # There's only a texture coordinate if there's at least 2 entries and the 2nd entry is non-zero length
-                    if len(vertex_components) >= 2 and len(vertex_components[1]) > 0:
-                        tex_coords.append(int(vertex_components[1]))
-                    else:
-                        # OBJ file indexing starts at 1, so use 0 to indicate no entry
-                        tex_coords.append(0)
-
-                    # There's only a normal if there's at least 2 entries and the 2nd entry is non-zero length
-                    if len(vertex_components) >= 3 and len(vertex_components[2]) > 0:
-                        normals.append(int(vertex_components[2]))
-                    else:
-                        # OBJ file indexing starts at 1, so use 0 to indicate no entry
-                        normals.append(0)
+    @property
+    def mesh_faces(self):
+        '''dict: The faces for each mesh, indexed by mesh name.
+
+        Each face is a (positions, normals, texture coordinates, material)
+        tuple, with a list of indices for each of the face's vertices.
+        '''
+        if self._mesh_faces is None:
+            mesh_faces = {name: [] for name in self._mesh_names}
+            start = 0
+            for size, mesh, material in zip(self._face_sizes.tolist(), self._face_meshes.tolist(),
+                                            self._face_materials.tolist()):
+                positions, normals, tex_coords = self._face_indices[start:start + size].T.tolist()
+                mesh_faces[self._mesh_names[mesh]].append(
+                    (positions, normals, tex_coords, self._material_names[material]))
+                start += size
+            self._mesh_faces = mesh_faces
+        return self._mesh_faces
+
+
+def _triangulate(object_data):
+    """Triangulate the faces of a loaded OBJ file, grouped by mesh and material.
+
+    Each polygon is split into a fan of triangles, as the faces in the Cozmo
+    assets are all convex.
 
-                try:
-                    mesh_face = self.mesh_faces[group_name]
-                except KeyError:
-                    # Create a new mesh group
-                    self.mesh_faces[group_name] = []
-                    mesh_face = self.mesh_faces[group_name]
-
-                mesh_face.append((positions, normals, tex_coords, material))
-            elif values[0] == 'o':
-                # object name - ignore
-                pass
-            elif values[0] == 'g':
-                # group name (for a sub-mesh)
-                group_name = values[1]
-            elif values[0] == 's':
-                # smooth shading (1..20, and 'off') - ignore
-                pass
-            else:
-                logger.warning("LoadedObjFile Ignoring unhandled type '%s' in line %s",
-                               values[0], values)
+    Returns:
+        tuple: A (vertices, draws) tuple, where vertices is a
+        :class:`numpy.ndarray` of float32 position, normal and texture
+        coordinate for every triangle vertex, and draws maps each mesh name to
+        a list of [material name, first vertex, vertex count] lists.
+    """
+    face_sizes = object_data._face_sizes
+    face_starts = np.cumsum(face_sizes) - face_sizes
+
+    # Order the faces by mesh, keeping them in file order within each mesh
+    faces = np.argsort(object_data._face_meshes, kind='mergesort')  # the stable sort in every NumPy
+    triangle_counts = np.maximum(face_sizes[faces] - 2, 0)
+    triangle_faces = np.repeat(faces, triangle_counts)
+
+    # Triangle i of a face has its first, i+1'th and i+2'th vertices
+    num_triangles = len(triangle_faces)
+    first_triangles = np.cumsum(triangle_counts) - triangle_counts
+    i = np.arange(num_triangles) - np.repeat(first_triangles, triangle_counts)
+    first_vertex = face_starts[triangle_faces]
+    corners = np.stack([first_vertex, first_vertex + i + 1, first_vertex + i + 2], axis=1).ravel()
+    position_indices, normal_indices, tex_coord_indices = object_data._face_indices[corners].T
+
+    # OBJ file indexing starts at 1, with 0 indicating no entry, so prepend
+    # the value to use for vertices without a normal or texture coordinate.
+    def _indexable(values, default):
+        return np.vstack([np.array(default, dtype=np.float32), values])
+
+    vertices = np.hstack([_indexable(object_data.vertices, [0.0, 0.0, 0.0])[position_indices],
+                          _indexable(object_data.normals, [0.0, 0.0, 1.0])[normal_indices],
+                          _indexable(object_data.tex_coords, [0.0, 0.0])[tex_coord_indices]])
+
+    # Consecutive triangles with the same mesh and material are drawn together
+    triangle_meshes = object_data._face_meshes[triangle_faces]
+    triangle_materials = object_data._face_materials[triangle_faces]
+    run_starts = np.flatnonzero((triangle_meshes[1:] != triangle_meshes[:-1]) |
+                                (triangle_materials[1:] != triangle_materials[:-1])) + 1
+    run_starts = [0] + run_starts.tolist()
+    run_ends = run_starts[1:] + [num_triangles]
+
+    draws = {name: [] for name in object_data._mesh_names}
+    for start, end in zip(run_starts, run_ends):
+        if start == end:
+            continue
+        mesh = object_data._mesh_names[triangle_meshes[start]]
+        material = object_data._material_names[triangle_materials[start]]
+        draws[mesh].append([material, start * 3, (end - start) * 3])
+    return vertices, draws
 
 
 class RenderableObject:
@@ -322,6 +621,10 @@ class RenderableObject:
 
     Can contain multiple meshes, for e.g. articulated objects.
 
+    The vertices of every mesh are stored in a single vertex buffer object
+    on the graphics card, and each material in a display list, so drawing
+    a mesh takes only a couple of OpenGL calls per material it uses.
+
     Args:
         object_data (LoadedObjFile): The object data (vertices, faces, etc.)
             to generate the renderable object from.
@@ -333,84 +636,102 @@ class RenderableObject:
     """
     def __init__(self, object_data: LoadedObjFile, override_mtl=None):
         #: dict: The individual meshes, indexed by name, for this object.
+        #: Each mesh is a list of (material display list, first vertex,
+        #: vertex count) tuples, drawn by :meth:`draw_mesh`.
         self.meshes = {}
         mtl_dict = override_mtl if (override_mtl is not None) else object_data.mtl
 
-        def _as_rgba(color):
-            if len(color) >= 4:
-                return color
-            else:
-                # RGB - add alpha defaulted to 1
-                return color + [1.0]
-
-        for key in object_data.mesh_faces:
-            new_gl_list = glGenLists(1)
-            glNewList(new_gl_list, GL_COMPILE)
+        vertices, draws = _triangulate(object_data)
+        self._vertex_buffer = _VertexBuffer(normals=True, tex_coords=True)
+        self._vertex_buffer.update(vertices)
 
-            self.meshes[key] = new_gl_list
+        material_lists = {}
+        for key, mesh_draws in draws.items():
+            mesh = self.meshes[key] = []
+            for material, first, count in mesh_draws:
+                material_list = material_lists.get(material)
+                if material_list is None:
+                    material_list = material_lists[material] = _make_material_list(mtl_dict[material])
+                mesh.append((material_list, first, count))
 
-            part_faces = object_data.mesh_faces[key]
+    def bind(self):
+        """Prepare to draw meshes with :meth:`draw_mesh`."""
+        glEnable(GL_TEXTURE_2D)
+        glFrontFace(GL_CCW)
+        self._vertex_buffer.bind()
 
-            glEnable(GL_TEXTURE_2D)
-            glFrontFace(GL_CCW)
+    def unbind(self):
+        """Finish drawing meshes with :meth:`draw_mesh`."""
+        self._vertex_buffer.unbind()
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_TEXTURE_2D)
 
-            for face in part_faces:
-                vertices, normals, texture_coords, material = face
+    def draw_mesh(self, key):
+        """Draw one of the meshes, between calls to :meth:`bind` and :meth:`unbind`.
 
-                mtl = mtl_dict[material]
-                if 'texture_Kd' in mtl:
-                    # use diffuse texture map
-                    glBindTexture(GL_TEXTURE_2D, mtl['texture_Kd'])
-                else:
-                    # No texture map
-                    glBindTexture(GL_TEXTURE_2D, 0)
-
-                # Diffuse light
-                mtl_kd_rgba = _as_rgba(mtl['Kd'])
-                glColor(mtl_kd_rgba)
-
-                # Ambient light
-                if 'Ka' in mtl:
-                    mtl_ka_rgba = _as_rgba(mtl['Ka'])
-                    glMaterialfv(GL_FRONT, GL_AMBIENT, mtl_ka_rgba)
-                    glMaterialfv(GL_FRONT, GL_DIFFUSE, mtl_kd_rgba)
-                else:
-                    glMaterialfv(GL_FRONT, GL_AMBIENT_AND_DIFFUSE, mtl_kd_rgba);
-
-                # Specular light
-                if 'Ks' in mtl:
-                    mtl_ks_rgba = _as_rgba(mtl['Ks'])
-                    glMaterialfv(GL_FRONT, GL_SPECULAR, mtl_ks_rgba);
-                    if 'Ns' in mtl:
-                        specular_exponent = mtl['Ns']
-                        glMaterialfv(GL_FRONT, GL_SHININESS, specular_exponent);
-
-                # Polygon (N verts) with optional normals and tex coords
-                glBegin(GL_POLYGON)
-                for i in range(len(vertices)):
-                    normal_index = normals[i]
-                    if normal_index > 0:
-                        glNormal3fv(object_data.normals[normal_index - 1])
-                    tex_coord_index = texture_coords[i]
-                    if tex_coord_index > 0:
-                        glTexCoord2fv( object_data.tex_coords[tex_coord_index - 1])
-                    glVertex3fv(object_data.vertices[vertices[i] - 1])
-                glEnd()
-
-            glDisable(GL_TEXTURE_2D)
-            glEndList()
+        Args:
+            key (str): The name of the mesh to draw.
+        """
+        for material_list, first, count in self.meshes[key]:
+            glCallList(material_list)
+            glDrawArrays(GL_TRIANGLES, first, count)
 
     def draw_all(self):
         """Draw all of the meshes."""
-        for mesh in self.meshes.values():
-            glCallList(mesh)
+        self.bind()
+        for key in self.meshes:
+            self.draw_mesh(key)
+        self.unbind()
 
 
-def _make_unit_cube():
-    """Make a unit-size cube, with normals, centered at the origin"""
+def _make_material_list(mtl):
+    """Compile a display list that sets up OpenGL to draw with a material."""
+    def _as_rgba(color):
+        if len(color) >= 4:
+            return color
+        else:
+            # RGB - add alpha defaulted to 1
+            return color + [1.0]
+
     new_gl_list = glGenLists(1)
     glNewList(new_gl_list, GL_COMPILE)
 
+    if 'texture_Kd' in mtl:
+        # use diffuse texture map
+        glBindTexture(GL_TEXTURE_2D, mtl['texture_Kd'])
+    else:
+        # No texture map
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    # Diffuse light
+    mtl_kd_rgba = _as_rgba(mtl['Kd'])
+    glColor(mtl_kd_rgba)
+
+    # Ambient light
+    if 'Ka' in mtl:
+        mtl_ka_rgba = _as_rgba(mtl['Ka'])
+        glMaterialfv(GL_FRONT, GL_AMBIENT, mtl_ka_rgba)
+        glMaterialfv(GL_FRONT, GL_DIFFUSE, mtl_kd_rgba)
+    else:
+        glMaterialfv(GL_FRONT, GL_AMBIENT_AND_DIFFUSE, mtl_kd_rgba);
+
+    # Specular light
+    if 'Ks' in mtl:
+        mtl_ks_rgba = _as_rgba(mtl['Ks'])
+        glMaterialfv(GL_FRONT, GL_SPECULAR, mtl_ks_rgba);
+        if 'Ns' in mtl:
+            specular_exponent = mtl['Ns']
+            glMaterialfv(GL_FRONT, GL_SHININESS, specular_exponent);
+
+    glEndList()
+
+    return new_gl_list
+
+
+def _make_unit_cube():
+    """Make a unit-size cube, with normals, centered at the origin"""
+    vertices = []
+
     # build each of the 6 faces
     for face_index in range(6):
         # calculate normal and vertices for this face
@@ -438,18 +759,89 @@ def _make_unit_cube():
 
         vertex_pos = list(vertex_normal)
 
-        # Polygon (N verts) with optional normals and tex coords
-        glBegin(GL_POLYGON)
+        # Quad with normals
         for vert_index in range(4):
             vertex_pos[v1i] = vertex_pos_options1[vert_index]
             vertex_pos[v2i] = vertex_pos_options2[vert_index]
-            glNormal3fv(vertex_normal)
-            glVertex3fv(vertex_pos)
-        glEnd()
+            vertices.append(vertex_pos + vertex_normal)
 
-    glEndList()
+    vertex_buffer = _VertexBuffer(normals=True)
+    vertex_buffer.update(vertices)
+    return vertex_buffer
 
-    return new_gl_list
+
+_NAV_MAP_OUTLINE_COLOR = (0.65, 0.65, 0.65)  # light gray
+
+_NAV_MAP_FILL_ALPHA = 0.5
+
+# The corners of each nav map node, as multiples of the node's half size, in
+# the order they're drawn as a quad.
+_NAV_MAP_QUAD_CORNERS = np.array([[1.0, 1.0], [1.0, -1.0], [-1.0, -1.0], [-1.0, 1.0]])
+
+# The corners at each end of the 4 line segments outlining a node.
+_NAV_MAP_OUTLINE_CORNERS = _NAV_MAP_QUAD_CORNERS[[0, 1, 1, 2, 2, 3, 3, 0]]
+
+
+# The fill color for each content id, built on first use
+_nav_memory_map_color_table = None
+
+
+def _nav_memory_map_colors(content_ids):
+    # Returns the RGBA fill color for each of the content ids
+    global _nav_memory_map_color_table
+    if _nav_memory_map_color_table is None:
+        nct = nav_memory_map.NodeContentTypes
+        colors = {nct.Unknown.id: (0.3, 0.3, 0.3),         # dark gray
+                  nct.ClearOfObstacle.id: (0.0, 1.0, 0.0), # green
+                  nct.ClearOfCliff.id: (0.0, 0.5, 0.0),    # dark green
+                  nct.ObstacleCube.id: (1.0, 0.0, 0.0),    # red
+                  nct.ObstacleCharger.id: (1.0, 0.5, 0.0), # orange
+                  nct.Cliff.id: (0.0, 0.0, 0.0),           # black
+                  nct.VisionBorder.id: (1.0, 1.0, 0.0)     # yellow
+                  }
+
+        # Any other content is white
+        table = np.ones((max(nct._id_to_entry_type) + 1, 4), dtype=np.float32)
+        for content_id, color in colors.items():
+            table[content_id, :3] = color
+        table[:, 3] = _NAV_MAP_FILL_ALPHA
+        _nav_memory_map_color_table = table
+    return _nav_memory_map_color_table[content_ids]
+
+
+def _nav_memory_map_vertices(nav_map):
+    """Build the vertices to render a nav memory map with.
+
+    Every leaf node is drawn as a translucent quad, filled with the color of
+    its content, and outlined with line segments.  The vertices for all of
+    the nodes are generated at once from the map's arrays of leaf nodes, by
+    positioning a copy of the corners of a unit quad for each node.
+
+    Returns:
+        tuple: A (fill, outline) tuple of float32 :class:`numpy.ndarray`.
+        The fill has a position and color for 4 vertices per node, and the
+        outline a position for 8 vertices per node, plus the map's border.
+    """
+    center_x, center_y, half_sizes, content = nav_map._leaf_quads()
+    cen = nav_map.center
+    fill_z = cen.z - 0.4
+
+    fill = np.empty((len(content), 4, 7), dtype=np.float32)
+    fill[:, :, 0] = center_x[:, None] + half_sizes[:, None] * _NAV_MAP_QUAD_CORNERS[:, 0]
+    fill[:, :, 1] = center_y[:, None] + half_sizes[:, None] * _NAV_MAP_QUAD_CORNERS[:, 1]
+    fill[:, :, 2] = fill_z
+    fill[:, :, 3:] = _nav_memory_map_colors(content)[:, None, :]
+
+    # The outline of every node, followed by the outline of the whole map
+    center_x = np.append(center_x, cen.x)
+    center_y = np.append(center_y, cen.y)
+    half_sizes = np.append(half_sizes, nav_map.size * 0.5)
+    outline = np.empty((len(half_sizes), 8, 3), dtype=np.float32)
+    outline[:, :, 0] = center_x[:, None] + half_sizes[:, None] * _NAV_MAP_OUTLINE_CORNERS[:, 0]
+    outline[:, :, 1] = center_y[:, None] + half_sizes[:, None] * _NAV_MAP_OUTLINE_CORNERS[:, 1]
+    outline[:, :, 2] = cen.z
+
+    return fill.reshape(-1, 7), outline.reshape(-1, 3)
 
 
 class OpenGLWindow():
@@ -609,6 +1001,7 @@ class OpenGLViewer():
     def __init__(self, enable_camera_view, show_viewer_controls=True):
         # Queues from SDK thread to OpenGL thread
         self._img_queue = collections.deque(maxlen=1)
+        # Each entry holds the vertices for a whole map, so only the latest is needed
         self._nav_memory_map_queue = collections.deque(maxlen=1)
         self._world_frame_queue = collections.deque(maxlen=1)
         # Queue from OpenGL thread to SDK thread
@@ -642,7 +1035,13 @@ class OpenGLViewer():
         self.cube_objects = []
 
         self._latest_world_frame = None  # type: WorldRenderFrame
-        self._nav_memory_map_display_list = None
+        self._nav_memory_map_fill = None  # type: _VertexBuffer
+        self._nav_memory_map_outline = None  # type: _VertexBuffer
+
+        # The durations of the most recent frames, and how long each took to render
+        self._frame_times = collections.deque(maxlen=30)
+        self._render_times = collections.deque(maxlen=30)
+        self._last_frame_start = None
 
         # Keyboard
         self._is_key_pressed = {}
@@ -758,101 +1157,37 @@ class OpenGLViewer():
     def _draw_memory_map(self):
         # Update the renderable map if new data is available, and
         # render the latest map received.
-        new_nav_memory_map = None
         try:
-            new_nav_memory_map = self._nav_memory_map_queue.popleft()
+            fill, outline = self._nav_memory_map_queue.popleft()
         except IndexError:
             # no new nav map - queue is empty
             pass
-
-        # Rebuild the renderable map if it has changed
-        if new_nav_memory_map is not None:
-            cen = new_nav_memory_map.center
-            half_size = new_nav_memory_map.size * 0.5
-
-            if self._nav_memory_map_display_list is None:
-                self._nav_memory_map_display_list = glGenLists(1)
-            glNewList(self._nav_memory_map_display_list, GL_COMPILE)
-
-            glPushMatrix()
-
-            color_light_gray = (0.65, 0.65, 0.65)
-            glColor3f(*color_light_gray)
-            glBegin(GL_LINE_STRIP)
-            glVertex3f(cen.x + half_size, cen.y + half_size, cen.z)  # TL
-            glVertex3f(cen.x + half_size, cen.y - half_size, cen.z)  # TR
-            glVertex3f(cen.x - half_size, cen.y - half_size, cen.z)  # BR
-            glVertex3f(cen.x - half_size, cen.y + half_size, cen.z)  # BL
-            glVertex3f(cen.x + half_size, cen.y + half_size,
-                       cen.z)  # TL (close loop)
-            glEnd()
-
-            def color_for_content(content):
-                nct = nav_memory_map.NodeContentTypes
-                colors = {nct.Unknown.id: (0.3, 0.3, 0.3),         # dark gray
-                          nct.ClearOfObstacle.id: (0.0, 1.0, 0.0), # green
-                          nct.ClearOfCliff.id: (0.0, 0.5, 0.0),    # dark green
-                          nct.ObstacleCube.id: (1.0, 0.0, 0.0),    # red
-                          nct.ObstacleCharger.id: (1.0, 0.5, 0.0), # orange
-                          nct.Cliff.id: (0.0, 0.0, 0.0),           # black
-                          nct.VisionBorder.id: (1.0, 1.0, 0.0)     # yellow
-                          }
-
-                col = colors.get(content.id)
-                if col is None:
-                    logger.error("Unhandled content type %s" % str(content))
-                    col = (1.0, 1.0, 1.0)  # white
-                return col
-
-            fill_z = cen.z - 0.4
-
-            def _recursive_draw(grid_node: nav_memory_map.NavMemoryMapGridNode):
-                if grid_node.children is not None:
-                    for child in grid_node.children:
-                        _recursive_draw(child)
-                else:
-                    # leaf node - render as a quad
-                    map_alpha = 0.5
-                    cen = grid_node.center
-                    half_size = grid_node.size * 0.5
-
-                    # Draw outline
-                    glColor4f(*color_light_gray, 1.0)  # fully opaque
-                    glBegin(GL_LINE_STRIP)
-                    glVertex3f(cen.x + half_size, cen.y + half_size, cen.z)
-                    glVertex3f(cen.x + half_size, cen.y - half_size, cen.z)
-                    glVertex3f(cen.x - half_size, cen.y - half_size, cen.z)
-                    glVertex3f(cen.x - half_size, cen.y + half_size, cen.z)
-                    glVertex3f(cen.x + half_size, cen.y + half_size, cen.z)
-                    glEnd()
-
-                    # Draw filled contents
-                    glColor4f(*color_for_content(grid_node.content), map_alpha)
-                    glBegin(GL_TRIANGLE_STRIP)
-                    glVertex3f(cen.x + half_size, cen.y + half_size, fill_z)
-                    glVertex3f(cen.x + half_size, cen.y - half_size, fill_z)
-                    glVertex3f(cen.x - half_size, cen.y + half_size, fill_z)
-                    glVertex3f(cen.x - half_size, cen.y - half_size, fill_z)
-                    glEnd()
-
-            _recursive_draw(new_nav_memory_map.root_node)
-
-            glPopMatrix()
-            glEndList()
         else:
-            # The source data hasn't changed - keep using the same call list
-            pass
+            if self._nav_memory_map_fill is None:
+                self._nav_memory_map_fill = _VertexBuffer(colors=True)
+                self._nav_memory_map_outline = _VertexBuffer()
+            self._nav_memory_map_fill.update(fill, GL_DYNAMIC_DRAW)
+            self._nav_memory_map_outline.update(outline, GL_DYNAMIC_DRAW)
 
-        if self._nav_memory_map_display_list is not None:
+        if self._nav_memory_map_fill is not None:
             glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
             glEnable(GL_BLEND)
-            glPushMatrix()
-            glCallList(self._nav_memory_map_display_list)
-            glPopMatrix()
+
+            # Draw the outlines, fully opaque
+            glColor4f(*_NAV_MAP_OUTLINE_COLOR, 1.0)
+            self._nav_memory_map_outline.bind()
+            self._nav_memory_map_outline.draw(GL_LINES)
+            self._nav_memory_map_outline.unbind()
+
+            # Draw the filled contents
+            self._nav_memory_map_fill.bind()
+            self._nav_memory_map_fill.draw(GL_QUADS)
+            self._nav_memory_map_fill.unbind()
 
 
     def _draw_cozmo(self, robot_frame):
-        if self.cozmo_object is None:
+        cozmo_object = self.cozmo_object
+        if cozmo_object is None:
             return
 
         robot_pose = robot_frame.pose
@@ -896,18 +1231,20 @@ class OpenGLViewer():
         HEAD_PIVOT_X = -1.1
         HEAD_PIVOT_Z = 4.75
 
+        cozmo_object.bind()
+
         # Render the static body meshes - first the main body:
-        glCallList(self.cozmo_object.meshes["body_geo"])
+        cozmo_object.draw_mesh("body_geo")
         # Render the left treads and wheels
-        glCallList(self.cozmo_object.meshes["trackBase_L_geo"])
-        glCallList(self.cozmo_object.meshes["wheel_BL_geo"])
-        glCallList(self.cozmo_object.meshes["wheel_FL_geo"])
-        glCallList(self.cozmo_object.meshes["tracks_L_geo"])
+        cozmo_object.draw_mesh("trackBase_L_geo")
+        cozmo_object.draw_mesh("wheel_BL_geo")
+        cozmo_object.draw_mesh("wheel_FL_geo")
+        cozmo_object.draw_mesh("tracks_L_geo")
         # Render the right treads and wheels
-        glCallList(self.cozmo_object.meshes["trackBase_R_geo"])
-        glCallList(self.cozmo_object.meshes["wheel_BR_geo"])
-        glCallList(self.cozmo_object.meshes["wheel_FR_geo"])
-        glCallList(self.cozmo_object.meshes["tracks_R_geo"])
+        cozmo_object.draw_mesh("trackBase_R_geo")
+        cozmo_object.draw_mesh("wheel_BR_geo")
+        cozmo_object.draw_mesh("wheel_FR_geo")
+        cozmo_object.draw_mesh("tracks_R_geo")
 
         # Render the fork at the front (but not the arms)
         glPushMatrix()
@@ -920,7 +1257,7 @@ class OpenGLViewer():
         glRotatef(-lift_angle, 0, 1, 0)
         glTranslatef(-FORK_PIVOT_X, 0.0, -FORK_PIVOT_Z)
         # Render
-        glCallList(self.cozmo_object.meshes["fork_geo"])
+        cozmo_object.draw_mesh("fork_geo")
         glPopMatrix()
 
         # Render the upper arms:
@@ -930,8 +1267,8 @@ class OpenGLViewer():
         glRotatef(lift_angle, 0, 1, 0)
         glTranslatef(-UPPER_ARM_PIVOT_X, 0.0, -UPPER_ARM_PIVOT_Z)
         # Render
-        glCallList(self.cozmo_object.meshes["uprArm_L_geo"])
-        glCallList(self.cozmo_object.meshes["uprArm_geo"])
+        cozmo_object.draw_mesh("uprArm_L_geo")
+        cozmo_object.draw_mesh("uprArm_geo")
         glPopMatrix()
 
         # Render the lower arms:
@@ -941,8 +1278,8 @@ class OpenGLViewer():
         glRotatef(lift_angle, 0, 1, 0)
         glTranslatef(-LOWER_ARM_PIVOT_X, 0.0, -LOWER_ARM_PIVOT_Z)
         # Render
-        glCallList(self.cozmo_object.meshes["lwrArm_L_geo"])
-        glCallList(self.cozmo_object.meshes["lwrArm_R_geo"])
+        cozmo_object.draw_mesh("lwrArm_L_geo")
+        cozmo_object.draw_mesh("lwrArm_R_geo")
         glPopMatrix()
 
         # Render the head:
@@ -952,23 +1289,25 @@ class OpenGLViewer():
         glRotatef(-head_angle, 0, 1, 0)
         glTranslatef(-HEAD_PIVOT_X, 0.0, -HEAD_PIVOT_Z)
         # Render all of the head meshes
-        glCallList(self.cozmo_object.meshes["head_geo"])
+        cozmo_object.draw_mesh("head_geo")
         # Screen
-        glCallList(self.cozmo_object.meshes["backScreen_mat"])
-        glCallList(self.cozmo_object.meshes["screenEdge_geo"])
-        glCallList(self.cozmo_object.meshes["overscan_1_geo"])
+        cozmo_object.draw_mesh("backScreen_mat")
+        cozmo_object.draw_mesh("screenEdge_geo")
+        cozmo_object.draw_mesh("overscan_1_geo")
         # Eyes
-        glCallList(self.cozmo_object.meshes["eye_L_geo"])
-        glCallList(self.cozmo_object.meshes["eye_R_geo"])
+        cozmo_object.draw_mesh("eye_L_geo")
+        cozmo_object.draw_mesh("eye_R_geo")
         # Eyelids
-        glCallList(self.cozmo_object.meshes["eyeLid_R_top_geo"])
-        glCallList(self.cozmo_object.meshes["eyeLid_L_top_geo"])
-        glCallList(self.cozmo_object.meshes["eyeLid_L_btm_geo"])
-        glCallList(self.cozmo_object.meshes["eyeLid_R_btm_geo"])
+        cozmo_object.draw_mesh("eyeLid_R_top_geo")
+        cozmo_object.draw_mesh("eyeLid_L_top_geo")
+        cozmo_object.draw_mesh("eyeLid_L_btm_geo")
+        cozmo_object.draw_mesh("eyeLid_R_btm_geo")
         # Face cover (drawn last as it's translucent):
-        glCallList(self.cozmo_object.meshes["front_Screen_geo"])
+        cozmo_object.draw_mesh("front_Screen_geo")
         glPopMatrix()
 
+        cozmo_object.unbind()
+
         glDisable(GL_LIGHTING)
         glPopMatrix()
 
@@ -991,10 +1330,17 @@ class OpenGLViewer():
         else:
             glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
 
-        glCallList(self.unit_cube)
+        self.unit_cube.bind()
+        self.unit_cube.draw(GL_QUADS)
+        self.unit_cube.unbind()
 
 
     def _display_3d_view(self, window):
+        frame_start = time.perf_counter()
+        if self._last_frame_start is not None:
+            self._frame_times.append(frame_start - self._last_frame_start)
+        self._last_frame_start = frame_start
+
         glutSetWindow(window.gl_window)
 
         # Clear the screen and the depth buffer
@@ -1121,10 +1467,12 @@ class OpenGLViewer():
 
         if self._show_controls:
             self._draw_controls()
+        self._draw_frame_time(window)
 
         # Draw the (translucent) nav map last so it's sorted correctly against opaque geometry
         self._draw_memory_map()
 
+        self._render_times.append(time.perf_counter() - frame_start)
         glutSwapBuffers()
 
     def _draw_controls(self):
@@ -1135,6 +1483,21 @@ class OpenGLViewer():
         else: 
             self._draw_text(GLUT_BITMAP_9_BY_15, self._instructions, 10, 10)
 
+    def _draw_frame_time(self, window):
+        # Show the average time between frames, and spent rendering each frame
+        if not self._frame_times:
+            return
+        try:
+            GLUT_BITMAP_9_BY_15
+        except NameError:
+            pass
+        else:
+            frame_time = sum(self._frame_times) / len(self._frame_times)
+            render_time = sum(self._render_times) / len(self._render_times)
+            text = 'Frame: %.1f ms (%.0f fps) Render: %.1f ms' % (
+                frame_time * 1000, 1.0 / frame_time, render_time * 1000)
+            self._draw_text(GLUT_BITMAP_9_BY_15, text, 10, window.height - 20)
+
     def _draw_text(self, font, input, x, y, line_height=16, r=1.0, g=1.0, b=1.0):
         '''Render text based on window position. The origin is in the bottom-left.'''
         glColor3f(r, g, b)
@@ -1407,7 +1770,7 @@ class OpenGLViewer():
         # viewer (can be overridden by user application after connection).
         sdk_robot.world.request_nav_memory_map(0.5)
         self._nav_map_handler = sdk_robot.world.add_event_handler(
-            nav_memory_map.EvtNewNavMemoryMap, self.on_new_nav_memory_map)
+            nav_memory_map.EvtNavMemoryMapChanged, self.on_nav_memory_map_changed)
 
     def disconnect(self):
         """Called from the SDK when the program is complete and it's time to exit."""
@@ -1483,7 +1846,8 @@ class OpenGLViewer():
         annotated_image = image.annotate_image(fit_size=fit_size)
         self._img_queue.append(annotated_image)
 
-    def on_new_nav_memory_map(self, evt, *, nav_memory_map, **kw):
-        # Called from SDK whenever a new nav memory map is available
-        # Note: This is called from the SDK thread, so only access safe things
-        self._nav_memory_map_queue.append(nav_memory_map)
+    def on_nav_memory_map_changed(self, evt, *, nav_memory_map, changed_nodes, **kw):
+        # Called from SDK whenever a new nav memory map differs from the previous one
+        # Note: This is called from the SDK thread, so only access safe things.
+        # The vertices are built here, leaving just the upload to the OpenGL thread.
+        self._nav_memory_map_queue.append(_nav_memory_map_vertices(nav_memory_map))
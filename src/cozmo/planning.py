@@ -0,0 +1,478 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Path planning over Cozmo's navigation memory map.
+
+A :class:`GridPlanner` rasterizes a :class:`~cozmo.nav_memory_map.NavMemoryMapGrid`
+into a grid of traversal costs, and searches it for the cheapest route
+between two points, avoiding cubes, the charger and cliffs.  The resulting
+:class:`Path` is a list of waypoint poses which can be driven one at a time
+with :meth:`cozmo.robot.Robot.go_to_pose`, or all at once with :func:`follow_path`::
+
+    planner = cozmo.planning.GridPlanner(robot.world.nav_memory_map, clearance_mm=30)
+    path = planner.plan(robot.pose, cozmo.util.pose_z_angle(500, 200, 0, cozmo.util.degrees(0)))
+    if path is not None:
+        await cozmo.planning.follow_path(robot, path)
+
+The planner is incremental: when the memory map is updated with
+:meth:`GridPlanner.update_map`, or the robot moves towards the same goal,
+the next :meth:`~GridPlanner.plan` call only revisits the part of the search
+affected by the change.
+
+Requires NumPy to be installed.
+'''
+
+# __all__ should order by constants, event classes, other classes, functions.
+__all__ = ['DEFAULT_COSTS', 'GridPlanner', 'Path', 'follow_path']
+
+
+import heapq
+import math
+
+from . import nav_memory_map
+from . import util
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_INF = float('inf')
+
+_SQRT2 = math.sqrt(2)
+
+# The heuristic is scaled down by this much so that rounding errors never
+# make it an overestimate, which could end the search before the route
+# through a cell tied with the start has been found.
+_HEURISTIC_SCALE = 1.0 - 1e-9
+
+
+#: dict: The default cost of driving through each type of content, relative
+#: to the distance driven.  ``None`` marks content that can't be driven through.
+DEFAULT_COSTS = {
+    nav_memory_map.NodeContentTypes.Unknown: 2.0,
+    nav_memory_map.NodeContentTypes.ClearOfObstacle: 1.0,
+    nav_memory_map.NodeContentTypes.ClearOfCliff: 1.0,
+    nav_memory_map.NodeContentTypes.VisionBorder: 1.0,
+    nav_memory_map.NodeContentTypes.ObstacleCube: None,
+    nav_memory_map.NodeContentTypes.ObstacleCharger: None,
+    nav_memory_map.NodeContentTypes.Cliff: None,
+    nav_memory_map.NodeContentTypes._ObstacleProx: None,
+}
+
+
+class Path:
+    '''A route planned by :class:`GridPlanner`.
+
+    Returned by :meth:`GridPlanner.plan`.
+    '''
+    def __init__(self, waypoints, points, cost):
+        #: list of :class:`cozmo.util.Pose`: The poses to drive through in turn,
+        #: at each change of direction, ending at the goal.  Each is facing
+        #: towards the next waypoint, with the last facing the goal's heading.
+        self.waypoints = waypoints
+
+        #: list of tuple: The (x, y) center of every grid cell on the route,
+        #: in millimeters.
+        self.points = points
+
+        #: float: The total cost of the route; the distance driven in
+        #: millimeters, weighted by the cost of the content driven through.
+        self.cost = cost
+
+    def __repr__(self):
+        return '<%s waypoints=%d cost=%.1f>' % (self.__class__.__name__, len(self.waypoints), self.cost)
+
+    def __len__(self):
+        return len(self.waypoints)
+
+    def __iter__(self):
+        return iter(self.waypoints)
+
+
+class GridPlanner:
+    '''Plans routes across a navigation memory map.
+
+    Searches an 8-connected grid using D* Lite, an incremental variant of A*
+    which searches backwards from the goal, so that replanning after the
+    robot has moved or the map has changed reuses the previous search.
+
+    Args:
+        nav_map (:class:`~cozmo.nav_memory_map.NavMemoryMapGrid`): The map to plan across.
+        resolution_mm (float): The size of each grid cell in millimeters.
+        costs (dict): Overrides for :data:`DEFAULT_COSTS`, mapping attributes of
+            :class:`~cozmo.nav_memory_map.NodeContentTypes` to the cost of
+            driving through them, or ``None`` if they can't be driven through.
+        clearance_mm (float): Keep at least this distance from anything that
+            can't be driven through, eg. half the robot's width.
+    Raises:
+        :class:`ImportError` if NumPy isn't available.
+        :class:`ValueError` if a cost is not positive.
+    '''
+    def __init__(self, nav_map, resolution_mm=10.0, costs=None, clearance_mm=0.0):
+        nav_memory_map._require_numpy()
+        self._resolution_mm = resolution_mm
+        self._clearance_mm = clearance_mm
+
+        all_costs = dict(DEFAULT_COSTS)
+        if costs:
+            all_costs.update(costs)
+        max_id = max(nav_memory_map.NodeContentTypes._id_to_entry_type)
+        self._cost_lookup = np.full(max_id + 1, np.inf)
+        for content, cost in all_costs.items():
+            if cost is not None:
+                if cost <= 0:
+                    raise ValueError('Costs must be positive (got %s for %s)' % (cost, content))
+                self._cost_lookup[content.id] = cost
+        traversable = self._cost_lookup[np.isfinite(self._cost_lookup)]
+        min_cost = float(traversable.min()) if len(traversable) else 1.0
+        self._heuristic_scale = min_cost * _HEURISTIC_SCALE
+
+        self._raster = None
+        self._costs = None
+        self._load_map(nav_map)
+
+    def __repr__(self):
+        return '<%s grid=%dx%d resolution_mm=%s>' % (self.__class__.__name__,
+                self._width - 2, self._height - 2, self._resolution_mm)
+
+    @property
+    def raster(self):
+        ''':class:`~cozmo.nav_memory_map.NavMemoryMapRaster`: The rasterized map being planned across.'''
+        return self._raster
+
+    @property
+    def cost_grid(self):
+        ''':class:`numpy.ndarray`: The cost of driving through each cell, indexed
+        the same as :attr:`raster`, with ``inf`` for cells that can't be
+        driven through.
+        '''
+        return np.array(self._costs, dtype=np.float64).reshape(
+                self._height, self._width)[1:-1, 1:-1]
+
+    def update_map(self, nav_map):
+        '''Replace the map being planned across.
+
+        If the new map covers the same area as the old one, only the cells
+        whose cost has changed are updated, and the next call to :meth:`plan`
+        repairs the previous search rather than starting again.
+
+        Args:
+            nav_map (:class:`~cozmo.nav_memory_map.NavMemoryMapGrid`): The new map.
+
+        Returns:
+            int: The number of cells whose cost changed.
+        '''
+        return self._load_map(nav_map)
+
+    def plan(self, start, goal):
+        '''Find the cheapest route between two points.
+
+        Args:
+            start (:class:`cozmo.util.Pose`): Where to start from, typically
+                the robot's current pose.
+            goal (:class:`cozmo.util.Pose`): Where to drive to.
+
+        Returns:
+            A :class:`Path`, or ``None`` if the goal can't be reached.
+        Raises:
+            :class:`ValueError` if the start or goal are outside of the map.
+        '''
+        start_cell = self._cell_for_pose(start, 'start')
+        goal_cell = self._cell_for_pose(goal, 'goal')
+
+        if goal_cell != self._goal:
+            self._reset_search(start_cell, goal_cell)
+        elif start_cell != self._start:
+            # The heuristic is relative to the start, so keys already in the
+            # queue are adjusted by how far it has moved
+            self._key_modifier += self._heuristic(self._last_start, start_cell)
+            self._last_start = start_cell
+            self._start = start_cell
+
+        self._compute_shortest_path()
+        if self._rhs[start_cell] == _INF:
+            return None
+        return self._extract_path(start_cell, goal)
+
+    # Map handling
+
+    def _load_map(self, nav_map):
+        raster = nav_map.to_grid(self._resolution_mm)
+        costs = self._cost_lookup[raster.data]
+        if self._clearance_mm > 0:
+            costs = self._inflate(costs)
+
+        # Pad with impassable cells so neighbors never need bounds checks
+        height, width = costs.shape
+        padded = np.full((height + 2, width + 2), np.inf)
+        padded[1:-1, 1:-1] = costs
+
+        previous = self._raster
+        self._raster = raster
+        if (previous is None or previous.data.shape != raster.data.shape or
+                previous.origin_x != raster.origin_x or previous.origin_y != raster.origin_y or
+                previous.origin_id != raster.origin_id):
+            self._height, self._width = padded.shape
+            self._costs = padded.ravel().tolist()
+            width = self._width
+            self._neighbors = ((-width - 1, _SQRT2, -width, -1), (-width, 1.0, None, None),
+                               (-width + 1, _SQRT2, -width, 1), (-1, 1.0, None, None),
+                               (1, 1.0, None, None), (width - 1, _SQRT2, width, -1),
+                               (width, 1.0, None, None), (width + 1, _SQRT2, width, 1))
+            self._goal = None
+            return raster.data.size
+
+        old_costs = np.array(self._costs, dtype=np.float64)
+        new_costs = padded.ravel()
+        changed = np.flatnonzero(old_costs != new_costs)
+        if len(changed):
+            self._costs = new_costs.tolist()
+            if self._goal is not None:
+                self._repair_search(changed.tolist())
+        return len(changed)
+
+    def _inflate(self, costs):
+        # Mark cells within clearance_mm of an impassable cell as impassable
+        blocked = ~np.isfinite(costs)
+        inflated = blocked.copy()
+        radius = int(math.ceil(self._clearance_mm / self._resolution_mm))
+        height, width = costs.shape
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                if (dx == 0 and dy == 0) or math.hypot(dx, dy) * self._resolution_mm > self._clearance_mm:
+                    continue
+                inflated[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] |= \
+                    blocked[max(-dy, 0):height + min(-dy, 0), max(-dx, 0):width + min(-dx, 0)]
+        costs = costs.copy()
+        costs[inflated] = np.inf
+        return costs
+
+    def _cell_for_pose(self, pose, name):
+        x = pose.position.x
+        y = pose.position.y
+        row, col = self._raster.world_to_index(x, y)
+        height, width = self._raster.data.shape
+        if not (0 <= row < height and 0 <= col < width):
+            raise ValueError('The %s (%.1f, %.1f) is outside of the map' % (name, x, y))
+        return (int(row) + 1) * self._width + int(col) + 1
+
+    # D* Lite search
+
+    def _heuristic(self, a, b):
+        # Octile distance, scaled by the cheapest cost so it's never an overestimate
+        a_row, a_col = divmod(a, self._width)
+        b_row, b_col = divmod(b, self._width)
+        dx = abs(a_col - b_col)
+        dy = abs(a_row - b_row)
+        return (dx + dy + (_SQRT2 - 2) * min(dx, dy)) * self._heuristic_scale
+
+    def _edge_cost(self, u, offset, distance, corner_a, corner_b):
+        costs = self._costs
+        v = u + offset
+        if corner_a is not None:
+            # Diagonal moves can't cut the corner of an impassable cell
+            if costs[u + corner_a] == _INF or costs[u + corner_b] == _INF:
+                return _INF
+        return distance * 0.5 * (costs[u] + costs[v])
+
+    def _reset_search(self, start, goal):
+        size = self._width * self._height
+        self._g = [_INF] * size
+        self._rhs = [_INF] * size
+        self._open = []
+        self._open_keys = {}
+        self._key_modifier = 0.0
+        self._start = start
+        self._last_start = start
+        self._goal = goal
+        self._rhs[goal] = 0.0
+        self._push(goal, (self._heuristic(start, goal), 0.0))
+
+    def _calculate_key(self, u):
+        g_rhs = min(self._g[u], self._rhs[u])
+        return (g_rhs + self._heuristic(self._start, u) + self._key_modifier, g_rhs)
+
+    def _push(self, u, key):
+        self._open_keys[u] = key
+        heapq.heappush(self._open, (key[0], key[1], u))
+
+    def _update_vertex(self, u):
+        if self._g[u] != self._rhs[u]:
+            self._push(u, self._calculate_key(u))
+        else:
+            # any entry left in the heap is now stale, and will be skipped
+            self._open_keys.pop(u, None)
+
+    def _lowest_rhs(self, u):
+        # The cost to the goal through the best neighbor
+        g = self._g
+        costs = self._costs
+        if costs[u] == _INF:
+            return _INF
+        best = _INF
+        for offset, distance, corner_a, corner_b in self._neighbors:
+            v = u + offset
+            g_v = g[v]
+            if g_v == _INF:
+                continue
+            cost = self._edge_cost(u, offset, distance, corner_a, corner_b)
+            if cost + g_v < best:
+                best = cost + g_v
+        return best
+
+    def _repair_search(self, changed):
+        # Edge costs have changed around each of these cells, so recompute
+        # the best route to the goal for them and their neighbors
+        affected = set(changed)
+        for u in changed:
+            for offset, distance, corner_a, corner_b in self._neighbors:
+                affected.add(u + offset)
+        goal = self._goal
+        for u in affected:
+            if u != goal:
+                self._rhs[u] = self._lowest_rhs(u)
+            self._update_vertex(u)
+
+    def _compute_shortest_path(self):
+        g = self._g
+        rhs = self._rhs
+        costs = self._costs
+        open_list = self._open
+        open_keys = self._open_keys
+        neighbors = self._neighbors
+        start = self._start
+        goal = self._goal
+        calculate_key = self._calculate_key
+
+        while open_list:
+            k1, k2, u = open_list[0]
+            if open_keys.get(u) != (k1, k2):
+                # stale entry, superseded by a later push or removed
+                heapq.heappop(open_list)
+                continue
+            start_key = calculate_key(start)
+            if (k1, k2) >= start_key and rhs[start] <= g[start]:
+                break
+
+            new_key = calculate_key(u)
+            if (k1, k2) < new_key:
+                heapq.heappop(open_list)
+                self._push(u, new_key)
+            elif g[u] > rhs[u]:
+                # Locally overconsistent - the route from u is now known
+                heapq.heappop(open_list)
+                del open_keys[u]
+                g_u = g[u] = rhs[u]
+                cost_u = costs[u]
+                for offset, distance, corner_a, corner_b in neighbors:
+                    s = u + offset
+                    cost_s = costs[s]
+                    if cost_s == _INF or s == goal:
+                        continue
+                    if corner_a is not None and (costs[u + corner_a] == _INF or costs[u + corner_b] == _INF):
+                        continue
+                    candidate = distance * 0.5 * (cost_s + cost_u) + g_u
+                    if candidate < rhs[s]:
+                        rhs[s] = candidate
+                        if g[s] != candidate:
+                            self._push(s, calculate_key(s))
+                        else:
+                            open_keys.pop(s, None)
+            else:
+                # Locally underconsistent - a cost has increased
+                g_old = g[u]
+                g[u] = _INF
+                for offset, distance, corner_a, corner_b in neighbors:
+                    s = u + offset
+                    if costs[s] == _INF:
+                        continue
+                    # edge costs are the same in both directions
+                    if s != goal and rhs[s] == self._edge_cost(u, offset, distance, corner_a, corner_b) + g_old:
+                        rhs[s] = self._lowest_rhs(s)
+                    self._update_vertex(s)
+                if u != goal and rhs[u] == g_old:
+                    rhs[u] = self._lowest_rhs(u)
+                self._update_vertex(u)
+
+    def _extract_path(self, start, goal_pose):
+        # Follow the cheapest neighbor from the start to the goal
+        g = self._g
+        cells = [start]
+        u = start
+        cost = 0.0
+        while u != self._goal:
+            best = None
+            best_total = _INF
+            best_cost = 0.0
+            for offset, distance, corner_a, corner_b in self._neighbors:
+                v = u + offset
+                edge_cost = self._edge_cost(u, offset, distance, corner_a, corner_b)
+                if edge_cost + g[v] < best_total:
+                    best = v
+                    best_total = edge_cost + g[v]
+                    best_cost = edge_cost
+            if best is None or len(cells) > len(g):
+                return None
+            cells.append(best)
+            cost += best_cost
+            u = best
+
+        raster = self._raster
+        points = []
+        for u in cells:
+            row, col = divmod(u, self._width)
+            x, y = raster.index_to_world(row - 1, col - 1)
+            points.append((float(x), float(y)))
+
+        # Waypoints are kept wherever the direction changes
+        waypoint_indices = []
+        for i in range(1, len(cells) - 1):
+            if cells[i] - cells[i - 1] != cells[i + 1] - cells[i]:
+                waypoint_indices.append(i)
+        waypoint_indices.append(len(cells) - 1)
+
+        waypoints = []
+        for n, i in enumerate(waypoint_indices):
+            x, y = points[i]
+            if n + 1 < len(waypoint_indices):
+                next_x, next_y = points[waypoint_indices[n + 1]]
+                angle = util.radians(math.atan2(next_y - y, next_x - x))
+            else:
+                x = goal_pose.position.x
+                y = goal_pose.position.y
+                angle = goal_pose.rotation.angle_z
+            waypoints.append(util.pose_z_angle(x, y, 0, angle, origin_id=raster.origin_id))
+        return Path(waypoints, points, cost * self._resolution_mm)
+
+
+async def follow_path(robot, path, num_retries=0):
+    '''Drive the robot through each of a path's waypoints in turn.
+
+    Args:
+        robot (:class:`cozmo.robot.Robot`): The robot to drive.
+        path (:class:`Path`): The path to follow, as returned by :meth:`GridPlanner.plan`.
+        num_retries (int): Number of times to retry each go_to_pose action if
+            the previous attempt(s) failed.
+
+    Returns:
+        bool: True if every waypoint was reached.
+    '''
+    for waypoint in path.waypoints:
+        action = robot.go_to_pose(waypoint, num_retries=num_retries)
+        await action.wait_for_completed()
+        if action.has_failed:
+            return False
+    return True
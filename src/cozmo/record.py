@@ -0,0 +1,548 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Recording and replaying the messages exchanged with the engine.
+
+A recording captures every message received from, and sent to, the Cozmo
+app, so that a session can be replayed later without a robot; eg. to
+reproduce a problem, or to benchmark the SDK against a realistic stream of
+messages.
+
+To record a session, pass a recording connection factory to
+:func:`cozmo.run_program` (or any of the ``connect`` functions)::
+
+    cozmo.run_program(my_program, conn_factory=cozmo.record.recording_conn_factory('session.cozrec'))
+
+To replay it, use a :class:`ReplayConnector` in place of a connection to a
+device.  Messages are delivered with their original timing, optionally sped
+up, and anything the program sends is discarded::
+
+    cozmo.run_program(my_program, connector=cozmo.record.ReplayConnector('session.cozrec', speed=4))
+
+Recordings can also be read directly with :class:`Recording`.
+
+Messages are stored in blocks, each covering up to ``index_interval``
+seconds, which can optionally be compressed with zstd (requires the
+zstandard package).  An index of the blocks is written when the recording
+is closed, allowing replay to start part way through; a recording that
+wasn't closed cleanly can still be read up to its last complete block.
+'''
+
+# __all__ should order by constants, event classes, other classes, functions.
+__all__ = ['COMPRESSION_ZSTD', 'FROM_ENGINE', 'TO_ENGINE',
+           'Recorder', 'Recording', 'ReplayConnector', 'ReplayTransport',
+           'recording_conn_factory']
+
+
+import asyncio
+import bisect
+import functools
+import struct
+import threading
+import time
+
+from . import logger
+from . import clad_protocol
+from . import conn
+from . import run
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+#: string: Compress recordings using zstd.
+COMPRESSION_ZSTD = 'zstd'
+
+#: int: The direction of a message received from the engine.
+FROM_ENGINE = clad_protocol._FROM_ENGINE
+
+#: int: The direction of a message sent to the engine.
+TO_ENGINE = clad_protocol._TO_ENGINE
+
+
+_MAGIC = b'COZREC'
+_VERSION = 1
+
+# magic, version, compression, wall clock time the recording started
+_FILE_HEADER = struct.Struct('<6sHBd')
+
+_COMPRESSION_IDS = {None: 0, COMPRESSION_ZSTD: 1}
+_COMPRESSION_NAMES = {v: k for k, v in _COMPRESSION_IDS.items()}
+
+_BLOCK_FRAMES = 1
+_BLOCK_INDEX = 2
+
+# kind, time of the first frame, stored size, uncompressed size
+_BLOCK_HEADER = struct.Struct('<BdII')
+
+# microseconds since the start of the block, direction, size
+_FRAME_HEADER = struct.Struct('<IBH')
+
+# time of the block's first frame, file offset of the block
+_INDEX_ENTRY = struct.Struct('<dQ')
+
+# file offset of the index block, magic
+_TRAILER = struct.Struct('<Q8s')
+_TRAILER_MAGIC = b'COZINDEX'
+
+# messages are prefixed by a 2 byte length on the wire
+_MSG_SIZE = struct.Struct('<H')
+
+
+def _require_compression(compression):
+    if compression not in _COMPRESSION_IDS:
+        raise ValueError('Unsupported compression %s' % compression)
+    if compression == COMPRESSION_ZSTD and zstandard is None:
+        raise ImportError('zstd compression requires the zstandard package to be installed')
+
+
+class Recorder:
+    '''Writes messages to a recording file as they're sent and received.
+
+    Generally created by :func:`recording_conn_factory`, which attaches it to
+    the connection; messages are then written as the connection sends and
+    receives them, until the connection is closed.
+
+    Args:
+        path (string): The file to write to; any existing file is replaced.
+        compression (string): ``None``, or :data:`COMPRESSION_ZSTD` to compress
+            each block.
+        index_interval (float): The maximum number of seconds covered by each
+            block, and so the granularity replay can start from.
+        block_size (int): The maximum number of bytes of messages buffered
+            in memory before being written out as a block.
+    Raises:
+        :class:`ImportError` if zstd compression is requested but the
+        zstandard package isn't installed.
+    '''
+    def __init__(self, path, compression=None, index_interval=1.0, block_size=256*1024):
+        _require_compression(compression)
+        self.path = path
+        self._compression = compression
+        self._compressor = zstandard.ZstdCompressor() if compression == COMPRESSION_ZSTD else None
+        self._index_interval = index_interval
+        self._block_size = block_size
+        self._lock = threading.Lock()
+
+        self._file = open(path, 'wb')
+        self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION, _COMPRESSION_IDS[compression], time.time()))
+        self._start = time.monotonic()
+        self._index = []
+        self._block = bytearray()
+        self._block_time = 0.0
+        self._closed = False
+
+        #: int: The number of messages recorded.
+        self.frame_count = 0
+
+    def __repr__(self):
+        return '<%s path=%s frames=%d>' % (self.__class__.__name__, self.path, self.frame_count)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def closed(self):
+        '''bool: True once the recording has been closed.'''
+        return self._closed
+
+    def write_frame(self, direction, data, timestamp=None):
+        '''Records a single message.
+
+        Called by the connection; not generally called from user-facing code.
+
+        Args:
+            direction (int): :data:`FROM_ENGINE` or :data:`TO_ENGINE`.
+            data (bytes-like): The encoded message, without its length prefix.
+            timestamp (float): When the message was sent or received, in
+                seconds since the recording started.  Defaults to now.
+        '''
+        if timestamp is None:
+            timestamp = time.monotonic() - self._start
+        with self._lock:
+            if self._closed:
+                return
+            block = self._block
+            if block and (timestamp - self._block_time >= self._index_interval or
+                          len(block) >= self._block_size):
+                self._write_block()
+            if not block:
+                self._block_time = timestamp
+            offset_us = int((timestamp - self._block_time) * 1e6)
+            block += _FRAME_HEADER.pack(offset_us, direction, len(data))
+            block += data
+            self.frame_count += 1
+
+    def flush(self):
+        '''Writes out any buffered messages.'''
+        with self._lock:
+            if self._block and not self._closed:
+                self._write_block()
+
+    def close(self):
+        '''Writes out any buffered messages and the index, and closes the file.'''
+        with self._lock:
+            if self._closed:
+                return
+            if self._block:
+                self._write_block()
+            index_data = b''.join(_INDEX_ENTRY.pack(t, offset) for t, offset in self._index)
+            index_offset = self._file.tell()
+            self._file.write(_BLOCK_HEADER.pack(_BLOCK_INDEX, 0.0, len(index_data), len(index_data)))
+            self._file.write(index_data)
+            self._file.write(_TRAILER.pack(index_offset, _TRAILER_MAGIC))
+            self._file.close()
+            self._closed = True
+
+    def _write_block(self):
+        raw = self._block
+        stored = self._compressor.compress(raw) if self._compressor else raw
+        self._index.append((self._block_time, self._file.tell()))
+        self._file.write(_BLOCK_HEADER.pack(_BLOCK_FRAMES, self._block_time, len(stored), len(raw)))
+        self._file.write(stored)
+        # Flush each block through to the OS, so that at most one block is
+        # lost if the program exits without closing the recording
+        self._file.flush()
+        del raw[:]
+
+
+class Recording:
+    '''Reads a file written by a :class:`Recorder`.
+
+    Args:
+        path (string): The file to read.
+    Raises:
+        :class:`ValueError` if the file isn't a recording.
+        :class:`ImportError` if the recording is compressed with zstd, but
+        the zstandard package isn't installed.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            header = self._file.read(_FILE_HEADER.size)
+            if len(header) < _FILE_HEADER.size:
+                raise ValueError('%s is not a Cozmo recording' % path)
+            magic, version, compression_id, start_time = _FILE_HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION or compression_id not in _COMPRESSION_NAMES:
+                raise ValueError('%s is not a supported Cozmo recording' % path)
+            self._compression = _COMPRESSION_NAMES[compression_id]
+            _require_compression(self._compression)
+        except:
+            self._file.close()
+            raise
+        self._decompressor = zstandard.ZstdDecompressor() if self._compression else None
+
+        #: float: The time the recording started, in seconds since the epoch.
+        self.start_time = start_time
+
+        index = self._read_index()
+        if index is None:
+            index = self._scan_blocks()
+        self._index_times = [t for t, offset in index]
+        self._index_offsets = [offset for t, offset in index]
+
+    def __repr__(self):
+        return '<%s path=%s blocks=%d>' % (self.__class__.__name__, self.path, len(self._index_offsets))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        '''Closes the file.'''
+        self._file.close()
+
+    @property
+    def compression(self):
+        '''string: The compression used, or ``None``.'''
+        return self._compression
+
+    @property
+    def duration(self):
+        '''float: The time of the last message, in seconds since the recording started.'''
+        if not self._index_offsets:
+            return 0.0
+        last = 0.0
+        for timestamp, direction, data in self._read_block(self._index_offsets[-1]):
+            last = timestamp
+        return last
+
+    def frames(self, start=0.0, end=None):
+        '''Yields each recorded message in turn.
+
+        Args:
+            start (float): Skip messages recorded before this many seconds
+                into the recording.  Only the blocks from the one containing
+                ``start`` onwards are read.
+            end (float): Stop at the first message recorded after this many
+                seconds into the recording.
+        Yields:
+            A (timestamp, direction, data) tuple for each message, where
+            timestamp is in seconds since the recording started, direction
+            is :data:`FROM_ENGINE` or :data:`TO_ENGINE`, and data is the
+            encoded message without its length prefix.
+        '''
+        first_block = max(bisect.bisect_right(self._index_times, start) - 1, 0)
+        for offset in self._index_offsets[first_block:]:
+            for frame in self._read_block(offset):
+                if frame[0] < start:
+                    continue
+                if end is not None and frame[0] > end:
+                    return
+                yield frame
+
+    def _read_index(self):
+        # Returns the index written by Recorder.close, or None if it's missing
+        f = self._file
+        f.seek(0, 2)
+        size = f.tell()
+        if size < _FILE_HEADER.size + _BLOCK_HEADER.size + _TRAILER.size:
+            return None
+        f.seek(size - _TRAILER.size)
+        index_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+        if magic != _TRAILER_MAGIC or index_offset >= size:
+            return None
+        f.seek(index_offset)
+        kind, _, stored_size, _ = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))
+        if kind != _BLOCK_INDEX:
+            return None
+        data = f.read(stored_size)
+        return [_INDEX_ENTRY.unpack_from(data, i) for i in range(0, len(data), _INDEX_ENTRY.size)]
+
+    def _scan_blocks(self):
+        # Rebuilds the index by walking the block headers, stopping at the
+        # first incomplete block, as written by a recording that wasn't closed
+        f = self._file
+        f.seek(0, 2)
+        size = f.tell()
+        offset = _FILE_HEADER.size
+        index = []
+        while offset + _BLOCK_HEADER.size <= size:
+            f.seek(offset)
+            kind, block_time, stored_size, _ = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))
+            end = offset + _BLOCK_HEADER.size + stored_size
+            if kind != _BLOCK_FRAMES or end > size:
+                break
+            index.append((block_time, offset))
+            offset = end
+        logger.warning('Recording %s was not closed cleanly; recovered %d blocks', self.path, len(index))
+        return index
+
+    def _read_block(self, offset):
+        f = self._file
+        f.seek(offset)
+        kind, block_time, stored_size, raw_size = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))
+        data = f.read(stored_size)
+        if self._decompressor:
+            data = self._decompressor.decompress(data, max_output_size=raw_size)
+        frames = []
+        pos = 0
+        frame_header = _FRAME_HEADER
+        header_size = frame_header.size
+        while pos < raw_size:
+            offset_us, direction, size = frame_header.unpack_from(data, pos)
+            pos += header_size
+            frames.append((block_time + offset_us * 1e-6, direction, data[pos:pos + size]))
+            pos += size
+        return frames
+
+
+def recording_conn_factory(path, conn_factory=conn.CozmoConnection, **recorder_kw):
+    '''Returns a connection factory that records everything sent and received.
+
+    Pass the result as the ``conn_factory`` argument to :func:`cozmo.run_program`
+    or any of the ``connect`` functions.  Recording starts as soon as the
+    connection is created, so includes the initial handshake needed to
+    replay it, and finishes when the connection is closed.
+
+    Args:
+        path (string): The file to record to.
+        conn_factory (callable): The factory for the connection being recorded.
+        recorder_kw: Any other keyword arguments are passed to :class:`Recorder`.
+    Returns:
+        callable: A factory that returns connections created by ``conn_factory``.
+    '''
+    # Report unusable compression immediately, rather than when connecting
+    _require_compression(recorder_kw.get('compression'))
+
+    @functools.wraps(conn_factory)
+    def factory(*a, **kw):
+        coz_conn = conn_factory(*a, **kw)
+        # A new recording is started for each connection attempt, so the
+        # file holds the one that was eventually used
+        coz_conn._recorder = Recorder(path, **recorder_kw)
+        return coz_conn
+    return factory
+
+
+class ReplayTransport(asyncio.Transport):
+    '''A transport that delivers recorded messages to a protocol.
+
+    Generally created by :class:`ReplayConnector`.  Messages written to the
+    transport are discarded.
+
+    Args:
+        loop (:class:`asyncio.BaseEventLoop`): The loop to deliver messages on.
+        protocol (:class:`asyncio.Protocol`): The protocol to deliver messages to.
+        recording (:class:`Recording`): The recording to replay.
+        speed (float): How fast to replay, relative to the original timing,
+            or ``None`` to deliver the messages as fast as the protocol
+            consumes them.
+        start (float): How many seconds into the recording to start from.
+    '''
+    # The number of messages delivered at once when replaying at full speed
+    _BURST = 64
+
+    def __init__(self, loop, protocol, recording, speed=1.0, start=0.0):
+        super().__init__()
+        if speed is not None and speed <= 0:
+            raise ValueError('speed must be positive or None (got %s)' % speed)
+        self._loop = loop
+        self._protocol = protocol
+        self._recording = recording
+        self._speed = speed
+        self._start = start
+        self._closing = False
+        self._task = None
+
+        #: int: The number of bytes written to the transport, and discarded.
+        self.bytes_written = 0
+
+        #: int: The number of recorded messages delivered to the protocol.
+        self.frames_delivered = 0
+
+        #: :class:`asyncio.Future`: Completed once replay has finished, with
+        #: the number of messages delivered.
+        self.finished = asyncio.Future(loop=loop) # replace with loop.create_future in 3.5.2
+
+    def start(self):
+        '''Connects the protocol, and starts delivering messages.'''
+        self._protocol.connection_made(self)
+        self._task = self._loop.create_task(self._replay())
+
+    async def _replay(self):
+        protocol = self._protocol
+        loop = self._loop
+        speed = self._speed
+        pack_size = _MSG_SIZE.pack
+        pending = []
+        started = loop.time()
+        try:
+            for timestamp, direction, data in self._recording.frames(start=self._start):
+                if direction != FROM_ENGINE:
+                    continue
+                if speed is not None:
+                    delay = started + (timestamp - self._start) / speed - loop.time()
+                    if delay > 0:
+                        if pending:
+                            protocol.data_received(b''.join(pending))
+                            del pending[:]
+                        await asyncio.sleep(delay)
+                pending.append(pack_size(len(data)))
+                pending.append(data)
+                self.frames_delivered += 1
+                if len(pending) >= self._BURST * 2:
+                    protocol.data_received(b''.join(pending))
+                    del pending[:]
+                    # give everything else on the loop a chance to run
+                    await asyncio.sleep(0)
+            if pending:
+                protocol.data_received(b''.join(pending))
+            protocol.eof_received()
+        finally:
+            self._task = None
+            if not self.finished.done():
+                self.finished.set_result(self.frames_delivered)
+            self.close()
+
+    # asyncio.Transport methods
+
+    def get_extra_info(self, name, default=None):
+        if name == 'peername':
+            return self._recording.path
+        return default
+
+    def is_closing(self):
+        return self._closing
+
+    def close(self):
+        if self._closing:
+            return
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+        self._loop.call_soon(self._protocol.connection_lost, None)
+
+    def abort(self):
+        self.close()
+
+    def write(self, data):
+        self.bytes_written += len(data)
+
+    def can_write_eof(self):
+        return False
+
+    def pause_reading(self):
+        pass
+
+    def resume_reading(self):
+        pass
+
+
+class ReplayConnector(run.DeviceConnector):
+    '''Connects to a recording instead of a device.
+
+    Pass as the ``connector`` argument to :func:`cozmo.run_program` or any
+    of the ``connect`` functions to replay a session recorded with
+    :func:`recording_conn_factory`.
+
+    Args:
+        path (string): The recording to replay.
+        speed (float): How fast to replay, relative to the original timing,
+            or ``None`` to replay as fast as possible.
+        start (float): How many seconds into the recording to start from.
+    '''
+    def __init__(self, path, speed=1.0, start=0.0):
+        super().__init__(enable_env_vars=False)
+        self.path = path
+        self.speed = speed
+        self.start = start
+
+    async def connect(self, loop, protocol_factory, conn_check):
+        recording = Recording(self.path)
+        proto = protocol_factory()
+        transport = ReplayTransport(loop, proto, recording, speed=self.speed, start=self.start)
+        transport.finished.add_done_callback(lambda f: recording.close())
+        proto.device_info = {
+            'device_type': 'replay',
+            'path': self.path,
+        }
+        transport.start()
+        if conn_check:
+            try:
+                await conn_check(proto)
+            except Exception as e:
+                logger.debug('Failed connection check: %s', e)
+                transport.close()
+                raise
+        logger.info("Replaying recording %s", self.path)
+        return transport, proto
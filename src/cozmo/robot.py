@@ -70,6 +70,7 @@ from . import objects
 from . import util
 from . import world
 from . import robot_alignment
+from . import telemetry
 
 from ._clad import _clad_to_engine_iface, _clad_to_engine_cozmo, _clad_to_engine_anki, _clad_to_game_cozmo, CladEnumWrapper
 from .upgrades import RobotUpgrades
@@ -138,7 +139,7 @@ class LiftPosition:
         ratio (float): The ratio from 0.0 to 1.0 that the lift is raised from the ground.
         angle (:class:`cozmo.util.Angle`): The angle of the lift arm relative to the ground.
     '''
-    __slots__ = ('_height')
+    __slots__ = ('_height',)
 
     def __init__(self, height=None, ratio=None, angle=None):
         def _count_arg(arg):
@@ -161,6 +162,13 @@ class LiftPosition:
             height_mm = (math.sin(angle.radians) * LIFT_ARM_LENGTH.distance_mm) + LIFT_PIVOT_HEIGHT.distance_mm
             self._height = util.distance_mm(height_mm)
 
+    @classmethod
+    def _create(cls, height):
+        # Skips the argument checks in __init__, for a height that's already a Distance
+        lift_position = util._object_new(cls)
+        lift_position._height = height
+        return lift_position
+
     def __repr__(self):
         return "<%s height=%s ratio=%s angle=%s>" % (self.__class__.__name__, self._height, self.ratio, self.angle)
 
@@ -184,6 +192,21 @@ class LiftPosition:
         return util.radians(angle_radians)
 
 
+# Builds each of the robot state values that are only materialized from the
+# most recent RobotState message when they're first read.
+_robot_state_builders = {
+    'pose': lambda msg: util.Pose._create_from_clad(msg.pose),
+    'pose_angle': lambda msg: util.Angle._create(msg.poseAngle_rad), # heading in X-Y plane
+    'pose_pitch': lambda msg: util.Angle._create(msg.posePitch_rad),
+    'head_angle': lambda msg: util.Angle._create(msg.headAngle_rad),
+    'left_wheel_speed': lambda msg: util.Speed._create(msg.leftWheelSpeed_mmps),
+    'right_wheel_speed': lambda msg: util.Speed._create(msg.rightWheelSpeed_mmps),
+    'lift_position': lambda msg: LiftPosition._create(util.Distance._create(msg.liftHeight_mm)),
+    'accelerometer': lambda msg: util.Vector3(msg.accel.x, msg.accel.y, msg.accel.z),
+    'gyro': lambda msg: util.Vector3(msg.gyro.x, msg.gyro.y, msg.gyro.z),
+}
+
+
 #### Actions
 
 class GoToPose(action.Action):
@@ -757,7 +780,6 @@ class Robot(RobotUpgrades, event.Dispatcher):
         self.robot_id = robot_id
 
         self._is_ready = False
-        self._pose = None  # type: util.Pose
         #: bool: Specifies that this is the primary robot (always True currently)
         self.is_primary = is_primary
 
@@ -771,18 +793,23 @@ class Robot(RobotUpgrades, event.Dispatcher):
 
         self._current_face_image_action = None  # type: DisplayOledFaceImage
 
-        #: :class:`cozmo.util.Speed`: Speed of the left wheel
-        self.left_wheel_speed = None  # type: util.Speed
-        #: :class:`cozmo.util.Speed`: Speed of the right wheel
-        self.right_wheel_speed = None  # type: util.Speed
-        self._lift_position = LiftPosition(height=util.distance_mm(MIN_LIFT_HEIGHT_MM))
+        # The most recent RobotState message, and the values built from it so far
+        self._robot_state_msg = None
+        self._robot_state_values = {
+            'pose': None, 'pose_angle': None, 'pose_pitch': None, 'head_angle': None,
+            'left_wheel_speed': None, 'right_wheel_speed': None,
+            'lift_position': LiftPosition(height=util.distance_mm(MIN_LIFT_HEIGHT_MM)),
+            'accelerometer': None, 'gyro': None}
+        self._robot_state_event_interval = None
+        self._robot_state_event_time = None
+        self._robot_state_event_handle = None
+
         #: float: The current battery voltage (not linear, but < 3.5 is low)
         self.battery_voltage = None  # type: float
 
-        #: :class:`cozmo.util.Vector3`: The current accelerometer reading (x,y,z)
-        #: In mm/s^2, measured in Cozmo's head (e.g. x=0 when Cozmo's head is level
-        #: but x = z = ~7000 mm/s^2 when Cozmo's head is angled 45 degrees up)
-        self.accelerometer = None  # type: util.Vector3
+        #: :class:`cozmo.telemetry.TelemetryRecorder`: A history of the robot's
+        #: state, or ``None`` unless :meth:`enable_telemetry` has been called.
+        self.telemetry = None  # type: telemetry.TelemetryRecorder
 
         self._is_device_accelerometer_supported = None  # type: bool
         self._is_device_gyro_supported = None  # type: bool
@@ -805,13 +832,6 @@ class Robot(RobotUpgrades, event.Dispatcher):
         #: :meth:`enable_device_imu` with `enable_gyro = True`
         self.device_gyro = None  # type: util.Quaternion
 
-        #: :class:`cozmo.util.Vector3`: The current gyro reading (x,y,z)
-        #: In radians/s, measured in Cozmo's head.
-        #: Therefore a large value in a given component would indicate Cozmo is
-        #: being rotated around that axis (where x=forward, y=left, z=up), e.g.
-        #: y = -5 would indicate that Cozmo is being rolled onto his back
-        self.gyro = None  # type: util.Vector3
-
         #: int: The ID of the object currently being carried (-1 if none)
         self.carrying_object_id = -1
         #: int: The ID of the object on top of the object currently being carried (-1 if none)
@@ -824,9 +844,6 @@ class Robot(RobotUpgrades, event.Dispatcher):
         #: ``None`` if no image was received yet.
         #: In milliseconds relative to robot epoch.
         self.last_image_robot_timestamp = None  # type: int
-        self._pose_angle = None  # type: util.Angle
-        self._pose_pitch = None  # type: util.Angle
-        self._head_angle = None  # type: util.Angle
         self._robot_status_flags = 0
         self._game_status_flags = 0
 
@@ -895,8 +912,59 @@ class Robot(RobotUpgrades, event.Dispatcher):
                                                     skipAnimation=skip_animation)
         self.conn.send_msg(msg)
 
+    def _robot_state_value(self, name):
+        # Returns a state value, building it from the latest RobotState message
+        # the first time it's requested.
+        values = self._robot_state_values
+        try:
+            return values[name]
+        except KeyError:
+            value = values[name] = _robot_state_builders[name](self._robot_state_msg)
+            return value
+
+    def _dispatch_robot_state_updated(self):
+        self._robot_state_event_handle = None
+        self._robot_state_event_time = self._loop.time()
+        self.dispatch_event(EvtRobotStateUpdated, robot=self)
+
+    def _cancel_robot_state_updated(self):
+        # Cancels any coalesced EvtRobotStateUpdated that's waiting to be dispatched
+        if self._robot_state_event_handle is not None:
+            self._robot_state_event_handle.cancel()
+            self._robot_state_event_handle = None
+
+    def _stop_dispatcher(self):
+        self._cancel_robot_state_updated()
+        super()._stop_dispatcher()
+
     #### Properties ####
 
+    @property
+    def robot_state_event_rate(self):
+        '''float: The maximum number of :class:`EvtRobotStateUpdated` events to dispatch per second.
+
+        Cozmo sends its state many times per second.  Setting a rate coalesces
+        updates that arrive faster than that into a single event, dispatched
+        once the window has elapsed, which reflects the latest state.  The
+        robot's properties are always kept up to date regardless.
+
+        Defaults to ``None``, which dispatches an event for every update.
+        '''
+        if self._robot_state_event_interval is None:
+            return None
+        return 1.0 / self._robot_state_event_interval
+
+    @robot_state_event_rate.setter
+    def robot_state_event_rate(self, rate):
+        if rate is not None and rate <= 0:
+            raise ValueError('robot_state_event_rate must be positive (got %s)' % rate)
+        # The next update is dispatched according to the new rate
+        self._cancel_robot_state_updated()
+        if rate is None:
+            self._robot_state_event_interval = None
+        else:
+            self._robot_state_event_interval = 1.0 / rate
+
     @property
     def is_ready(self):
         """bool: True if the robot has been initialized and is ready to accept commands."""
@@ -927,7 +995,37 @@ class Robot(RobotUpgrades, event.Dispatcher):
     def pose(self):
         """:class:`cozmo.util.Pose`: The current pose (position and orientation) of Cozmo
         """
-        return self._pose
+        return self._robot_state_value('pose')
+
+    @property
+    def left_wheel_speed(self):
+        ''':class:`cozmo.util.Speed`: Speed of the left wheel.'''
+        return self._robot_state_value('left_wheel_speed')
+
+    @property
+    def right_wheel_speed(self):
+        ''':class:`cozmo.util.Speed`: Speed of the right wheel.'''
+        return self._robot_state_value('right_wheel_speed')
+
+    @property
+    def accelerometer(self):
+        ''':class:`cozmo.util.Vector3`: The current accelerometer reading (x,y,z)
+
+        In mm/s^2, measured in Cozmo's head (e.g. x=0 when Cozmo's head is level
+        but x = z = ~7000 mm/s^2 when Cozmo's head is angled 45 degrees up)
+        '''
+        return self._robot_state_value('accelerometer')
+
+    @property
+    def gyro(self):
+        ''':class:`cozmo.util.Vector3`: The current gyro reading (x,y,z)
+
+        In radians/s, measured in Cozmo's head.
+        Therefore a large value in a given component would indicate Cozmo is
+        being rotated around that axis (where x=forward, y=left, z=up), e.g.
+        y = -5 would indicate that Cozmo is being rolled onto his back
+        '''
+        return self._robot_state_value('gyro')
 
     @property
     def is_moving(self):
@@ -1012,22 +1110,22 @@ class Robot(RobotUpgrades, event.Dispatcher):
     @property
     def pose_angle(self):
         ''':class:`cozmo.util.Angle`: Cozmo's pose angle (heading in X-Y plane).'''
-        return self._pose_angle
+        return self._robot_state_value('pose_angle')
 
     @property
     def pose_pitch(self):
         ''':class:`cozmo.util.Angle`: Cozmo's pose pitch (angle up/down).'''
-        return self._pose_pitch
+        return self._robot_state_value('pose_pitch')
 
     @property
     def head_angle(self):
         ''':class:`cozmo.util.Angle`: Cozmo's head angle (up/down).'''
-        return self._head_angle
+        return self._robot_state_value('head_angle')
 
     @property
     def lift_position(self):
         ''':class:`LiftPosition`: The position of Cozmo's lift.'''
-        return self._lift_position
+        return self._robot_state_value('lift_position')
 
     @property
     def lift_height(self):
@@ -1035,12 +1133,12 @@ class Robot(RobotUpgrades, event.Dispatcher):
 
         In :const:`MIN_LIFT_HEIGHT` to :const:`MAX_LIFT_HEIGHT` range.
         '''
-        return self._lift_position.height
+        return self.lift_position.height
 
     @property
     def lift_ratio(self):
         '''float: Ratio from 0 to 1 of how high Cozmo's lift is.'''
-        return self._lift_position.ratio
+        return self.lift_position.ratio
 
     @property
     def lift_angle(self):
@@ -1048,7 +1146,7 @@ class Robot(RobotUpgrades, event.Dispatcher):
 
         In :const:`MIN_LIFT_ANGLE` to :const:`MAX_LIFT_ANGLE` range.
         '''
-        return self._lift_position.angle
+        return self.lift_position.angle
 
     @property
     def current_behavior(self):
@@ -1151,19 +1249,12 @@ class Robot(RobotUpgrades, event.Dispatcher):
                             movement_type=movement_type, movement_side=movement_side)
 
     def _recv_msg_robot_state(self, evt, *, msg):
-        self._pose = util.Pose(x=msg.pose.x, y=msg.pose.y, z=msg.pose.z,
-                               q0=msg.pose.q0, q1=msg.pose.q1,
-                               q2=msg.pose.q2, q3=msg.pose.q3,
-                               origin_id=msg.pose.originID)
-        self._pose_angle = util.radians(msg.poseAngle_rad) # heading in X-Y plane
-        self._pose_pitch = util.radians(msg.posePitch_rad)
-        self._head_angle = util.radians(msg.headAngle_rad)
-        self.left_wheel_speed = util.speed_mmps(msg.leftWheelSpeed_mmps)
-        self.right_wheel_speed = util.speed_mmps(msg.rightWheelSpeed_mmps)
-        self._lift_position = LiftPosition(height=util.distance_mm(msg.liftHeight_mm))
+        # Pose, angles, speeds etc. are built from msg when first read
+        self._robot_state_msg = msg
+        self._robot_state_values = {}
+        if self.telemetry is not None:
+            self.telemetry.record(self._loop.time(), msg)
         self.battery_voltage = msg.batteryVoltage
-        self.accelerometer = util.Vector3(msg.accel.x, msg.accel.y, msg.accel.z)
-        self.gyro = util.Vector3(msg.gyro.x, msg.gyro.y, msg.gyro.z)
         self.carrying_object_id = msg.carryingObjectID  # int_32 will be -1 if not carrying object
         self.carrying_object_on_top_id = msg.carryingObjectOnTopID  # int_32 will be -1 if no object on top of object being carried
         self.head_tracking_object_id = msg.headTrackingObjectID  # int_32 will be -1 if head is not tracking to any object
@@ -1172,7 +1263,18 @@ class Robot(RobotUpgrades, event.Dispatcher):
         self._robot_status_flags = msg.status  # uint_16 as bitflags - See _clad_to_game_cozmo.RobotStatusFlag
         self._game_status_flags = msg.gameStatus  # uint_8  as bitflags - See _clad_to_game_cozmo.GameStatusFlag
 
-        self.dispatch_event(EvtRobotStateUpdated, robot=self)
+        interval = self._robot_state_event_interval
+        if interval is None or self._robot_state_event_time is None:
+            self._dispatch_robot_state_updated()
+        elif self._robot_state_event_handle is None:
+            due = self._robot_state_event_time + interval
+            if self._loop.time() >= due:
+                self._dispatch_robot_state_updated()
+            else:
+                # the event reads the robot's state when it's handled, so it
+                # reflects whichever update arrives last within the window
+                self._robot_state_event_handle = self._loop.call_at(
+                        due, self._dispatch_robot_state_updated)
 
     def _recv_msg_behavior_transition(self, evt, *, msg):
         new_type = behavior.BehaviorTypes.find_by_id(msg.newBehaviorExecType)
@@ -1204,6 +1306,29 @@ class Robot(RobotUpgrades, event.Dispatcher):
 
     #### Commands ####
 
+    def enable_telemetry(self, capacity=9000):
+        '''Starts recording the robot's state into :attr:`telemetry`.
+
+        If telemetry is already enabled with the same capacity, the existing
+        recorder and its history are kept.
+
+        Args:
+            capacity (int): The maximum number of state updates to keep.
+                The robot sends around 30 updates per second, so the default
+                holds about 5 minutes of history.
+        Returns:
+            The :class:`cozmo.telemetry.TelemetryRecorder` recording the state.
+        Raises:
+            :class:`ImportError` if NumPy isn't available.
+        '''
+        if self.telemetry is None or self.telemetry.capacity != capacity:
+            self.telemetry = telemetry.TelemetryRecorder(capacity)
+        return self.telemetry
+
+    def disable_telemetry(self):
+        '''Stops recording the robot's state and discards the recorded history.'''
+        self.telemetry = None
+
     def enable_all_reaction_triggers(self, should_enable):
         '''Enable or disable Cozmo's responses to being handled or observing the world.
 
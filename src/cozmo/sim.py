@@ -0,0 +1,369 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''A simulated engine, for testing and benchmarking the SDK without a robot.
+
+:class:`SimulatedEngine` is an asyncio TCP server that speaks the same CLAD
+protocol as the Cozmo app in SDK mode.  Every connection made to it is
+handled by its own :class:`SimulatedRobot`, so many SDK connections can be
+served at once to measure how the SDK scales.
+
+Each simulated robot performs the connection handshake, streams RobotState
+messages at a configurable rate, pings the SDK, sends synthetic camera
+images while the image stream is enabled, and reports every queued action
+as completed after a fixed delay.  Nothing is actually simulated beyond
+that; the robot never moves.
+
+Connect to the engine with a :class:`cozmo.run.TCPConnector`::
+
+    engine = cozmo.sim.SimulatedEngine(loop, robot_state_rate=30)
+    loop.run_until_complete(engine.start())
+    cozmo.run_program(my_program, connector=cozmo.run.TCPConnector(tcp_port=engine.port))
+
+Synthetic camera images require Pillow to be installed.
+'''
+
+# __all__ should order by constants, event classes, other classes, functions.
+__all__ = ['SimulatedEngine', 'SimulatedRobot']
+
+
+import asyncio
+import collections
+import io
+import time
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+import cozmoclad
+from cozmoclad.clad.externalInterface import messageEngineToGame_hash, messageGameToEngine_hash
+
+from . import logger
+from . import clad_protocol
+from ._clad import _clad_to_engine_cozmo, _clad_to_engine_iface
+from ._clad import _clad_to_game_anki, _clad_to_game_cozmo, _clad_to_game_iface
+
+
+_DEFAULT_ANIMATION_NAMES = ('anim_bored_01', 'anim_greeting_happy_01', 'anim_poked_giggle')
+
+# The amount of image data sent in each ImageChunk message
+_IMAGE_CHUNK_SIZE = 1024
+
+_image_sizes = {
+    _clad_to_game_cozmo.ImageResolution.QQVGA: (160, 120),
+    _clad_to_game_cozmo.ImageResolution.QVGA: (320, 240),
+    _clad_to_game_cozmo.ImageResolution.VGA: (640, 480),
+}
+
+
+def _clad_hash(value):
+    return value.to_bytes(16, byteorder='little')
+
+
+def _synthetic_jpeg(resolution):
+    if Image is None:
+        raise ImportError('Synthetic camera images require Pillow to be installed')
+    width, height = _image_sizes[resolution]
+    # A diagonal gradient, which compresses to a realistic size
+    image = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    buf = io.BytesIO()
+    image.save(buf, format='JPEG', quality=80)
+    return buf.getvalue()
+
+
+class SimulatedRobot(clad_protocol.CLADProtocol):
+    '''Serves a single SDK connection to a :class:`SimulatedEngine`.
+
+    Simulated robots are created by the engine for each connection it
+    accepts, using the options the engine was created with.
+
+    Args:
+        engine (:class:`SimulatedEngine`): The engine that accepted the connection.
+        robot_state_rate (float): RobotState messages sent per second.
+        ping_interval (float): Seconds between pings, or ``None`` to never ping.
+        image_rate (float): Camera images sent per second while the
+            image stream is enabled.
+        image_resolution (int): The ImageResolution of camera images.
+        action_duration (float): Seconds before a queued action completes.
+        animation_names (sequence of string): The animation names reported
+            to the SDK.
+    '''
+    clad_decode_union = _clad_to_engine_iface.MessageGameToEngine
+    clad_encode_union = _clad_to_game_iface.MessageEngineToGame
+
+    def __init__(self, engine, robot_state_rate=15, ping_interval=1.0, image_rate=15,
+                 image_resolution=_clad_to_game_cozmo.ImageResolution.QVGA,
+                 action_duration=0.1, animation_names=_DEFAULT_ANIMATION_NAMES):
+        super().__init__()
+        self.engine = engine
+        self.robot_state_rate = robot_state_rate
+        self.ping_interval = ping_interval
+        self.image_rate = image_rate
+        self.image_resolution = image_resolution
+        self.action_duration = action_duration
+        self.animation_names = animation_names
+
+        #: int: The number of messages sent to the SDK.
+        self.messages_sent = 0
+
+        #: int: The number of messages received from the SDK.
+        self.messages_received = 0
+
+        #: int: The number of camera images sent to the SDK.
+        self.images_sent = 0
+
+        self._loop = engine.loop
+        self._tasks = []
+        self._image_task = None
+        self._pending_actions = {}
+        self._ping_counter = 0
+        self._image_id = 0
+        self._started = time.monotonic()
+
+    def __repr__(self):
+        return '<%s sent=%d received=%d>' % (self.__class__.__name__,
+                self.messages_sent, self.messages_received)
+
+    def connection_made(self, transport):
+        super().connection_made(transport)
+        self.engine._robots.append(self)
+        self.send_msg(_clad_to_game_iface.UiDeviceConnected(
+            connectionType=_clad_to_engine_cozmo.UiConnectionType.SdkOverTcp,
+            deviceID=1,
+            successful=True,
+            toGameCLADHash=_clad_hash(messageEngineToGame_hash.messageEngineToGameHash),
+            toEngineCLADHash=_clad_hash(messageGameToEngine_hash.messageGameToEngineHash),
+            buildVersion=cozmoclad.__build_version__))
+
+    def connection_lost(self, exc):
+        super().connection_lost(exc)
+        self._stop()
+        self.engine._robots.remove(self)
+
+    def send_msg(self, msg, **params):
+        self.messages_sent += 1
+        super().send_msg(msg, **params)
+
+    def msg_received(self, msg):
+        self.messages_received += 1
+        handler = getattr(self, '_recv_msg_' + msg.tag_name, None)
+        if handler is not None:
+            handler(msg._data)
+
+    def _timestamp_ms(self):
+        return int((time.monotonic() - self._started) * 1000)
+
+    def _start(self):
+        if self.robot_state_rate:
+            self._tasks.append(self._loop.create_task(
+                self._every(1.0 / self.robot_state_rate, self._send_robot_state)))
+        if self.ping_interval:
+            self._tasks.append(self._loop.create_task(
+                self._every(self.ping_interval, self._send_ping)))
+
+    def _stop(self):
+        for task in self._tasks:
+            task.cancel()
+        del self._tasks[:]
+        self._stop_image_stream()
+        for handle in self._pending_actions.values():
+            handle.cancel()
+        self._pending_actions.clear()
+
+    async def _every(self, interval, callback):
+        # Runs the callback at a fixed rate, without drifting if the loop is busy
+        next_time = self._loop.time()
+        while not self.transport.is_closing():
+            callback()
+            next_time += interval
+            await asyncio.sleep(max(0, next_time - self._loop.time()))
+
+    def _send_robot_state(self):
+        self.send_msg(_clad_to_game_iface.RobotState(
+            pose=_clad_to_game_anki.PoseStruct3d(q0=1.0, originID=1),
+            batteryVoltage=4.5,
+            lastImageTimeStamp=self._timestamp_ms()))
+
+    def _send_ping(self):
+        self._ping_counter += 1
+        self.send_msg(_clad_to_game_iface.Ping(counter=self._ping_counter,
+                                               timeSent_ms=time.monotonic() * 1000))
+
+    def _start_image_stream(self):
+        if self._image_task is None and self.image_rate:
+            chunks = self._image_chunks()
+            self._image_task = self._loop.create_task(
+                self._every(1.0 / self.image_rate, lambda: self._send_image(chunks)))
+
+    def _stop_image_stream(self):
+        if self._image_task is not None:
+            self._image_task.cancel()
+            self._image_task = None
+
+    def _image_chunks(self):
+        jpeg = self.engine._get_jpeg(self.image_resolution)
+        count = (len(jpeg) + _IMAGE_CHUNK_SIZE - 1) // _IMAGE_CHUNK_SIZE
+        # The chunks are re-sent for every image, with just their id updated
+        return [_clad_to_game_cozmo.ImageChunk(
+                    imageEncoding=_clad_to_game_cozmo.ImageEncoding.JPEGColor,
+                    resolution=self.image_resolution,
+                    imageChunkCount=count,
+                    chunkId=i,
+                    data=jpeg[i * _IMAGE_CHUNK_SIZE:(i + 1) * _IMAGE_CHUNK_SIZE])
+                for i in range(count)]
+
+    def _send_image(self, chunks):
+        self._image_id += 1
+        timestamp = self._timestamp_ms()
+        for chunk in chunks:
+            chunk.imageId = self._image_id
+            chunk.frameTimeStamp = timestamp
+            self.send_msg(chunk)
+        self.images_sent += 1
+
+    def _complete_action(self, id_tag, result):
+        del self._pending_actions[id_tag]
+        self.send_msg(_clad_to_game_iface.RobotCompletedAction(
+            idTag=id_tag,
+            actionType=_clad_to_game_cozmo.RobotActionType.UNKNOWN,
+            result=result,
+            completionInfo=_clad_to_game_cozmo.ActionCompletedUnion(
+                defaultCompleted=_clad_to_game_cozmo.DefaultCompleted())))
+
+    def _cancel_action(self, id_tag):
+        handle = self._pending_actions.get(id_tag)
+        if handle is not None:
+            handle.cancel()
+            self._complete_action(id_tag, _clad_to_game_cozmo.ActionResult.CANCELLED_WHILE_RUNNING)
+
+
+    #### Private Message Handlers ####
+
+    def _recv_msg_UiDeviceConnectionSuccess(self, msg):
+        logger.debug('Simulated robot connected to SDK %s', msg.sdkModuleVersion)
+        self._start()
+
+    def _recv_msg_Ping(self, msg):
+        if msg.isResponse:
+            self.engine.ping_latencies.append(time.monotonic() * 1000 - msg.timeSent_ms)
+
+    def _recv_msg_RequestAvailableAnimations(self, msg):
+        for name in self.animation_names:
+            self.send_msg(_clad_to_game_iface.AnimationAvailable(animName=name))
+        self.send_msg(_clad_to_game_iface.EndOfMessage())
+
+    def _recv_msg_DeleteAllCustomObjects(self, msg):
+        self.send_msg(_clad_to_game_iface.RobotDeletedAllCustomObjects())
+
+    def _recv_msg_ImageRequest(self, msg):
+        if msg.mode == _clad_to_engine_cozmo.ImageSendMode.Stream:
+            self._start_image_stream()
+        else:
+            self._stop_image_stream()
+
+    def _recv_msg_QueueSingleAction(self, msg):
+        self._cancel_action(msg.idTag)
+        self._pending_actions[msg.idTag] = self._loop.call_later(
+            self.action_duration, self._complete_action, msg.idTag,
+            _clad_to_game_cozmo.ActionResult.SUCCESS)
+
+    def _recv_msg_CancelActionByIdTag(self, msg):
+        self._cancel_action(msg.idTag)
+
+    def _recv_msg_CancelAction(self, msg):
+        for id_tag in list(self._pending_actions):
+            self._cancel_action(id_tag)
+
+
+class SimulatedEngine:
+    '''An asyncio TCP server that simulates the Cozmo app in SDK mode.
+
+    Any keyword arguments are passed to each :class:`SimulatedRobot` the
+    engine creates, to configure the messages it sends.
+
+    Args:
+        loop (:class:`asyncio.BaseEventLoop`): The loop to run the server on.
+        host (string): The address to listen on.
+        port (int): The port to listen on, or 0 to pick a free port.
+    '''
+
+    #: callable: The factory function that returns a
+    #: :class:`SimulatedRobot` class or subclass instance.
+    robot_factory = SimulatedRobot
+
+    def __init__(self, loop, host='127.0.0.1', port=0, **robot_kw):
+        self.loop = loop
+        self.host = host
+
+        #: int: The port the engine is listening on, once started.
+        self.port = port
+
+        #: :class:`collections.deque`: The round trip times, in milliseconds,
+        #: of the most recent pings answered by the SDK.
+        self.ping_latencies = collections.deque(maxlen=1000)
+
+        self._robot_kw = robot_kw
+        self._robots = []
+        self._server = None
+        self._jpegs = {}
+
+    def __repr__(self):
+        return '<%s %s:%s robots=%d>' % (self.__class__.__name__, self.host, self.port, len(self._robots))
+
+    async def start(self):
+        '''Starts listening for connections.'''
+        self._server = await self.loop.create_server(
+            lambda: self.robot_factory(self, **self._robot_kw), self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info('Simulated engine listening on %s:%d', self.host, self.port)
+
+    async def close(self):
+        '''Stops the engine and disconnects every robot.'''
+        if self._server is not None:
+            self._server.close()
+            tasks = []
+            for robot in list(self._robots):
+                tasks.extend(robot._tasks)
+                if robot._image_task is not None:
+                    tasks.append(robot._image_task)
+                robot.transport.close()
+            await self._server.wait_closed()
+            if tasks:
+                # let the robots' tasks finish being cancelled
+                await asyncio.wait(tasks)
+            self._server = None
+
+    @property
+    def robots(self):
+        '''list of :class:`SimulatedRobot`: The currently connected robots.'''
+        return list(self._robots)
+
+    @property
+    def messages_sent(self):
+        '''int: The number of messages sent to currently connected robots.'''
+        return sum(robot.messages_sent for robot in self._robots)
+
+    @property
+    def messages_received(self):
+        '''int: The number of messages received from currently connected robots.'''
+        return sum(robot.messages_received for robot in self._robots)
+
+    def _get_jpeg(self, resolution):
+        # The same synthetic image is sent by every robot
+        jpeg = self._jpegs.get(resolution)
+        if jpeg is None:
+            jpeg = self._jpegs[resolution] = _synthetic_jpeg(resolution)
+        return jpeg
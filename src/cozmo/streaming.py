@@ -0,0 +1,343 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Streaming Cozmo's camera to web browsers as Motion JPEG.
+
+:class:`MJPEGServer` is a small asyncio HTTP server that serves the images
+from Cozmo's camera as a ``multipart/x-mixed-replace`` stream, which most
+browsers display directly in an ``<img>`` tag.
+
+The server listens for :class:`cozmo.world.EvtNewCameraImage` once, and
+each new image is encoded to JPEG at most once however many clients are
+watching.  Unless the images are annotated, scaled or in color, the JPEG
+data received from the robot is sent on as is, without being decoded or
+encoded at all.  Color images are received at half width, so are resized
+and encoded again.
+
+Clients that can't keep up don't hold up the others.  Each client has a
+small queue of frames waiting to be sent to it; when that's full the oldest
+frame is dropped.  The frame rate and lag of each client are available from
+:attr:`MJPEGServer.clients`.
+
+Example::
+
+    async def cozmo_program(robot: cozmo.robot.Robot):
+        robot.camera.image_stream_enabled = True
+        server = cozmo.streaming.MJPEGServer(robot.world, port=8080)
+        await server.start()
+        # Browse to http://127.0.0.1:8080/
+        await asyncio.sleep(60)
+        await server.close()
+
+The server serves the stream at ``/stream.mjpg``, the latest image at
+``/snapshot.jpg``, and a page showing the stream at ``/``.
+
+Encoding annotated, scaled or color images requires Pillow to be installed.
+'''
+
+# __all__ should order by constants, event classes, other classes, functions.
+__all__ = ['MJPEGServer', 'StreamingClient']
+
+
+import asyncio
+import collections
+import io
+import time
+
+from . import logger
+from . import annotate
+from . import world
+
+
+_BOUNDARY = b'frame'
+
+# The most bytes accepted for a request's headers
+_MAX_REQUEST_SIZE = 8192
+
+# The period, in seconds, over which a client's frame rate is measured
+_FPS_WINDOW = 2.0
+
+_PAGE = b'''<html>
+<head><title>Cozmo</title></head>
+<body><img src="/stream.mjpg"></body>
+</html>
+'''
+
+_Frame = collections.namedtuple('_Frame', 'jpeg_bytes image_number recv_time')
+
+
+class StreamingClient(asyncio.Protocol):
+    '''A client connected to a :class:`MJPEGServer`.
+
+    Frames are written to the client as they arrive, until its connection
+    stops accepting data as fast as it's written.  Frames then wait in a
+    queue of up to :attr:`MJPEGServer.max_queued_frames`, the oldest being
+    dropped once it's full.
+
+    Args:
+        server (:class:`MJPEGServer`): The server the client connected to.
+    '''
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+
+        #: tuple: The client's address.
+        self.address = None
+
+        #: int: The number of frames written to the client.
+        self.frames_sent = 0
+
+        #: int: The number of frames dropped because the client was too slow.
+        self.frames_dropped = 0
+
+        self._request = b''
+        self._streaming = False
+        self._paused = False
+        self._queue = collections.deque(maxlen=server.max_queued_frames)
+        self._send_times = collections.deque()
+        self._lag = None
+
+    def __repr__(self):
+        return '<%s %s fps=%.1f frames_sent=%d frames_dropped=%d>' % (
+                self.__class__.__name__, self.address, self.fps, self.frames_sent, self.frames_dropped)
+
+    @property
+    def fps(self):
+        '''float: The rate at which frames were written to the client over the last couple of seconds.'''
+        now = time.time()
+        times = self._send_times
+        while times and times[0] < now - _FPS_WINDOW:
+            times.popleft()
+        if len(times) < 2:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    @property
+    def lag(self):
+        '''float: The number of seconds between the SDK receiving the last
+        frame written to the client and it being written, or None if no
+        frames have been written yet.
+        '''
+        return self._lag
+
+    @property
+    def queued_frames(self):
+        '''int: The number of frames waiting to be written to the client.'''
+        return len(self._queue)
+
+    #### Protocol Methods ####
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.address = transport.get_extra_info('peername')
+
+    def data_received(self, data):
+        if self._streaming:
+            return
+        self._request += data
+        if b'\r\n\r\n' not in self._request:
+            if len(self._request) > _MAX_REQUEST_SIZE:
+                self._respond(b'400 Bad Request')
+            return
+
+        request_line = self._request.split(b'\r\n', 1)[0].decode('latin-1').split()
+        if len(request_line) != 3:
+            self._respond(b'400 Bad Request')
+            return
+        method, path = request_line[:2]
+        path = path.split('?', 1)[0]
+        if method != 'GET':
+            self._respond(b'405 Method Not Allowed')
+        elif path == '/':
+            self._respond(b'200 OK', b'text/html', _PAGE)
+        elif path == '/snapshot.jpg':
+            frame = self.server._latest_frame()
+            if frame is None:
+                self._respond(b'503 Service Unavailable')
+            else:
+                self._respond(b'200 OK', b'image/jpeg', frame.jpeg_bytes)
+        elif path == '/stream.mjpg':
+            self._start_stream()
+        else:
+            self._respond(b'404 Not Found')
+
+    def connection_lost(self, exc):
+        self.server._remove_client(self)
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        while self._queue and not self._paused:
+            self._write_frame(self._queue.popleft())
+
+    #### Private Methods ####
+
+    def _respond(self, status, content_type=b'text/plain', body=None):
+        if body is None:
+            body = status + b'\r\n'
+        self.transport.write(b''.join([
+            b'HTTP/1.0 ', status, b'\r\n',
+            b'Content-Type: ', content_type, b'\r\n',
+            b'Content-Length: ', str(len(body)).encode('ascii'), b'\r\n',
+            b'Cache-Control: no-cache, no-store, must-revalidate\r\n',
+            b'Connection: close\r\n\r\n',
+            body]))
+        self.transport.close()
+
+    def _start_stream(self):
+        self._streaming = True
+        self._request = b''
+        self.transport.write(b''.join([
+            b'HTTP/1.0 200 OK\r\n',
+            b'Content-Type: multipart/x-mixed-replace; boundary=', _BOUNDARY, b'\r\n',
+            b'Cache-Control: no-cache, no-store, must-revalidate\r\n',
+            b'Connection: close\r\n\r\n']))
+        self.server._add_client(self)
+
+    def _send_frame(self, frame):
+        if self._paused:
+            if len(self._queue) == self._queue.maxlen:
+                self.frames_dropped += 1
+            self._queue.append(frame)
+        else:
+            self._write_frame(frame)
+
+    def _write_frame(self, frame):
+        self.transport.write(b''.join([
+            b'--', _BOUNDARY, b'\r\n',
+            b'Content-Type: image/jpeg\r\n',
+            b'Content-Length: ', str(len(frame.jpeg_bytes)).encode('ascii'), b'\r\n\r\n',
+            frame.jpeg_bytes, b'\r\n']))
+        now = time.time()
+        self.frames_sent += 1
+        self._lag = now - frame.recv_time
+        self._send_times.append(now)
+
+
+class MJPEGServer:
+    '''An asyncio HTTP server streaming Cozmo's camera as Motion JPEG.
+
+    Args:
+        world (:class:`cozmo.world.World`): The world whose camera images
+            are streamed.
+        host (string): The address to listen on.
+        port (int): The port to listen on, or 0 to pick a free port.
+        annotate (bool): If True, any enabled annotations are drawn onto
+            the images, see :meth:`cozmo.world.CameraImage.annotate_image`.
+        scale (float): If set, the images are scaled by this multiplier.
+        jpeg_quality (int): The quality to encode images at, when they are
+            annotated, scaled or in color.
+        max_queued_frames (int): The number of frames that may wait to be
+            written to a slow client before the oldest is dropped.
+    '''
+
+    #: callable: The factory function that returns a
+    #: :class:`StreamingClient` class or subclass instance.
+    client_factory = StreamingClient
+
+    def __init__(self, world, host='127.0.0.1', port=0, annotate=False, scale=None,
+                 jpeg_quality=80, max_queued_frames=2):
+        self.world = world
+        self.host = host
+
+        #: int: The port the server is listening on, once started.
+        self.port = port
+
+        self.annotate = annotate
+        self.scale = scale
+        self.jpeg_quality = jpeg_quality
+        self.max_queued_frames = max_queued_frames
+
+        #: int: The number of images encoded to JPEG by the server.
+        self.frames_encoded = 0
+
+        self._clients = []
+        self._server = None
+        self._handler = None
+        self._image = None
+        self._frame = None
+
+    def __repr__(self):
+        return '<%s %s:%s clients=%d>' % (self.__class__.__name__, self.host, self.port, len(self._clients))
+
+    @property
+    def clients(self):
+        '''list of :class:`StreamingClient`: The clients currently being streamed to.'''
+        return list(self._clients)
+
+    async def start(self):
+        '''Starts listening for connections.'''
+        self._server = await self.world._loop.create_server(
+            lambda: self.client_factory(self), self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._handler = self.world.add_event_handler(world.EvtNewCameraImage, self._on_new_camera_image)
+        logger.info('MJPEG server listening on http://%s:%d/', self.host, self.port)
+
+    async def close(self):
+        '''Stops the server and disconnects every client.'''
+        if self._server is not None:
+            self._handler.disable()
+            self._server.close()
+            for client in list(self._clients):
+                client.transport.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _on_new_camera_image(self, evt, *, image, **kw):
+        self._image = image
+        self._frame = None
+        if not self._clients:
+            # Encoded on demand, if a snapshot is requested
+            return
+        frame = self._latest_frame()
+        for client in self._clients:
+            client._send_frame(frame)
+
+    def _latest_frame(self):
+        if self._frame is None and self._image is not None:
+            self._frame = _Frame(self._encode(self._image), self._image.image_number,
+                                 self._image.image_recv_time)
+        return self._frame
+
+    def _encode(self, image):
+        frame = image.frame
+        if not self.annotate and self.scale is None and frame is not None and not frame.is_color_image:
+            # Color images' JPEG data is half width, so they must be encoded again
+            return frame.jpeg_bytes
+        if self.annotate:
+            pil_image = image.annotate_image(scale=self.scale)
+        else:
+            pil_image = image.raw_image
+            if self.scale is not None:
+                size = (int(pil_image.width * self.scale), int(pil_image.height * self.scale))
+                pil_image = pil_image.resize(size, annotate.RESAMPLE_MODE_NEAREST)
+        buf = io.BytesIO()
+        pil_image.save(buf, 'JPEG', quality=self.jpeg_quality)
+        self.frames_encoded += 1
+        return buf.getvalue()
+
+    def _add_client(self, client):
+        self._clients.append(client)
+        logger.debug('MJPEG client connected from %s', client.address)
+        frame = self._latest_frame()
+        if frame is not None:
+            client._send_frame(frame)
+
+    def _remove_client(self, client):
+        if client in self._clients:
+            self._clients.remove(client)
+            logger.debug('MJPEG client disconnected from %s: %r', client.address, client)
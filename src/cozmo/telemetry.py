@@ -0,0 +1,270 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Recording of Cozmo's state as NumPy arrays for later analysis.
+
+Once enabled by calling :meth:`cozmo.robot.Robot.enable_telemetry`, every
+state update received from the robot is appended to a
+:class:`TelemetryRecorder`, available as :attr:`cozmo.robot.Robot.telemetry`.
+Each field is stored in a preallocated column, so recording is cheap and
+recent history can be retrieved as NumPy arrays without copying::
+
+    robot.enable_telemetry()
+    await asyncio.sleep(5)
+    recent = robot.telemetry.last(seconds=2)
+    head_speed = recent.derivative('head_angle')  # radians per second
+
+Samples are timestamped with the time they were received, in seconds, as
+measured by the event loop's monotonic clock.
+
+Requires NumPy to be installed.
+'''
+
+# __all__ should order by constants, event classes, other classes, functions.
+__all__ = ['TELEMETRY_FIELDS', 'TelemetryRecorder', 'TelemetryWindow']
+
+
+import math
+
+_numpy_available = True
+
+try:
+    import numpy as np
+except ImportError as exc:
+    np = None
+    _numpy_available = exc
+
+
+#: tuple of string: The names of the fields recorded for each state update.
+#: Distances are in millimeters, angles in radians, speeds in mm/s,
+#: accelerations in mm/s^2 and angular velocities in radians/s.
+TELEMETRY_FIELDS = ('time',
+                    'pose_x', 'pose_y', 'pose_z',
+                    'pose_q0', 'pose_q1', 'pose_q2', 'pose_q3',
+                    'pose_angle', 'pose_pitch', 'head_angle', 'lift_height',
+                    'left_wheel_speed', 'right_wheel_speed', 'battery_voltage',
+                    'accel_x', 'accel_y', 'accel_z',
+                    'gyro_x', 'gyro_y', 'gyro_z')
+
+# Fields that wrap around at +/- pi, and so are unwrapped before being
+# differentiated or interpolated.
+_ANGLE_FIELDS = frozenset(('pose_angle', 'pose_pitch', 'head_angle'))
+
+_FIELD_INDEX = {name: i for i, name in enumerate(TELEMETRY_FIELDS)}
+
+
+def _require_numpy():
+    if _numpy_available is not True:
+        raise ImportError("Telemetry recording not available: %s" % _numpy_available)
+
+
+def _wrap_angles(values):
+    return (values + math.pi) % (2 * math.pi) - math.pi
+
+
+class TelemetryWindow:
+    '''A contiguous range of recorded samples, ordered by time.
+
+    Returned by :meth:`TelemetryRecorder.last`.  Columns are accessed by
+    indexing the window with a field name from :data:`TELEMETRY_FIELDS`,
+    eg. ``window['head_angle']``.
+
+    Columns of a window returned by the recorder are read-only views onto
+    its storage, so are only valid until the recorder has wrapped around
+    and overwritten them; copy them if they need to be kept for longer.
+    '''
+
+    def __init__(self, data):
+        # data is an array with a row per field and a column per sample
+        self._data = data
+
+    def __repr__(self):
+        if len(self) == 0:
+            return '<%s samples=0>' % self.__class__.__name__
+        return '<%s samples=%d duration=%.3f>' % (self.__class__.__name__, len(self), self.duration)
+
+    def __len__(self):
+        return self._data.shape[1]
+
+    def __getitem__(self, field):
+        try:
+            return self._data[_FIELD_INDEX[field]]
+        except KeyError:
+            raise KeyError('Unknown telemetry field %s' % field) from None
+
+    @property
+    def fields(self):
+        '''tuple of string: The names of the fields available in the window.'''
+        return TELEMETRY_FIELDS
+
+    @property
+    def time(self):
+        ''':class:`numpy.ndarray`: The time each sample was received, in seconds.'''
+        return self._data[0]
+
+    @property
+    def duration(self):
+        '''float: The time between the first and last samples, in seconds.'''
+        if len(self) == 0:
+            return 0.0
+        return float(self._data[0, -1] - self._data[0, 0])
+
+    def derivative(self, field):
+        '''Returns the rate of change of a field with respect to time.
+
+        Angles are unwrapped first, so crossing +/- pi doesn't show up as a
+        large jump.
+
+        Args:
+            field (string): The name of the field to differentiate.
+        Returns:
+            A :class:`numpy.ndarray` of the rate of change per second at each sample.
+        Raises:
+            :class:`ValueError` if the window has fewer than two samples.
+        '''
+        if len(self) < 2:
+            raise ValueError('At least two samples are required to differentiate')
+        values = self[field]
+        if field in _ANGLE_FIELDS:
+            values = np.unwrap(values)
+        # The same as np.gradient(values, self.time), which needs NumPy 1.13:
+        # the slopes either side of each sample, weighted by the other's
+        # duration, and one-sided differences at either end.
+        dt = np.diff(self.time)
+        slopes = np.diff(values) / dt
+        rates = np.empty(len(values))
+        rates[0] = slopes[0]
+        rates[-1] = slopes[-1]
+        rates[1:-1] = (dt[1:] * slopes[:-1] + dt[:-1] * slopes[1:]) / (dt[:-1] + dt[1:])
+        return rates
+
+    def resample(self, rate):
+        '''Returns the samples linearly interpolated onto a uniform time grid.
+
+        Useful for lining up recordings with each other, or with other
+        signals, as the robot's updates don't arrive at a perfectly steady rate.
+
+        Args:
+            rate (float): The number of samples per second to produce.
+        Returns:
+            A new :class:`TelemetryWindow`, covering the same span of time.
+        Raises:
+            :class:`ValueError` if the rate isn't positive.
+        '''
+        if rate <= 0:
+            raise ValueError('rate must be positive (got %s)' % rate)
+        if len(self) == 0:
+            return TelemetryWindow(np.empty((len(TELEMETRY_FIELDS), 0)))
+
+        times = self.time
+        count = int(math.floor((times[-1] - times[0]) * rate)) + 1
+        new_times = times[0] + np.arange(count) / rate
+        data = np.empty((len(TELEMETRY_FIELDS), count))
+        data[0] = new_times
+        for i, field in enumerate(TELEMETRY_FIELDS[1:], 1):
+            values = self._data[i]
+            if field in _ANGLE_FIELDS:
+                data[i] = _wrap_angles(np.interp(new_times, times, np.unwrap(values)))
+            else:
+                data[i] = np.interp(new_times, times, values)
+        return TelemetryWindow(data)
+
+
+class TelemetryRecorder:
+    '''Records robot state updates into a fixed size ring buffer.
+
+    Generally created by :meth:`cozmo.robot.Robot.enable_telemetry` rather
+    than directly.
+
+    Args:
+        capacity (int): The maximum number of samples to keep; the oldest are
+            discarded once it's full.  The robot sends around 30 updates per
+            second.
+    Raises:
+        :class:`ImportError` if NumPy isn't available.
+        :class:`ValueError` if the capacity is less than 1.
+    '''
+
+    def __init__(self, capacity=9000):
+        _require_numpy()
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1 (got %s)' % capacity)
+        self._capacity = capacity
+        # Each sample is written twice, capacity columns apart, so that the
+        # most recent samples can always be returned as one contiguous slice.
+        self._data = np.zeros((len(TELEMETRY_FIELDS), capacity * 2))
+        self._next = 0
+        self._count = 0
+
+    def __repr__(self):
+        return '<%s samples=%d capacity=%d>' % (self.__class__.__name__, self._count, self._capacity)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self):
+        '''int: The maximum number of samples kept.'''
+        return self._capacity
+
+    def clear(self):
+        '''Discards all recorded samples.'''
+        self._next = 0
+        self._count = 0
+
+    def record(self, time, msg):
+        '''Appends a state update.
+
+        Called by the robot for each state update; not generally called from
+        user-facing code.
+
+        Args:
+            time (float): The time the update was received, in seconds.
+            msg: The RobotState message received from the engine.
+        '''
+        pose = msg.pose
+        row = (time,
+               pose.x, pose.y, pose.z, pose.q0, pose.q1, pose.q2, pose.q3,
+               msg.poseAngle_rad, msg.posePitch_rad, msg.headAngle_rad, msg.liftHeight_mm,
+               msg.leftWheelSpeed_mmps, msg.rightWheelSpeed_mmps, msg.batteryVoltage,
+               msg.accel.x, msg.accel.y, msg.accel.z,
+               msg.gyro.x, msg.gyro.y, msg.gyro.z)
+        i = self._next
+        self._data[:, i] = row
+        self._data[:, i + self._capacity] = row
+        self._next = (i + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def last(self, seconds=None, samples=None):
+        '''Returns the most recently recorded samples.
+
+        Args:
+            seconds (float): If supplied, only samples received within this
+                many seconds of the most recent one are returned.
+            samples (int): If supplied, at most this many samples are returned.
+        Returns:
+            A :class:`TelemetryWindow` whose columns are views onto the
+            recorder's storage.
+        '''
+        end = self._next + self._capacity
+        start = end - self._count
+        if samples is not None:
+            start = max(start, end - samples)
+        if seconds is not None and end > start:
+            times = self._data[0, start:end]
+            start += int(np.searchsorted(times, times[-1] - seconds, side='left'))
+        view = self._data[:, start:end]
+        view.flags.writeable = False
+        return TelemetryWindow(view)
@@ -20,7 +20,7 @@
 __all__ = ['Angle', 'degrees', 'radians',
            'ImageBox',
            'Distance', 'distance_mm', 'distance_inches', 'Matrix44',
-           'Pose', 'pose_quaternion', 'pose_z_angle',
+           'Pose', 'pose_quaternion', 'pose_z_angle', 'PoseArray',
            'Position', 'Quaternion',
            'Rotation', 'rotation_quaternion', 'rotation_z_angle',
            'angle_z_to_quaternion',
@@ -31,9 +31,22 @@ __all__ = ['Angle', 'degrees', 'radians',
 import collections
 import math
 import time
+
+_numpy_available = True
+
+try:
+    import numpy as np
+except ImportError as exc:
+    np = None
+    _numpy_available = exc
+
 from ._clad import _clad_to_engine_anki
 
 
+# Used by the _create classmethods to make instances without calling __init__
+_object_new = object.__new__
+
+
 class ImageBox(collections.namedtuple('ImageBox', 'top_left_x top_left_y width height')):
     '''Defines a bounding box within an image frame.
 
@@ -101,7 +114,7 @@ class Angle:
             (cannot be combined with ``radians``)
     '''
 
-    __slots__ = ('_radians')
+    __slots__ = ('_radians',)
 
     def __init__(self, radians=None, degrees=None):
         if radians is None and degrees is None:
@@ -113,33 +126,40 @@ class Angle:
             radians = degrees * math.pi / 180
         self._radians = float(radians)
 
+    @classmethod
+    def _create(cls, radians):
+        # Skips the argument checks in __init__; radians must already be a float
+        angle = _object_new(cls)
+        angle._radians = radians
+        return angle
+
     def __repr__(self):
         return "<%s %.2f radians (%.2f degrees)>" % (self.__class__.__name__, self.radians, self.degrees)
 
     def __add__(self, other):
         if not isinstance(other, Angle):
             raise TypeError("Unsupported type for + expected Angle")
-        return radians(self.radians + other.radians)
+        return Angle._create(self._radians + other._radians)
 
     def __sub__(self, other):
         if not isinstance(other, Angle):
             raise TypeError("Unsupported type for - expected Angle")
-        return radians(self.radians - other.radians)
+        return Angle._create(self._radians - other._radians)
 
     def __mul__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported type for * expected number")
-        return radians(self.radians * other)
+        return Angle._create(float(self._radians * other))
 
     def __truediv__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported type for / expected number")
-        return radians(self.radians / other)
+        return Angle._create(self._radians / other)
 
     def _cmp_int(self, other):
         if not isinstance(other, Angle):
             raise TypeError("Unsupported type for comparison expected Angle")
-        return self.radians - other.radians
+        return self._radians - other._radians
 
     def __eq__(self, other):
         return self._cmp_int(other) == 0
@@ -175,7 +195,7 @@ class Angle:
         
         If the Angle is positive then it returns a copy of this Angle, otherwise it returns -Angle.
         """
-        return Angle(radians = abs(self._radians))
+        return Angle._create(abs(self._radians))
 
 
 def degrees(degrees):
@@ -203,7 +223,7 @@ class Distance:
             represent (cannot be combined with ``distance_mm``).
     '''
 
-    __slots__ = ('_distance_mm')
+    __slots__ = ('_distance_mm',)
 
     def __init__(self, distance_mm=None, distance_inches=None):
         if distance_mm is None and distance_inches is None:
@@ -215,28 +235,35 @@ class Distance:
             distance_mm = distance_inches * 25.4
         self._distance_mm = distance_mm
 
+    @classmethod
+    def _create(cls, distance_mm):
+        # Skips the argument checks in __init__
+        distance = _object_new(cls)
+        distance._distance_mm = distance_mm
+        return distance
+
     def __repr__(self):
         return "<%s %.2f mm (%.2f inches)>" % (self.__class__.__name__, self.distance_mm, self.distance_inches)
 
     def __add__(self, other):
         if not isinstance(other, Distance):
             raise TypeError("Unsupported operand for + expected Distance")
-        return distance_mm(self.distance_mm + other.distance_mm)
+        return Distance._create(self._distance_mm + other._distance_mm)
 
     def __sub__(self, other):
         if not isinstance(other, Distance):
             raise TypeError("Unsupported operand for - expected Distance")
-        return distance_mm(self.distance_mm - other.distance_mm)
+        return Distance._create(self._distance_mm - other._distance_mm)
 
     def __mul__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for * expected number")
-        return distance_mm(self.distance_mm * other)
+        return Distance._create(self._distance_mm * other)
 
     def __truediv__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for / expected number")
-        return distance_mm(self.distance_mm / other)
+        return Distance._create(self._distance_mm / other)
 
     @property
     def distance_mm(self):
@@ -272,35 +299,42 @@ class Speed:
             should represent.
     '''
 
-    __slots__ = ('_speed_mmps')
+    __slots__ = ('_speed_mmps',)
 
     def __init__(self, speed_mmps=None):
         if speed_mmps is None:
             raise ValueError("Expected speed_mmps keyword argument")
         self._speed_mmps = speed_mmps
 
+    @classmethod
+    def _create(cls, speed_mmps):
+        # Skips the argument check in __init__
+        speed = _object_new(cls)
+        speed._speed_mmps = speed_mmps
+        return speed
+
     def __repr__(self):
         return "<%s %.2f mmps>" % (self.__class__.__name__, self.speed_mmps)
 
     def __add__(self, other):
         if not isinstance(other, Speed):
             raise TypeError("Unsupported operand for + expected Speed")
-        return speed_mmps(self.speed_mmps + other.speed_mmps)
+        return Speed._create(self._speed_mmps + other._speed_mmps)
 
     def __sub__(self, other):
         if not isinstance(other, Speed):
             raise TypeError("Unsupported operand for - expected Speed")
-        return speed_mmps(self.speed_mmps - other.speed_mmps)
+        return Speed._create(self._speed_mmps - other._speed_mmps)
 
     def __mul__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for * expected number")
-        return speed_mmps(self.speed_mmps * other)
+        return Speed._create(self._speed_mmps * other)
 
     def __truediv__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for / expected number")
-        return speed_mmps(self.speed_mmps / other)
+        return Speed._create(self._speed_mmps / other)
 
     @property
     def speed_mmps(self):
@@ -349,11 +383,22 @@ class Pose:
         self._origin_id = origin_id
         self._is_accurate = is_accurate
 
+    @classmethod
+    def _create(cls, position, rotation, origin_id, is_accurate=True):
+        # Skips the argument checks in __init__, taking an existing
+        # Position and Quaternion
+        pose = _object_new(cls)
+        pose._position = position
+        pose._rotation = rotation
+        pose._origin_id = origin_id
+        pose._is_accurate = is_accurate
+        return pose
+
     @classmethod
     def _create_from_clad(cls, pose):
-        return cls(pose.x, pose.y, pose.z,
-                   q0=pose.q0, q1=pose.q1, q2=pose.q2, q3=pose.q3,
-                   origin_id=pose.originID)
+        return cls._create(Position(pose.x, pose.y, pose.z),
+                           Quaternion._create(pose.q0, pose.q1, pose.q2, pose.q3),
+                           pose.originID)
 
     @classmethod
     def _create_default(cls):
@@ -367,30 +412,32 @@ class Pose:
     def __add__(self, other):
         if not isinstance(other, Pose):
             raise TypeError("Unsupported operand for + expected Pose")
-        pos = self.position + other.position
-        rot = self.rotation + other.rotation
-        return pose_quaternion(pos.x, pos.y, pos.z, rot.q0, rot.q1, rot.q2, rot.q3)
+        pos = self._position
+        other_pos = other._position
+        return Pose._create(Position(pos._x + other_pos._x, pos._y + other_pos._y, pos._z + other_pos._z),
+                            self._rotation + other._rotation, 0)
 
     def __sub__(self, other):
         if not isinstance(other, Pose):
             raise TypeError("Unsupported operand for - expected Pose")
-        pos = self.position - other.position
-        rot = self.rotation - other.rotation
-        return pose_quaternion(pos.x, pos.y, pos.z, rot.q0, rot.q1, rot.q2, rot.q3)
+        pos = self._position
+        other_pos = other._position
+        return Pose._create(Position(pos._x - other_pos._x, pos._y - other_pos._y, pos._z - other_pos._z),
+                            self._rotation - other._rotation, 0)
 
     def __mul__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for * expected number")
-        pos = self.position * other
-        rot = self.rotation * other
-        return pose_quaternion(pos.x, pos.y, pos.z, rot.q0, rot.q1, rot.q2, rot.q3)
+        pos = self._position
+        return Pose._create(Position(pos._x * other, pos._y * other, pos._z * other),
+                            self._rotation * other, 0)
 
     def __truediv__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for / expected number")
-        pos = self.position / other
-        rot = self.rotation / other
-        return pose_quaternion(pos.x, pos.y, pos.z, rot.q0, rot.q1, rot.q2, rot.q3)
+        pos = self._position
+        return Pose._create(Position(pos._x / other, pos._y / other, pos._z / other),
+                            self._rotation / other, 0)
 
     def define_pose_relative_this(self, new_pose):
         '''Creates a new pose such that new_pose's origin is now at the location of this pose.
@@ -403,18 +450,19 @@ class Pose:
 
         if not isinstance(new_pose, Pose):
             raise TypeError("Unsupported type for new_origin, must be of type Pose")
-        x,y,z = self.position.x_y_z
-        angle_z = self.rotation.angle_z
-        new_x,new_y,new_z = new_pose.position.x_y_z
-        new_angle_z = new_pose.rotation.angle_z
+        x,y,z = self._position.x_y_z
+        angle_z = self._rotation._angle_z_radians()
+        new_x,new_y,new_z = new_pose._position.x_y_z
+        new_angle_z = new_pose._rotation._angle_z_radians()
 
-        cos_angle = math.cos(angle_z.radians)
-        sin_angle = math.sin(angle_z.radians)
+        cos_angle = math.cos(angle_z)
+        sin_angle = math.sin(angle_z)
         res_x = x + (cos_angle * new_x) - (sin_angle * new_y)
         res_y = y + (sin_angle * new_x) + (cos_angle * new_y)
         res_z = z + new_z
         res_angle = angle_z + new_angle_z
-        return Pose(res_x, res_y, res_z, angle_z=res_angle, origin_id=self._origin_id)
+        return Pose._create(Position(res_x, res_y, res_z), Quaternion._create_z_angle(res_angle),
+                            self._origin_id)
 
     def encode_pose(self):
         x, y, z = self.position.x_y_z
@@ -435,13 +483,13 @@ class Pose:
         Returns:
             bool: True if the two poses are comparable, False otherwise.
         '''
-        return (self.is_valid and other_pose.is_valid and
-                (self.origin_id == other_pose.origin_id))
+        return (self._origin_id >= 0 and other_pose._origin_id >= 0 and
+                (self._origin_id == other_pose._origin_id))
 
     @property
     def is_valid(self):
         '''bool: Returns True if this is a valid, usable pose.'''
-        return self.origin_id >= 0
+        return self._origin_id >= 0
 
     @property
     def position(self):
@@ -468,7 +516,7 @@ class Pose:
             :class:`cozmo.util.Matrix44`: A matrix representing this Pose's
             position and rotation.
         """
-        return self.rotation.to_matrix(*self.position.x_y_z)
+        return self._rotation.to_matrix(*self._position.x_y_z)
 
     @property
     def origin_id(self):
@@ -490,7 +538,7 @@ class Pose:
         or if they were observed from far enough away that we're less certain
         of the exact pose.
         '''
-        return self.is_valid and self._is_accurate
+        return self._origin_id >= 0 and self._is_accurate
 
 
 def pose_quaternion(x, y, z, q0, q1, q2, q3, origin_id=0):
@@ -502,6 +550,261 @@ def pose_z_angle(x, y, z, angle_z, origin_id=0):
     return Pose(x, y, z, angle_z=angle_z, origin_id=origin_id)
 
 
+def _require_numpy():
+    if _numpy_available is not True:
+        raise ImportError("PoseArray not available: %s" % _numpy_available)
+
+
+def _quaternion_multiply(a, b):
+    # Hamilton product of (N, 4) arrays of (q0, q1, q2, q3) quaternions
+    a0, a1, a2, a3 = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+    b0, b1, b2, b3 = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+    return np.stack((a0*b0 - a1*b1 - a2*b2 - a3*b3,
+                     a0*b1 + a1*b0 + a2*b3 - a3*b2,
+                     a0*b2 - a1*b3 + a2*b0 + a3*b1,
+                     a0*b3 + a1*b2 - a2*b1 + a3*b0), axis=1)
+
+
+def _rotate_vectors(q, v):
+    # Rotates (N, 3) vectors by (N, 4) unit quaternions:
+    # v + 2 * q0 * (u x v) + 2 * u x (u x v), where u is the vector part of q
+    u = q[:, 1:]
+    uv = np.cross(u, v) * 2.0
+    return v + q[:, :1] * uv + np.cross(u, uv)
+
+
+def _compose_poses(a, b):
+    # Composes (N, 7) pose arrays, either of which may have a single row
+    count = max(len(a), len(b))
+    q = np.broadcast_to(a[:, 3:], (count, 4))
+    result = np.empty((count, 7))
+    result[:, :3] = a[:, :3] + _rotate_vectors(q, np.broadcast_to(b[:, :3], (count, 3)))
+    result[:, 3:] = _quaternion_multiply(q, np.broadcast_to(b[:, 3:], (count, 4)))
+    return result
+
+
+def _invert_poses(a):
+    result = np.empty_like(a)
+    result[:, 3] = a[:, 3]
+    result[:, 4:] = -a[:, 4:]
+    result[:, :3] = -_rotate_vectors(result[:, 3:], a[:, :3])
+    return result
+
+
+class PoseArray:
+    '''Represents many poses at once, for transforming them in bulk.
+
+    The poses are stored in an Nx7 :class:`numpy.ndarray`, with a row of
+    (x, y, z, q0, q1, q2, q3) per pose, so operations apply to every pose at
+    once rather than creating a :class:`Pose` for each result.  This is much
+    faster when working with many poses, eg. moving every observed object
+    into the robot's frame of reference::
+
+        objects = cozmo.util.PoseArray.from_poses([obj.pose for obj in observed])
+        relative = objects.relative_to(robot.pose)
+        distances = relative.distance_to(cozmo.util.Pose(0, 0, 0, angle_z=cozmo.util.degrees(0)))
+
+    Unlike :class:`Pose`, the rotations are treated as full 3D rotations,
+    rather than only rotations about the z axis.
+
+    Operations taking another pose accept either a :class:`Pose`, which is
+    applied to every row, or a :class:`PoseArray` of the same length, which
+    is applied row by row.
+
+    Requires NumPy to be installed.
+
+    Args:
+        data (array_like): An Nx7 array of (x, y, z, q0, q1, q2, q3) rows.
+        origin_id (int): The origin ID shared by all of the poses.
+    Raises:
+        :class:`ImportError` if NumPy isn't available.
+        :class:`ValueError` if data isn't an Nx7 array.
+    '''
+
+    __slots__ = ('_data', '_origin_id')
+
+    def __init__(self, data, origin_id=0):
+        _require_numpy()
+        data = np.array(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != 7:
+            raise ValueError("Expected an Nx7 array of poses (got shape %s)" % (data.shape,))
+        self._data = data
+        self._origin_id = origin_id
+
+    @classmethod
+    def _create(cls, data, origin_id):
+        # data is already an Nx7 float64 array owned by the new instance
+        pose_array = _object_new(cls)
+        pose_array._data = data
+        pose_array._origin_id = origin_id
+        return pose_array
+
+    @classmethod
+    def from_poses(cls, poses):
+        '''Creates a PoseArray from a sequence of poses.
+
+        Args:
+            poses (list of :class:`Pose`): The poses, which must all share the
+                same origin ID.
+        Returns:
+            A :class:`PoseArray` with a row for each pose.
+        Raises:
+            :class:`ValueError` if the poses have different origin IDs.
+        '''
+        _require_numpy()
+        origin_id = poses[0].origin_id if poses else 0
+        rows = []
+        for pose in poses:
+            if pose._origin_id != origin_id:
+                raise ValueError("All poses must have the same origin_id (got %s and %s)" %
+                                 (origin_id, pose._origin_id))
+            rows.append(pose._position.x_y_z + pose._rotation.q0_q1_q2_q3)
+        data = np.array(rows, dtype=np.float64).reshape(len(rows), 7)
+        return cls._create(data, origin_id)
+
+    def to_poses(self):
+        '''Converts the array back to individual poses.
+
+        Returns:
+            list of :class:`Pose`: A pose for each row.
+        '''
+        origin_id = self._origin_id
+        return [Pose._create(Position(x, y, z), Quaternion._create(q0, q1, q2, q3), origin_id)
+                for x, y, z, q0, q1, q2, q3 in self._data.tolist()]
+
+    def __repr__(self):
+        return "<%s poses=%d origin_id=%d>" % (self.__class__.__name__, len(self), self._origin_id)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, int):
+            x, y, z, q0, q1, q2, q3 = self._data[index].tolist()
+            return Pose._create(Position(x, y, z), Quaternion._create(q0, q1, q2, q3), self._origin_id)
+        return PoseArray._create(self._data[index].reshape(-1, 7), self._origin_id)
+
+    @property
+    def data(self):
+        ':class:`numpy.ndarray`: The Nx7 array of (x, y, z, q0, q1, q2, q3) rows.'
+        return self._data
+
+    @property
+    def origin_id(self):
+        '''int: An ID maintained by the engine which represents which coordinate frame the poses are in.'''
+        return self._origin_id
+
+    @property
+    def positions(self):
+        ':class:`numpy.ndarray`: An Nx3 view of the (x, y, z) positions in millimeters.'
+        return self._data[:, :3]
+
+    @property
+    def quaternions(self):
+        ':class:`numpy.ndarray`: An Nx4 view of the (q0, q1, q2, q3) rotations.'
+        return self._data[:, 3:]
+
+    @property
+    def angle_z(self):
+        ':class:`numpy.ndarray`: The rotation of each pose about the z axis, in radians.'
+        q0, q1, q2, q3 = self._data[:, 3], self._data[:, 4], self._data[:, 5], self._data[:, 6]
+        return np.arctan2(2 * (q1*q2 + q0*q3), 1 - 2 * (q2*q2 + q3*q3))
+
+    def _other_data(self, other):
+        if isinstance(other, PoseArray):
+            if len(other) != len(self):
+                raise ValueError("PoseArrays must be the same length (got %d and %d)" % (len(self), len(other)))
+            return other._data
+        if isinstance(other, Pose):
+            position = other.position
+            rotation = other.rotation
+            return np.array(((position.x, position.y, position.z,
+                              rotation.q0, rotation.q1, rotation.q2, rotation.q3),))
+        raise TypeError("Unsupported type for other, must be Pose or PoseArray")
+
+    def compose(self, other):
+        '''Applies another pose on top of each of these poses.
+
+        The result places ``other``, which is relative to each pose, into the
+        frame these poses are in; the equivalent of
+        :meth:`Pose.define_pose_relative_this` for each row.
+
+        Args:
+            other (:class:`Pose` or :class:`PoseArray`): The pose(s) relative to these poses.
+        Returns:
+            A new :class:`PoseArray`.
+        '''
+        return PoseArray._create(_compose_poses(self._data, self._other_data(other)), self._origin_id)
+
+    def inverse(self):
+        '''Returns the inverse of each pose.
+
+        Composing a pose with its inverse gives the identity pose.
+
+        Returns:
+            A new :class:`PoseArray`.
+        '''
+        return PoseArray._create(_invert_poses(self._data), self._origin_id)
+
+    def relative_to(self, pose):
+        '''Expresses each pose relative to another, eg. in the robot's frame of reference.
+
+        Args:
+            pose (:class:`Pose` or :class:`PoseArray`): The pose(s) to use as the new origin.
+        Returns:
+            A new :class:`PoseArray`, in which ``pose`` is at (0, 0, 0) with no rotation.
+        '''
+        inverse = _invert_poses(self._other_data(pose))
+        return PoseArray._create(_compose_poses(inverse, self._data), self._origin_id)
+
+    def distance_to(self, other):
+        '''Returns the straight line distance between each pose and another.
+
+        Args:
+            other (:class:`Pose` or :class:`PoseArray`): The pose(s) to measure to.
+        Returns:
+            :class:`numpy.ndarray`: The distances in millimeters.
+        '''
+        other_data = self._other_data(other)
+        delta = self._data[:, :3] - other_data[:, :3]
+        return np.sqrt(np.einsum('ij,ij->i', delta, delta))
+
+    def angle_to(self, other):
+        '''Returns the smallest rotation between each pose and another.
+
+        Args:
+            other (:class:`Pose` or :class:`PoseArray`): The pose(s) to compare against.
+        Returns:
+            :class:`numpy.ndarray`: The angles in radians, between 0 and pi.
+        '''
+        other_data = self._other_data(other)
+        dot = np.abs(np.einsum('ij,ij->i', self._data[:, 3:], np.broadcast_to(other_data[:, 3:], (len(self), 4))))
+        return 2.0 * np.arccos(np.minimum(dot, 1.0))
+
+    def to_matrices(self):
+        '''Converts each pose to a 4x4 matrix.
+
+        Returns:
+            :class:`numpy.ndarray`: An Nx4x4 array, where each 4x4 matrix is
+            laid out in the same order as :attr:`Matrix44.in_row_order`.
+        '''
+        data = self._data
+        q0, q1, q2, q3 = data[:, 3], data[:, 4], data[:, 5], data[:, 6]
+        result = np.zeros((len(data), 4, 4))
+        result[:, 0, 0] = q0*q0 + q1*q1 - q2*q2 - q3*q3
+        result[:, 0, 1] = 2 * (q1*q2 + q0*q3)
+        result[:, 0, 2] = 2 * (q1*q3 - q0*q2)
+        result[:, 1, 0] = 2 * (q1*q2 - q0*q3)
+        result[:, 1, 1] = q0*q0 - q1*q1 + q2*q2 - q3*q3
+        result[:, 1, 2] = 2 * (q0*q1 + q2*q3)
+        result[:, 2, 0] = 2 * (q0*q2 + q1*q3)
+        result[:, 2, 1] = 2 * (q2*q3 - q0*q1)
+        result[:, 2, 2] = q0*q0 - q1*q1 - q2*q2 + q3*q3
+        result[:, 3, :3] = data[:, :3]
+        result[:, 3, 3] = 1.0
+        return result
+
+
 class Matrix44:
     """A 4x4 Matrix for representing the rotation and/or position of an object in the world.
     
@@ -663,6 +966,26 @@ class Quaternion:
 
         self._q0, self._q1, self._q2, self._q3 = q0, q1, q2, q3
 
+    @classmethod
+    def _create(cls, q0, q1, q2, q3):
+        # Skips the argument checks in __init__
+        quaternion = _object_new(cls)
+        quaternion._q0 = q0
+        quaternion._q1 = q1
+        quaternion._q2 = q2
+        quaternion._q3 = q3
+        return quaternion
+
+    @classmethod
+    def _create_z_angle(cls, angle_z_radians):
+        # The same as angle_z_to_quaternion, for an angle in radians
+        half_angle = angle_z_radians / 2
+        return cls._create(math.cos(half_angle), 0, 0, math.sin(half_angle))
+
+    def _angle_z_radians(self):
+        q0, q1, q2, q3 = self._q0, self._q1, self._q2, self._q3
+        return math.atan2(2*(q1*q2+q0*q3), 1-2*(q2**2+q3**2))
+
     def __repr__(self):
         return ("<%s q0: %.2f q1: %.2f q2: %.2f q3: %.2f (angle_z: %s)>" %
             (self.__class__.__name__, self.q0, self.q1, self.q2, self.q3, self.angle_z))
@@ -717,22 +1040,22 @@ class Quaternion:
     def __add__(self, other):
         if not isinstance(other, Quaternion):
             raise TypeError("Unsupported operand for + expected Quaternion")
-        return rotation_z_angle(self.angle_z + other.angle_z)
+        return Quaternion._create_z_angle(self._angle_z_radians() + other._angle_z_radians())
 
     def __sub__(self, other):
         if not isinstance(other, Quaternion):
             raise TypeError("Unsupported operand for - expected Quaternion")
-        return rotation_z_angle(self.angle_z - other.angle_z)
+        return Quaternion._create_z_angle(self._angle_z_radians() - other._angle_z_radians())
 
     def __mul__(self, other):
         if not isinstance(other, (int,float)):
             raise TypeError("Unsupported operand for * expected number")
-        return rotation_z_angle(self.angle_z * other)
+        return Quaternion._create_z_angle(self._angle_z_radians() * other)
 
     def __truediv__(self, other):
         if not isinstance(other, (int,float)):
             raise TypeError("Unsupported operand for / expected number")
-        return rotation_z_angle(self.angle_z / other)
+        return Quaternion._create_z_angle(self._angle_z_radians() / other)
 
     @property
     def q0(self):
@@ -765,8 +1088,7 @@ class Quaternion:
 
         Defined as the rotation in the z axis.
         '''
-        q0,q1,q2,q3 = self.q0_q1_q2_q3
-        return Angle(radians=math.atan2(2*(q1*q2+q0*q3), 1-2*(q2**2+q3**2)))
+        return Angle._create(self._angle_z_radians())
 
     @property
     def euler_angles(self):
@@ -889,22 +1211,22 @@ class Vector2:
     def __add__(self, other):
         if not isinstance(other, Vector2):
             raise TypeError("Unsupported operand for + expected Vector2")
-        return Vector2(self.x + other.x, self.y + other.y)
+        return Vector2(self._x + other._x, self._y + other._y)
 
     def __sub__(self, other):
         if not isinstance(other, Vector2):
             raise TypeError("Unsupported operand for - expected Vector2")
-        return Vector2(self.x - other.x, self.y - other.y)
+        return Vector2(self._x - other._x, self._y - other._y)
 
     def __mul__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for * expected number")
-        return Vector2(self.x * other, self.y * other)
+        return Vector2(self._x * other, self._y * other)
 
     def __truediv__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for / expected number")
-        return Vector2(self.x / other, self.y / other)
+        return Vector2(self._x / other, self._y / other)
 
 
 class Vector3:
@@ -960,22 +1282,22 @@ class Vector3:
     def __add__(self, other):
         if not isinstance(other, Vector3):
             raise TypeError("Unsupported operand for + expected Vector3")
-        return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
+        return Vector3(self._x + other._x, self._y + other._y, self._z + other._z)
 
     def __sub__(self, other):
         if not isinstance(other, Vector3):
             raise TypeError("Unsupported operand for - expected Vector3")
-        return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
+        return Vector3(self._x - other._x, self._y - other._y, self._z - other._z)
 
     def __mul__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for * expected number")
-        return Vector3(self.x * other, self.y * other, self.z * other)
+        return Vector3(self._x * other, self._y * other, self._z * other)
 
     def __truediv__(self, other):
         if not isinstance(other, (int, float)):
             raise TypeError("Unsupported operand for / expected number")
-        return Vector3(self.x / other, self.y / other, self.z / other)
+        return Vector3(self._x / other, self._y / other, self._z / other)
 
 
 class Position(Vector3):
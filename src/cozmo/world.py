@@ -55,6 +55,7 @@ __all__ = ['EvtNewCameraImage',
 
 import asyncio
 import collections
+import threading
 import time
 
 from . import logger
@@ -457,18 +458,27 @@ class World(event.Dispatcher):
 
     def _recv_msg_memory_map_message(self, evt, *, msg):
         if self._pending_nav_memory_map is not None:
+            add_quad = self._pending_nav_memory_map._add_quad
             for quad in msg.quadInfos:
-                self._pending_nav_memory_map._add_quad(quad.content, quad.depth)
+                add_quad(quad.content, quad.depth)
         else:
             logger.error("NavMemoryMap message without begin - ignoring")
 
     def _recv_msg_memory_map_message_end(self, evt, *, msg):
         if self._pending_nav_memory_map is not None:
             # The pending map is now the latest complete map
+            previous_map = self._nav_memory_map
             self._nav_memory_map = self._pending_nav_memory_map
             self._pending_nav_memory_map = None
             self.dispatch_event(nav_memory_map.EvtNewNavMemoryMap,
                                 nav_memory_map=self._nav_memory_map)
+
+            changed_nodes = self._nav_memory_map.changed_since(previous_map)
+            if changed_nodes:
+                self.dispatch_event(nav_memory_map.EvtNavMemoryMapChanged,
+                                    nav_memory_map=self._nav_memory_map,
+                                    previous_nav_memory_map=previous_map,
+                                    changed_nodes=changed_nodes)
         else:
             logger.error("NavMemoryMap end without begin - ignoring")
 
@@ -489,9 +499,10 @@ class World(event.Dispatcher):
     def recv_evt_action_completed(self, evt, *, action, **kw):
         self._active_action = None
 
-    def recv_evt_new_raw_camera_image(self, evt, *, image, **kw):
+    def recv_evt_new_raw_camera_image(self, evt, *, image, frame=None, **kw):
         self._last_image_number += 1
-        processed_image = CameraImage(image, self.image_annotator, self._last_image_number)
+        processed_image = CameraImage(image, self.image_annotator, self._last_image_number,
+                                      frame=frame)
         self.latest_image = processed_image
         self.dispatch_event(EvtNewCameraImage, image=processed_image)
 
@@ -1087,6 +1098,11 @@ class World(event.Dispatcher):
         a map has been received. The memory map provides a quad-tree map of
         where Cozmo thinks there are objects, and where Cozmo thinks it is safe
         to drive.
+
+        Each map received dispatches a
+        :class:`~cozmo.nav_memory_map.EvtNewNavMemoryMap`, followed by a
+        :class:`~cozmo.nav_memory_map.EvtNavMemoryMapChanged` listing the
+        regions that differ from the previous map, if any.
         
         Args:
             frequency_s (float): number of seconds between each update being sent.
@@ -1102,10 +1118,27 @@ class CameraImage:
     This wraps a raw image and provides an :meth:`annotate_image` method
     that can resize and add dynamic annotations to the image, such as
     marking up the location of objects, faces and pets.
+
+    If the image was received with :attr:`cozmo.camera.Camera.lazy_decoding_enabled`
+    set, then it's only decoded the first time :attr:`raw_image` is accessed.
+
+    Annotated images are cached, so that several viewers showing the same
+    image at the same size only annotate it once.  Each caller still gets
+    its own copy.
     '''
-    def __init__(self, raw_image, image_annotator, image_number=0):
-        #: :class:`PIL.Image.Image`: the raw unprocessed image from the camera
-        self.raw_image = raw_image
+    # The maximum number of differently sized annotated images kept
+    _MAX_ANNOTATED_IMAGES = 4
+
+    def __init__(self, raw_image, image_annotator, image_number=0, frame=None):
+        self._raw_image = raw_image
+        # Maps (scale, fit_size, resample_mode) to (annotation state, image),
+        # least recently used first
+        self._annotated_images = collections.OrderedDict()
+        self._annotated_images_lock = threading.Lock()
+
+        #: :class:`cozmo.camera.CameraFrame`: The encoded frame the image
+        #: was received as, or None.
+        self.frame = frame
 
         #: :class:`cozmo.annotate.ImageAnnotator`: the image annotation object
         self.image_annotator = image_annotator
@@ -1116,6 +1149,30 @@ class CameraImage:
         #: float: The time the image was received and processed by the SDK
         self.image_recv_time = time.time()
 
+    @property
+    def raw_image(self):
+        ''':class:`PIL.Image.Image`: the raw unprocessed image from the camera'''
+        if self._raw_image is None and self.frame is not None:
+            self._raw_image = self.frame.image
+        return self._raw_image
+
+    @raw_image.setter
+    def raw_image(self, raw_image):
+        self._raw_image = raw_image
+
+    @property
+    def jpeg_bytes(self):
+        '''bytes: The JPEG encoded image as received from the robot, or None.
+
+        Accessing this doesn't require the image to be decoded, so it's the
+        cheapest way to forward images elsewhere (e.g. over HTTP).  Color
+        images are sent at half width though, so the JPEG data of a color
+        image is half the width of :attr:`raw_image`.
+        '''
+        if self.frame is None:
+            return None
+        return self.frame.jpeg_bytes
+
     def annotate_image(self, scale=None, fit_size=None, resample_mode=annotate.RESAMPLE_MODE_NEAREST):
         '''Adds any enabled annotations to the image.
 
@@ -1135,7 +1192,30 @@ class CameraImage:
         Returns:
             :class:`PIL.Image.Image`
         '''
-        return self.image_annotator.annotate_image(self.raw_image,
-                                                   scale=scale,
-                                                   fit_size=fit_size,
-                                                   resample_mode=resample_mode)
+        if scale is None and fit_size is None:
+            # Annotate a copy, leaving the raw image untouched
+            scale = 1
+        key = (scale, fit_size, resample_mode)
+        annotator = self.image_annotator
+        # Holding the lock while annotating means concurrent callers from
+        # other threads wait for the result, rather than repeating the work.
+        with self._annotated_images_lock:
+            state = annotator._annotation_state()
+            cached = self._annotated_images.get(key)
+            if state is not None and cached is not None and cached[0] == state:
+                self._annotated_images.move_to_end(key)
+                annotator._count_annotated_image(hit=True)
+                return cached[1].copy()
+
+            annotator._count_annotated_image(hit=False)
+            image = annotator.annotate_image(self.raw_image,
+                                             scale=scale,
+                                             fit_size=fit_size,
+                                             resample_mode=resample_mode)
+            if state is not None:
+                # Cache a copy, so the caller is free to modify the image
+                self._annotated_images[key] = (state, image.copy())
+                self._annotated_images.move_to_end(key)
+                if len(self._annotated_images) > self._MAX_ANNOTATED_IMAGES:
+                    self._annotated_images.popitem(last=False)
+            return image
@@ -0,0 +1,184 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from cozmo import annotate
+from cozmo import util
+from cozmo import world
+
+
+class Box:
+    def __init__(self, box, name):
+        self.last_observed_image_box = box
+        self.descriptive_name = name
+
+
+class World:
+    def __init__(self):
+        self.visible_objects = []
+        self.visible_faces = []
+        self.visible_pets = []
+
+
+class UncachedTextAnnotator(annotate.TextAnnotator):
+    def dependency_key(self):
+        return None
+
+
+class ShiftedObjectAnnotator(annotate.ObjectAnnotator):
+    def apply(self, image, scale):
+        self.shift += 10
+        for obj in self.world.visible_objects:
+            box = obj.last_observed_image_box
+            annotate.add_img_box_to_image(image, util.ImageBox(box.top_left_x + self.shift,
+                    box.top_left_y, box.width, box.height), 'red')
+
+
+class ImageAnnotatorTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.world = World()
+        self.world.visible_objects = [Box(util.ImageBox(20, 30, 60, 60), 'Cube')]
+        self.annotator = annotate.ImageAnnotator(self.world, loop=self.loop)
+        self.annotator.add_static_text('text', 'Hello', position=annotate.BOTTOM_RIGHT)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def annotate(self, **kw):
+        # annotate_image draws on the image passed in, unless it's resized
+        image = Image.new('RGB', (320, 240), (40, 80, 120))
+        return np.asarray(self.annotator.annotate_image(image, **kw))
+
+    def annotate_uncached(self, **kw):
+        # Draws every annotation directly onto the image, bypassing the overlays
+        size = self.annotate(**kw).shape[1::-1]
+        image = Image.new('RGB', size, (40, 80, 120))
+        for an in self.annotator._sorted_annotators:
+            an.apply(image, size[0] / 320)
+        return np.asarray(image)
+
+    def test_matches_drawing_directly(self):
+        for kw in ({}, {'scale': 2}, {'fit_size': (160, 160)}):
+            np.testing.assert_array_equal(self.annotate(**kw), self.annotate_uncached(**kw))
+
+    def test_overlay_reused_until_key_changes(self):
+        first = self.annotate()
+        np.testing.assert_array_equal(self.annotate(), first)
+        self.assertEqual((self.annotator.overlay_hit_count, self.annotator.overlay_miss_count), (1, 1))
+
+        self.world.visible_objects[0].last_observed_image_box = util.ImageBox(100, 30, 60, 60)
+        moved = self.annotate()
+        self.assertEqual(self.annotator.overlay_miss_count, 2)
+        self.assertFalse(np.array_equal(first, moved))
+
+        # a different size needs its own overlay
+        self.annotate(scale=2)
+        self.assertEqual(self.annotator.overlay_miss_count, 3)
+
+        # while the first size's overlay is kept
+        np.testing.assert_array_equal(self.annotate(), moved)
+        self.assertEqual((self.annotator.overlay_hit_count, self.annotator.overlay_miss_count), (2, 3))
+
+    def test_uncacheable_annotator_keeps_drawing_order(self):
+        # Drawn between the higher priority objects and the lower priority text
+        self.annotator.add_annotator('middle', UncachedTextAnnotator(
+            self.annotator, annotate.ImageText('Middle', position=annotate.TOP_LEFT)))
+        self.annotator.get_annotator('middle').priority = 75
+        self.annotator._sort_annotators()
+        expected = self.annotate_uncached()
+        for _ in range(2):
+            np.testing.assert_array_equal(self.annotate(), expected)
+        # objects, then text, each in their own overlay
+        self.assertEqual((self.annotator.overlay_hit_count, self.annotator.overlay_miss_count), (4, 2))
+
+    def test_overridden_apply_not_cached(self):
+        self.annotator.remove_annotator('objects')
+        shifted = ShiftedObjectAnnotator(self.annotator)
+        shifted.shift = 0
+        self.annotator.add_annotator('objects', shifted)
+        self.assertIsNone(shifted.dependency_key())
+        self.assertFalse(np.array_equal(self.annotate(), self.annotate()))
+
+    def test_object_colors_keyed_by_value(self):
+        first = annotate.ObjectAnnotator(self.annotator, object_colors={'default': 'blue'})
+        second = annotate.ObjectAnnotator(self.annotator, object_colors={'default': 'blue'})
+        self.assertEqual(first.dependency_key(), second.dependency_key())
+        second.object_colors['default'] = 'red'
+        self.assertNotEqual(first.dependency_key(), second.dependency_key())
+
+    def test_disabled_annotations(self):
+        self.annotator.annotation_enabled = False
+        self.assertTrue((self.annotate() == (40, 80, 120)).all())
+        self.assertEqual(self.annotator.overlay_miss_count, 0)
+
+
+class CameraImageTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.world = World()
+        self.world.visible_objects = [Box(util.ImageBox(20, 30, 60, 60), 'Cube')]
+        self.annotator = annotate.ImageAnnotator(self.world, loop=self.loop)
+        self.raw_image = Image.new('RGB', (320, 240), (40, 80, 120))
+        self.image = world.CameraImage(self.raw_image, self.annotator)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def counts(self):
+        return self.annotator.annotated_image_hit_count, self.annotator.annotated_image_miss_count
+
+    def test_annotated_images_reused(self):
+        scaled = self.image.annotate_image(scale=2)
+        scaled_again = self.image.annotate_image(scale=2)
+        self.assertIsNot(scaled_again, scaled)
+        np.testing.assert_array_equal(np.asarray(scaled_again), np.asarray(scaled))
+        self.image.annotate_image(fit_size=(160, 160))
+        self.assertEqual(self.image.annotate_image(fit_size=(160, 160)).size, (160, 120))
+        self.assertEqual(self.counts(), (2, 2))
+
+        # each caller may modify its own image
+        scaled.paste((255, 0, 0), (0, 0, 640, 480))
+        np.testing.assert_array_equal(np.asarray(self.image.annotate_image(scale=2)), np.asarray(scaled_again))
+
+        # the raw image is never drawn on
+        unscaled = self.image.annotate_image()
+        self.assertIsNot(unscaled, self.raw_image)
+        self.assertEqual(self.raw_image.getcolors(), [(320 * 240, (40, 80, 120))])
+
+    def test_annotations_changed(self):
+        scaled = self.image.annotate_image(scale=2)
+        self.world.visible_objects[0].last_observed_image_box = util.ImageBox(100, 30, 60, 60)
+        self.assertIsNot(self.image.annotate_image(scale=2), scaled)
+        self.annotator.disable_annotator('objects')
+        self.assertIsNot(self.image.annotate_image(scale=2), scaled)
+        self.assertEqual(self.counts(), (0, 3))
+
+    def test_uncacheable_annotator(self):
+        self.annotator.add_annotator('text', UncachedTextAnnotator(self.annotator, annotate.ImageText('Hi')))
+        self.assertIsNot(self.image.annotate_image(scale=2), self.image.annotate_image(scale=2))
+        self.assertEqual(self.counts(), (0, 2))
+
+    def test_bounded(self):
+        for width in range(100, 110):
+            self.image.annotate_image(fit_size=(width, 100))
+        self.assertEqual(len(self.image._annotated_images), world.CameraImage._MAX_ANNOTATED_IMAGES)
+        self.image.annotate_image(fit_size=(109, 100))
+        self.image.annotate_image(fit_size=(100, 100))
+        self.assertEqual(self.counts(), (1, 11))
@@ -0,0 +1,309 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import concurrent.futures
+import io
+import threading
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from cozmo import camera
+from cozmo._clad import _clad_to_game_cozmo
+
+
+def reference_mini_to_jpeg_helper(mini, width, height, header):
+    # The original per-byte implementation, kept to check the vectorized
+    # version produces identical output.
+    bufferIn = mini.tolist()
+    currLen = len(mini)
+    header = np.frombuffer(header, dtype=np.uint8)
+    headerLength = len(header)
+    bufferOut = np.array([0] * (currLen*2 + headerLength), dtype=np.uint8)
+    for i in range(headerLength):
+        bufferOut[i] = header[i]
+    bufferOut[0x5e] = height >> 8
+    bufferOut[0x5f] = height & 0xff
+    bufferOut[0x60] = width  >> 8
+    bufferOut[0x61] = width  & 0xff
+    while (bufferIn[currLen-1] == 0xff):
+        currLen -= 1
+    off = headerLength
+    for i in range(currLen-1):
+        bufferOut[off] = bufferIn[i+1]
+        off += 1
+        if (bufferIn[i+1] == 0xff):
+            bufferOut[off] = 0
+            off += 1
+    bufferOut[off] = 0xff
+    off += 1
+    bufferOut[off] = 0xD9
+    return bufferOut
+
+
+def make_mini(size, is_color, seed, trailing_padding=3):
+    rng = np.random.RandomState(seed)
+    # weight towards 0xFF so byte stuffing is well exercised
+    data = rng.choice([0x00, 0x12, 0xFE, 0xFF], size=size).astype(np.uint8)
+    data[0] = 1 if is_color else 0
+    data[-1] = 0x42
+    return np.concatenate([data, np.full(trailing_padding, 0xff, dtype=np.uint8)])
+
+
+class MiniToJpegTests(unittest.TestCase):
+    def check(self, mini, width, height, header):
+        expected = reference_mini_to_jpeg_helper(mini, width, height, header)
+        actual = camera._mini_to_jpeg_helper(mini, width, height, header)
+        self.assertEqual(actual.dtype, np.uint8)
+        self.assertEqual(actual.tobytes(), expected.tobytes())
+
+    def test_gray_matches_reference(self):
+        for seed in range(5):
+            mini = make_mini(3000, False, seed)
+            self.check(mini, 320, 240, camera._MINIGRAY_JPEG_HEADER)
+
+    def test_color_matches_reference(self):
+        for seed in range(5):
+            mini = make_mini(5000, True, seed)
+            self.check(mini, 160, 240, camera._MINICOLOR_JPEG_HEADER)
+
+    def test_no_trailing_padding(self):
+        mini = make_mini(100, False, 0, trailing_padding=0)
+        self.check(mini, 320, 240, camera._MINIGRAY_JPEG_HEADER)
+
+    def test_wrappers(self):
+        mini = make_mini(500, False, 1)
+        self.assertEqual(camera._minigray_to_jpeg(mini, 320, 240).tobytes(),
+                         reference_mini_to_jpeg_helper(mini, 320, 240, camera._MINIGRAY_JPEG_HEADER).tobytes())
+        mini = make_mini(500, True, 2)
+        self.assertEqual(camera._minicolor_to_jpeg(mini, 160, 240).tobytes(),
+                         reference_mini_to_jpeg_helper(mini, 160, 240, camera._MINICOLOR_JPEG_HEADER).tobytes())
+
+
+
+class FakeConn:
+    def send_msg(self, msg):
+        pass
+
+
+class FakeRobot:
+    conn = FakeConn()
+
+
+class ImageMetadata:
+    imageEncoding = _clad_to_game_cozmo.ImageEncoding.JPEGGray
+    resolution = camera._clad_res.QQQVGA
+
+
+def make_jpeg_frame(gray_level):
+    buf = io.BytesIO()
+    Image.new('L', camera.RESOLUTIONS[ImageMetadata.resolution], gray_level).save(buf, 'JPEG')
+    return np.frombuffer(buf.getvalue(), dtype=np.uint8)
+
+
+class GatedExecutor(concurrent.futures.ThreadPoolExecutor):
+    # Holds every job until the gate is opened, so tests can control
+    # how far the workers fall behind.
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.gate = threading.Event()
+
+    def submit(self, fn, *args):
+        def gated():
+            self.gate.wait()
+            return fn(*args)
+        return super().submit(gated)
+
+
+class BackgroundDecodeTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.camera = camera.Camera(FakeRobot(), loop=self.loop)
+        self.received = []
+        self.camera.add_event_handler(camera.EvtNewRawCameraImage,
+            lambda evt, image, **kw: self.received.append(image.getpixel((0, 0))[0]))
+
+    def feed(self, gray_level):
+        data = make_jpeg_frame(gray_level)
+        self.camera._partial_data = data
+        self.camera._partial_size = len(data)
+        self.camera._partial_metadata = ImageMetadata
+        self.camera._process_completed_image()
+
+    def run_until_received(self, count):
+        async def wait():
+            while len(self.received) < count:
+                await asyncio.sleep(0.01)
+        self.loop.run_until_complete(asyncio.wait_for(wait(), 5))
+
+    def test_decodes_in_order(self):
+        self.camera.enable_background_decoding(max_workers=4, max_pending=10)
+        self.addCleanup(self.camera.disable_background_decoding)
+        self.assertTrue(self.camera.is_background_decoding_enabled)
+        levels = [10, 60, 110, 160, 210]
+        for level in levels:
+            self.feed(level)
+        self.run_until_received(len(levels))
+        for expected, actual in zip(levels, self.received):
+            self.assertAlmostEqual(expected, actual, delta=3)
+        self.assertEqual(self.camera.decode_drop_count, 0)
+
+    def test_drops_oldest_when_behind(self):
+        executor = GatedExecutor()
+        self.addCleanup(executor.shutdown)
+        self.camera.enable_background_decoding(max_pending=2, executor=executor)
+        for level in [10, 60, 110, 160]:
+            self.feed(level)
+        self.assertEqual(self.camera.decode_drop_count, 2)
+        executor.gate.set()
+        self.run_until_received(2)
+        self.assertAlmostEqual(self.received[0], 110, delta=3)
+        self.assertAlmostEqual(self.received[1], 160, delta=3)
+
+    def test_disable_reverts_to_inline(self):
+        self.camera.enable_background_decoding()
+        self.camera.disable_background_decoding()
+        self.assertFalse(self.camera.is_background_decoding_enabled)
+        self.feed(100)
+        self.run_until_received(1)
+
+
+class LazyFrameTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.camera = camera.Camera(FakeRobot(), loop=self.loop)
+        self.events = []
+        self.camera.add_event_handler(camera.EvtNewRawCameraImage,
+            lambda evt, **kw: self.events.append(evt))
+
+    def test_frame_trims_padding(self):
+        jpeg = make_jpeg_frame(50)
+        padded = np.concatenate([jpeg, np.zeros(100, dtype=np.uint8)])
+        frame = camera.CameraFrame(padded, False, camera.RESOLUTIONS[ImageMetadata.resolution])
+        self.assertEqual(frame.jpeg_bytes, jpeg.tobytes())
+        self.assertFalse(frame.is_decoded)
+
+    def test_lazy_decoding(self):
+        self.camera.lazy_decoding_enabled = True
+        jpeg = make_jpeg_frame(80)
+        self.camera._partial_data = jpeg
+        self.camera._partial_size = len(jpeg)
+        self.camera._partial_metadata = ImageMetadata
+        self.camera._process_completed_image()
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+        evt = self.events[0]
+        self.assertIsNone(evt.image)
+        self.assertFalse(evt.frame.is_decoded)
+        self.assertEqual(evt.frame.jpeg_bytes, jpeg.tobytes())
+
+        image = evt.frame.image
+        self.assertTrue(evt.frame.is_decoded)
+        self.assertIs(evt.frame.image, image)
+        self.assertEqual(image.size, camera.RESOLUTIONS[ImageMetadata.resolution])
+        self.assertEqual(evt.frame.array.shape, (image.size[1], image.size[0], 3))
+
+    def test_eager_decoding_by_default(self):
+        jpeg = make_jpeg_frame(80)
+        self.camera._partial_data = jpeg
+        self.camera._partial_size = len(jpeg)
+        self.camera._partial_metadata = ImageMetadata
+        self.camera._process_completed_image()
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+        evt = self.events[0]
+        self.assertTrue(evt.frame.is_decoded)
+        self.assertIs(evt.image, evt.frame.image)
+
+    def test_mini_gray_frame_decodes(self):
+        frame = camera._load_frame(make_mini(2000, False, 3),
+                                   _clad_to_game_cozmo.ImageEncoding.JPEGMinimizedGray,
+                                   camera._clad_res.QVGA, decode=False)
+        self.assertTrue(frame.jpeg_bytes.endswith(b'\xff\xd9'))
+
+
+class ImageChunk:
+    def __init__(self, image_id, chunk_id, chunk_count, data):
+        self.imageId = image_id
+        self.chunkId = chunk_id
+        self.imageChunkCount = chunk_count
+        self.imageEncoding = ImageMetadata.imageEncoding
+        self.resolution = ImageMetadata.resolution
+        self.data = data
+
+
+def make_chunks(image_id, gray_level, chunk_size=300):
+    jpeg = make_jpeg_frame(gray_level).tolist()
+    pieces = [jpeg[i:i+chunk_size] for i in range(0, len(jpeg), chunk_size)]
+    return [ImageChunk(image_id, i, len(pieces), piece) for i, piece in enumerate(pieces)]
+
+
+class ChunkReassemblyTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.camera = camera.Camera(FakeRobot(), loop=self.loop)
+        self.received = []
+        self.camera.add_event_handler(camera.EvtNewRawCameraImage,
+            lambda evt, image, **kw: self.received.append(image.getpixel((0, 0))[0]))
+
+    def feed(self, chunks):
+        for chunk in chunks:
+            self.camera._recv_msg_image_chunk(None, msg=chunk)
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+    def test_buffers_recycled(self):
+        self.feed(make_chunks(1, 40))
+        self.feed(make_chunks(2, 200))
+        self.feed(make_chunks(3, 120))
+        self.assertEqual(len(self.received), 3)
+        self.assertAlmostEqual(self.received[0], 40, delta=3)
+        self.assertAlmostEqual(self.received[1], 200, delta=3)
+        self.assertAlmostEqual(self.received[2], 120, delta=3)
+        self.assertEqual(self.camera.buffer_pool_miss_count, 1)
+        self.assertEqual(self.camera.buffer_pool_hit_count, 2)
+        self.assertEqual(self.camera.partial_frame_drop_count, 0)
+
+    def test_missing_chunk_dropped(self):
+        chunks = make_chunks(1, 40)
+        del chunks[1]
+        self.feed(chunks)
+        self.feed(make_chunks(2, 200))
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.camera.partial_frame_drop_count, 1)
+        # the discarded image's buffer is reused
+        self.assertEqual(self.camera.buffer_pool_miss_count, 1)
+
+    def test_lost_final_chunk_dropped(self):
+        self.feed(make_chunks(1, 40)[:-1])
+        self.feed(make_chunks(2, 200))
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.camera.partial_frame_drop_count, 1)
+
+    def test_background_decode_recycles_buffers(self):
+        self.camera.enable_background_decoding(max_pending=4)
+        self.addCleanup(self.camera.disable_background_decoding)
+        for image_id in range(3):
+            self.feed(make_chunks(image_id, 100))
+
+        async def wait():
+            while len(self.received) < 3:
+                await asyncio.sleep(0.01)
+        self.loop.run_until_complete(asyncio.wait_for(wait(), 5))
+        self.feed(make_chunks(4, 100))
+        self.assertGreaterEqual(self.camera.buffer_pool_hit_count, 1)
@@ -0,0 +1,81 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+import unittest
+
+from cozmo import clad_protocol
+from cozmo._clad import _clad_to_game_cozmo, _clad_to_game_iface
+
+
+def _frame(**kw):
+    msg_buf = _clad_to_game_iface.MessageEngineToGame(**kw).pack()
+    return struct.pack('H', len(msg_buf)) + msg_buf
+
+
+class RecordingProtocol(clad_protocol.CLADProtocol):
+    clad_decode_union = _clad_to_game_iface.MessageEngineToGame
+
+    def __init__(self):
+        super().__init__()
+        self.received = []
+
+    def msg_received(self, msg):
+        self.received.append(msg)
+
+
+class CLADProtocolTests(unittest.TestCase):
+    def setUp(self):
+        self.proto = RecordingProtocol()
+        self.state_frame = _frame(RobotState=_clad_to_game_iface.RobotState(headAngle_rad=0.5))
+        self.chunk_frame = _frame(ImageChunk=_clad_to_game_cozmo.ImageChunk(chunkId=3, data=[7] * 600))
+
+    def test_drains_burst_in_one_call(self):
+        self.proto.data_received((self.state_frame + self.chunk_frame) * 50)
+        self.assertEqual(len(self.proto.received), 100)
+        self.assertEqual(self.proto.received[0].tag_name, 'RobotState')
+        self.assertAlmostEqual(self.proto.received[0]._data.headAngle_rad, 0.5)
+        self.assertEqual(self.proto.received[1].tag_name, 'ImageChunk')
+        self.assertEqual(list(self.proto.received[1]._data.data), [7] * 600)
+        self.assertEqual(len(self.proto._buf), 0)
+        self.assertEqual(self.proto._buf_offset, 0)
+
+    def test_partial_frames(self):
+        data = self.state_frame + self.chunk_frame
+        for i in range(len(data)):
+            self.proto.data_received(data[i:i+1])
+        self.assertEqual([m.tag_name for m in self.proto.received], ['RobotState', 'ImageChunk'])
+
+    def test_trailing_partial_frame_kept(self):
+        self.proto.data_received(self.state_frame + self.chunk_frame[:10])
+        self.assertEqual(len(self.proto.received), 1)
+        self.proto.data_received(self.chunk_frame[10:])
+        self.assertEqual(len(self.proto.received), 2)
+        self.assertEqual(len(self.proto._buf), 0)
+
+    def test_compacts_consumed_head(self):
+        burst = self.chunk_frame * (clad_protocol._COMPACT_THRESHOLD // len(self.chunk_frame) + 1)
+        self.proto.data_received(burst + self.state_frame[:5])
+        self.assertEqual(self.proto._buf_offset, 0)
+        self.assertEqual(bytes(self.proto._buf), self.state_frame[:5])
+
+    def test_abort_stops_decoding(self):
+        class AbortingProtocol(RecordingProtocol):
+            def msg_received(self, msg):
+                super().msg_received(msg)
+                self._abort_connection = True
+
+        proto = AbortingProtocol()
+        proto.data_received(self.state_frame * 3)
+        self.assertEqual(len(proto.received), 1)
@@ -254,6 +254,194 @@ class EventTests(test_utils.TestCase):
         # future should of been removed from the handler list
         self.assertEqual(len(recv._dispatch_handlers['EvtOne']), 0)
 
+    def test_dispatch_handler_cache_invalidated(self):
+        recv = DispatchTest(loop=self.loop)
+        calls = []
+        def handler_one(evt, **kw):
+            calls.append('one')
+        def handler_child(evt, **kw):
+            calls.append('child')
+
+        recv.add_event_handler(self.evt_one, handler_one)
+        recv.dispatch_event(self.evt_child1)
+        test_utils.run_briefly(self.loop)
+        self.assertEqual(calls, ['one'])
+
+        # adding a handler must be picked up by subsequent dispatches
+        recv.add_event_handler(self.evt_child1, handler_child)
+        recv.dispatch_event(self.evt_child1)
+        test_utils.run_briefly(self.loop)
+        self.assertEqual(sorted(calls[1:]), ['child', 'one'])
+
+        # as must removing one
+        recv.remove_event_handler(self.evt_one, handler_one)
+        del calls[:]
+        recv.dispatch_event(self.evt_child1)
+        test_utils.run_briefly(self.loop)
+        self.assertEqual(calls, ['child'])
+
+    def test_dispatch_obj_plan_per_class(self):
+        class CaptureOne:
+            def recv_evt_one(self, evt, **kw):
+                return 'one'
+        class CaptureDefault:
+            def _recv_default_handler(self, evt, **kw):
+                return 'default'
+
+        ev = self.evt_child1(param1=1)
+        self.assertEqual(ev._dispatch_to_obj(CaptureOne()), 'one')
+        self.assertEqual(ev._dispatch_to_obj(CaptureDefault()), 'default')
+        self.assertEqual(ev._dispatch_to_obj(CaptureOne()), 'one')
+        self.assertIsNone(ev._dispatch_to_obj(CaptureDefault(), fallback_to_default=False))
+
+    def test_dispatch_obj_instance_handler(self):
+        class Capture:
+            pass
+
+        ev = self.evt_child1(param1=1)
+        self.assertIsNone(ev._dispatch_to_obj(Capture()))
+        capture = Capture()
+        capture.recv_evt_one = lambda evt, **kw: 'instance'
+        self.assertEqual(ev._dispatch_to_obj(capture), 'instance')
+        capture = Capture()
+        capture._recv_default_handler = lambda evt, **kw: 'default'
+        self.assertEqual(ev._dispatch_to_obj(capture), 'default')
+
+    def test_dispatch_sync_inline(self):
+        # events with only synchronous handlers are dispatched immediately
+        recv = EventReceiver(loop=self.loop)
+        fut = recv.dispatch_event(self.evt_one, param1=False, param2=123)
+        self.assertEqual(recv._result_evt_one.param2, 123)
+        self.assertTrue(fut.done())
+        self.assertIsNone(self.loop.run_until_complete(fut))
+
+    def test_dispatch_async_handler_awaitable(self):
+        recv = EventReceiver(loop=self.loop)
+        fut = recv.dispatch_event(self.evt_two, param1=False, param2=123)
+        self.assertFalse(fut.done())
+        self.loop.run_until_complete(fut)
+        self.assertEqual(recv._result_evt_two.param2, 123)
+
+    def test_dispatch_nested_order(self):
+        # events dispatched by a handler are delivered after the current
+        # event has finished dispatching, as they were when every dispatch
+        # was scheduled as a separate task.
+        calls = []
+        parent = DispatchTest(loop=self.loop)
+        child = DispatchTest(loop=self.loop, dispatch_parent=parent)
+        evt_two = self.evt_two
+        def on_one(evt, **kw):
+            calls.append('one')
+            child.dispatch_event(evt_two)
+        child.add_event_handler(self.evt_one, on_one)
+        parent.add_event_handler(self.evt_one, lambda evt, **kw: calls.append('parent one'))
+        parent.add_event_handler(self.evt_two, lambda evt, **kw: calls.append('parent two'))
+        child.dispatch_event(self.evt_one)
+        test_utils.run_briefly(self.loop)
+        self.assertEqual(calls, ['one', 'parent one', 'parent two'])
+
+    def test_dispatch_order_behind_async(self):
+        # a synchronous event must not be dispatched inline ahead of an
+        # earlier one still pending an async handler on the same dispatcher
+        calls = []
+        recv = DispatchTest(loop=self.loop)
+        async def async_two(evt, **kw):
+            calls.append('two')
+        recv.add_event_handler(self.evt_two, async_two)
+        recv.add_event_handler(self.evt_one, lambda evt, **kw: calls.append('one'))
+        recv.dispatch_event(self.evt_two)
+        fut = recv.dispatch_event(self.evt_one)
+        self.assertEqual(calls, [])
+        self.loop.run_until_complete(fut)
+        self.assertEqual(calls, ['two', 'one'])
+
+    def test_dispatch_handler_exception(self):
+        recv = DispatchTest(loop=self.loop)
+        def fail(evt, **kw):
+            raise ValueError('handler failed')
+        recv.add_event_handler(self.evt_one, fail)
+        fut = recv.dispatch_event(self.evt_one)
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(fut)
+
+    def test_stream_drop_oldest(self):
+        recv = DispatchTest(loop=self.loop)
+        stream = recv.stream(self.evt_one, maxlen=2)
+        for i in range(4):
+            recv.dispatch_event(self.evt_one, param2=i)
+        self.assertEqual(stream.dropped_count, 2)
+
+        async def consume():
+            return [(await stream.__anext__()).param2 for i in range(2)]
+        self.assertEqual(self.loop.run_until_complete(consume()), [2, 3])
+
+    def test_stream_coalesce(self):
+        recv = DispatchTest(loop=self.loop)
+        stream = recv.stream(self.evt_one, maxlen=2, overflow=event.OVERFLOW_COALESCE)
+        for i in range(4):
+            recv.dispatch_event(self.evt_one, param2=i)
+        stream.close()
+
+        async def consume():
+            return [evt.param2 async for evt in stream]
+        self.assertEqual(self.loop.run_until_complete(consume()), [0, 3])
+        self.assertEqual(stream.dropped_count, 2)
+        self.assertEqual(len(recv._dispatch_handlers[self.evt_one.event_name]), 0)
+
+    def test_stream_block(self):
+        recv = DispatchTest(loop=self.loop)
+        stream = recv.stream(self.evt_one, maxlen=1, overflow=event.OVERFLOW_BLOCK)
+        futs = [recv.dispatch_event(self.evt_one, param2=i) for i in range(3)]
+        test_utils.run_briefly(self.loop)
+        self.assertEqual(len(stream), 1)
+        self.assertFalse(futs[1].done())
+
+        async def consume():
+            return [(await stream.__anext__()).param2 for i in range(3)]
+        self.assertEqual(self.loop.run_until_complete(consume()), [0, 1, 2])
+        self.assertEqual(stream.dropped_count, 0)
+
+    def test_stream_filter(self):
+        recv = DispatchTest(loop=self.loop)
+        stream = recv.stream(event.Filter(self.evt_one, param2=2))
+        for i in range(4):
+            recv.dispatch_event(self.evt_one, param2=i)
+        self.assertEqual(len(stream), 1)
+
+    def test_stream_abort(self):
+        recv = DispatchTest(loop=self.loop)
+        stream = recv.stream(self.evt_one)
+
+        async def consume():
+            return await stream.__anext__()
+        task = self.loop.create_task(consume())
+        test_utils.run_briefly(self.loop)
+        recv._abort_event_futures(exceptions.SDKShutdown())
+        with self.assertRaises(exceptions.SDKShutdown):
+            self.loop.run_until_complete(task)
+
+    def test_stream_filter_abort(self):
+        event.active_dispatchers.clear()
+        recv = DispatchTest(loop=self.loop)
+        stream = recv.stream(event.Filter(self.evt_one, param2=2))
+
+        async def consume():
+            async for evt in stream:
+                pass
+        task = self.loop.create_task(consume())
+        test_utils.run_briefly(self.loop)
+        event._abort_futures(exceptions.SDKShutdown())
+        with self.assertRaises(exceptions.SDKShutdown):
+            self.loop.run_until_complete(task)
+        self.assertTrue(stream.closed)
+
+    def test_stream_invalid_args(self):
+        recv = DispatchTest(loop=self.loop)
+        with self.assertRaises(ValueError):
+            recv.stream(self.evt_one, maxlen=0)
+        with self.assertRaises(ValueError):
+            recv.stream(self.evt_one, overflow='nope')
+
     def test_dispatch_to_parent(self):
         recv_parent = EventReceiver(loop=self.loop)
         recv_child = EventReceiver(loop=self.loop, dispatch_parent=recv_parent)
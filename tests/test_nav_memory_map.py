@@ -0,0 +1,159 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+
+from cozmo import nav_memory_map
+from cozmo.nav_memory_map import NodeContentTypes
+
+
+def make_quads(rng, depth, min_depth=0):
+    '''Returns a random depth-first list of (content, depth) leaf quads.'''
+    if depth == min_depth or rng.random() < 0.3:
+        return [(rng.randrange(8), depth)]
+    quads = []
+    for i in range(4):
+        quads.extend(make_quads(rng, depth - 1, min_depth))
+    return quads
+
+
+def make_grid(quads, depth=4, size=160.0, center_x=10.0, center_y=-20.0):
+    grid = nav_memory_map.NavMemoryMapGrid(1, depth, size, center_x, center_y)
+    for content, quad_depth in quads:
+        grid._add_quad(content, quad_depth)
+    return grid
+
+
+def find_leaf(quads, root_depth, size, center_x, center_y, x, y):
+    '''Reference lookup: returns (content, depth, center_x, center_y) at x,y.'''
+    def build(depth, size, cx, cy):
+        content, quad_depth = remaining[0]
+        if quad_depth == depth:
+            remaining.pop(0)
+            return (content, depth, cx, cy, None)
+        offset = size * 0.25
+        children = [build(depth - 1, size * 0.5, cx + offset, cy + offset),
+                    build(depth - 1, size * 0.5, cx + offset, cy - offset),
+                    build(depth - 1, size * 0.5, cx - offset, cy + offset),
+                    build(depth - 1, size * 0.5, cx - offset, cy - offset)]
+        return (None, depth, cx, cy, children)
+
+    remaining = list(quads)
+    node = build(root_depth, size, center_x, center_y)
+    while node[4] is not None:
+        index = (2 if x < node[2] else 0) + (1 if y < node[3] else 0)
+        node = node[4][index]
+    return node[:4]
+
+
+class NavMemoryMapGridTests(unittest.TestCase):
+    def test_simple_tree(self):
+        # root split into 4, the last child split again
+        quads = [(1, 1), (2, 1), (3, 1), (4, 0), (5, 0), (6, 0), (7, 0)]
+        grid = make_grid(quads, depth=2, size=100.0, center_x=0.0, center_y=0.0)
+        self.assertEqual(grid.get_content(40, 40), NodeContentTypes.ClearOfObstacle)
+        self.assertEqual(grid.get_content(40, -40), NodeContentTypes.ClearOfCliff)
+        self.assertEqual(grid.get_content(-40, 40), NodeContentTypes.ObstacleCube)
+        self.assertEqual(grid.get_content(-10, -10), NodeContentTypes.ObstacleCharger)
+        self.assertEqual(grid.get_content(-40, -40), NodeContentTypes.VisionBorder)
+        self.assertEqual(grid.get_content(60, 0), NodeContentTypes.Unknown)
+        self.assertIsNone(grid.get_node(60, 0))
+
+        node = grid.get_node(-10, -10)
+        self.assertEqual(node.depth, 0)
+        self.assertEqual(node.size, 25.0)
+        self.assertEqual((node.center.x, node.center.y), (-12.5, -12.5))
+        self.assertTrue(node.contains_point(-1, -24))
+        self.assertIsNone(node.children)
+        self.assertEqual(node.parent, grid.root_node.children[3])
+        self.assertIsNone(grid.root_node.parent)
+        self.assertIsNone(grid.root_node.content)
+        self.assertEqual(grid.root_node.get_node(-10, -10), node)
+
+    def test_matches_recursive_lookup(self):
+        rng = random.Random(4)
+        quads = make_quads(rng, 4)
+        grid = make_grid(quads)
+        for i in range(500):
+            x = rng.uniform(-70, 90)
+            y = rng.uniform(-100, 60)
+            expected = find_leaf(quads, 4, 160.0, 10.0, -20.0, x, y)
+            node = grid.get_node(x, y)
+            self.assertEqual((node.content.id, node.depth, node.center.x, node.center.y), expected)
+
+    def test_quads_after_complete_ignored(self):
+        grid = make_grid([(1, 2)], depth=2)
+        grid._add_quad(3, 1)
+        self.assertEqual(len(grid._depth), 1)
+        self.assertEqual(grid.get_content(10, -20), NodeContentTypes.ClearOfObstacle)
+
+    def test_to_grid_matches_get_content(self):
+        rng = random.Random(7)
+        grid = make_grid(make_quads(rng, 4), size=160.0, center_x=10.0, center_y=-20.0)
+        raster = grid.to_grid(3.0)
+        self.assertEqual(raster.data.shape, (54, 54))
+        self.assertEqual(raster.extent, (-70.0, 92.0, -100.0, 62.0))
+        for row in range(raster.data.shape[0]):
+            for col in range(raster.data.shape[1]):
+                x, y = raster.index_to_world(row, col)
+                content = grid.get_content(x, y) if grid.contains_point(x, y) else None
+                expected = content.id if content is not None else 0
+                self.assertEqual(raster.data[row, col], expected)
+        self.assertEqual(raster.world_to_index(-68.5, 60.0), (53, 0))
+
+    def test_to_grid_content_map_and_cache(self):
+        grid = make_grid([(1, 1), (3, 1), (6, 1), (2, 1)], depth=2, size=100.0, center_x=0.0, center_y=0.0)
+        content_map = {NodeContentTypes.ObstacleCube: 255, NodeContentTypes.Cliff: 128}
+        raster = grid.to_grid(10.0, content_map=content_map)
+        self.assertEqual(raster.data[0, 0], 0)      # -x,-y: ClearOfCliff
+        self.assertEqual(raster.data[0, 9], 255)    # +x,-y: ObstacleCube
+        self.assertEqual(raster.data[9, 0], 128)    # -x,+y: Cliff
+        self.assertIs(grid.to_grid(10.0, content_map=dict(content_map)), raster)
+        self.assertIsNot(grid.to_grid(10.0), raster)
+        with self.assertRaises(ValueError):
+            raster.data[0, 0] = 1
+        with self.assertRaises(ValueError):
+            grid.to_grid(0)
+
+    def test_get_content_many(self):
+        rng = random.Random(11)
+        grid = make_grid(make_quads(rng, 4))
+        xs = [rng.uniform(-80, 100) for i in range(400)] + [10.0, 90.0, -70.0]
+        ys = [rng.uniform(-110, 70) for i in range(400)] + [-20.0, 60.0, -100.0]
+        expected = [grid.get_content(x, y).id for x, y in zip(xs, ys)]
+        self.assertEqual(grid.get_content_many(xs, ys).tolist(), expected)
+        self.assertEqual(grid.get_content_many([[10.0]], [[-20.0]]).shape, (1, 1))
+        with self.assertRaises(ValueError):
+            grid.get_content_many([1.0, 2.0], [1.0])
+
+    def test_changed_since(self):
+        quads = [(1, 1), (2, 1), (3, 1), (4, 0), (5, 0), (6, 0), (7, 0)]
+        previous = make_grid(quads, depth=2, size=100.0, center_x=0.0, center_y=0.0)
+        self.assertEqual(make_grid(quads, depth=2, size=100.0, center_x=0.0, center_y=0.0).changed_since(previous), [])
+
+        # content change in a leaf, and a split leaf
+        changed_quads = [(1, 1), (6, 1), (3, 0), (3, 0), (3, 0), (1, 0), (4, 0), (5, 0), (6, 0), (7, 0)]
+        grid = make_grid(changed_quads, depth=2, size=100.0, center_x=0.0, center_y=0.0)
+        changed = grid.changed_since(previous)
+        self.assertEqual(changed, [grid.root_node.children[1], grid.root_node.children[2]])
+        self.assertEqual(changed[0].content, NodeContentTypes.Cliff)
+
+        # a merged node
+        merged = make_grid([(1, 1), (2, 1), (3, 1), (4, 1)], depth=2, size=100.0, center_x=0.0, center_y=0.0)
+        self.assertEqual(merged.changed_since(previous), [merged.root_node.children[3]])
+
+        moved = make_grid(quads, depth=2, size=100.0, center_x=10.0, center_y=0.0)
+        self.assertEqual(moved.changed_since(previous), [moved.root_node])
+        self.assertEqual(moved.changed_since(None), [moved.root_node])
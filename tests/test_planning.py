@@ -0,0 +1,156 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import math
+import random
+import unittest
+
+from cozmo import nav_memory_map
+from cozmo import planning
+from cozmo import util
+from cozmo.nav_memory_map import NodeContentTypes
+
+
+CLEAR = NodeContentTypes.ClearOfCliff.id
+CUBE = NodeContentTypes.ObstacleCube.id
+
+
+def make_map(depth, size, content_at):
+    '''Builds a fully subdivided map, with content_at(x, y) giving each leaf's content id.'''
+    grid = nav_memory_map.NavMemoryMapGrid(1, depth, size, 0.0, 0.0)
+
+    def add(depth, size, x, y):
+        if depth == 0:
+            grid._add_quad(content_at(x, y), 0)
+            return
+        offset = size * 0.25
+        add(depth - 1, size * 0.5, x + offset, y + offset)
+        add(depth - 1, size * 0.5, x + offset, y - offset)
+        add(depth - 1, size * 0.5, x - offset, y + offset)
+        add(depth - 1, size * 0.5, x - offset, y - offset)
+
+    add(depth, size, 0.0, 0.0)
+    return grid
+
+
+def reference_cost(cost_grid, start, goal):
+    '''Dijkstra over the same 8-connected grid, without cutting corners.'''
+    height, width = cost_grid.shape
+    best = {start: 0.0}
+    queue = [(0.0, start)]
+    while queue:
+        dist, (row, col) = heapq.heappop(queue)
+        if (row, col) == goal:
+            return dist
+        if dist > best[(row, col)]:
+            continue
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                r, c = row + dr, col + dc
+                if (dr == 0 and dc == 0) or not (0 <= r < height and 0 <= c < width):
+                    continue
+                if math.isinf(cost_grid[r, c]):
+                    continue
+                if dr and dc and (math.isinf(cost_grid[row + dr, col]) or math.isinf(cost_grid[row, col + dc])):
+                    continue
+                step = math.hypot(dr, dc) * 0.5 * (cost_grid[row, col] + cost_grid[r, c])
+                if dist + step < best.get((r, c), float('inf')):
+                    best[(r, c)] = dist + step
+                    heapq.heappush(queue, (dist + step, (r, c)))
+    return None
+
+
+def pose(x, y, angle=0):
+    return util.pose_z_angle(x, y, 0, util.degrees(angle), origin_id=1)
+
+
+class GridPlannerTests(unittest.TestCase):
+    def test_straight_path(self):
+        planner = planning.GridPlanner(make_map(4, 160.0, lambda x, y: CLEAR), resolution_mm=10.0)
+        path = planner.plan(pose(-65, 5), pose(65, 5, 90))
+        self.assertEqual(len(path), 1)
+        self.assertAlmostEqual(path.cost, 130.0)
+        self.assertEqual((path.waypoints[0].position.x, path.waypoints[0].position.y), (65, 5))
+        self.assertAlmostEqual(path.waypoints[0].rotation.angle_z.degrees, 90)
+
+    def test_path_through_gap(self):
+        # a wall along x=0, with a gap at the top
+        wall = lambda x, y: CUBE if -10 < x < 10 and y < 50 else CLEAR
+        planner = planning.GridPlanner(make_map(4, 160.0, wall), resolution_mm=10.0)
+        path = planner.plan(pose(-45, -45), pose(45, -45))
+        self.assertTrue(all(y > 50 for x, y in path.points if -10 < x < 10))
+        cost_grid = planner.cost_grid
+        expected = reference_cost(cost_grid, (3, 3), (3, 12))
+        self.assertAlmostEqual(path.cost, expected * 10.0)
+        self.assertGreater(len(path), 1)
+        first = path.waypoints[0]
+        self.assertAlmostEqual(first.rotation.angle_z.radians,
+                               math.atan2(path.waypoints[1].position.y - first.position.y,
+                                          path.waypoints[1].position.x - first.position.x))
+
+    def test_unreachable_and_outside(self):
+        wall = lambda x, y: CUBE if -10 < x < 10 else CLEAR
+        planner = planning.GridPlanner(make_map(4, 160.0, wall), resolution_mm=10.0)
+        self.assertIsNone(planner.plan(pose(-45, -45), pose(45, -45)))
+        with self.assertRaises(ValueError):
+            planner.plan(pose(-45, -45), pose(100, 0))
+
+    def test_clearance(self):
+        cube = lambda x, y: CUBE if abs(x) < 10 and abs(y) < 10 else CLEAR
+        planner = planning.GridPlanner(make_map(4, 160.0, cube), resolution_mm=10.0, clearance_mm=20.0)
+        path = planner.plan(pose(-55, 5), pose(55, 5))
+        # every cell passed through is at least 20mm from the nearest cube cell center
+        self.assertTrue(all(math.hypot(max(abs(x) - 5, 0), max(abs(y) - 5, 0)) >= 20
+                            for x, y in path.points))
+
+    def test_costs_override(self):
+        unknown = NodeContentTypes.Unknown.id
+        band = lambda x, y: unknown if abs(x) < 20 and y < 60 else CLEAR
+        nav_map = make_map(4, 160.0, band)
+        cheap = planning.GridPlanner(nav_map, costs={NodeContentTypes.Unknown: 1.0})
+        self.assertAlmostEqual(cheap.plan(pose(-45, -45), pose(45, -45)).cost, 90.0)
+        blocked = planning.GridPlanner(nav_map, costs={NodeContentTypes.Unknown: None})
+        path = blocked.plan(pose(-45, -45), pose(45, -45))
+        self.assertTrue(all(y > 60 for x, y in path.points if abs(x) < 20))
+        with self.assertRaises(ValueError):
+            planning.GridPlanner(nav_map, costs={NodeContentTypes.Unknown: 0})
+
+    def test_incremental_matches_fresh_plan(self):
+        rng = random.Random(2)
+        blocked = set()
+
+        def content_at(x, y):
+            return CUBE if (int(x // 10), int(y // 10)) in blocked else CLEAR
+
+        planner = planning.GridPlanner(make_map(5, 320.0, content_at), resolution_mm=10.0)
+        start = pose(-150, -150)
+        goal = pose(150, 150)
+        for step in range(8):
+            path = planner.plan(start, goal)
+            fresh = planning.GridPlanner(make_map(5, 320.0, content_at), resolution_mm=10.0).plan(start, goal)
+            if fresh is None:
+                self.assertIsNone(path)
+            else:
+                self.assertAlmostEqual(path.cost, fresh.cost)
+
+            # block some cells on the current route, clear others, and move the start along
+            if path is not None:
+                start = pose(*path.points[3])
+                for x, y in rng.sample(path.points[4:-1], 3):
+                    blocked.add((int(x // 10), int(y // 10)))
+            for cell in rng.sample(sorted(blocked), len(blocked) // 4):
+                blocked.discard(cell)
+            changed = planner.update_map(make_map(5, 320.0, content_at))
+            self.assertGreater(changed, 0)
@@ -0,0 +1,154 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from cozmo import clad_protocol
+from cozmo import record
+from cozmo._clad import _clad_to_engine_iface, _clad_to_game_iface
+
+
+def robot_state(head_angle):
+    return _clad_to_game_iface.MessageEngineToGame(
+        RobotState=_clad_to_game_iface.RobotState(headAngle_rad=head_angle)).pack()
+
+
+class RecordingProtocol(clad_protocol.CLADProtocol):
+    clad_decode_union = _clad_to_game_iface.MessageEngineToGame
+    clad_encode_union = _clad_to_engine_iface.MessageGameToEngine
+
+    def __init__(self):
+        super().__init__()
+        self.received = []
+        self.lost = asyncio.Event()
+
+    def msg_received(self, msg):
+        self.received.append(msg._data.headAngle_rad)
+
+    def connection_lost(self, exc):
+        super().connection_lost(exc)
+        self.lost.set()
+
+
+class WriteTransport:
+    def __init__(self):
+        self.written = []
+
+    def is_closing(self):
+        return False
+
+    def write(self, data):
+        self.written.append(data)
+
+
+class RecordTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'test.cozrec')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_recording(self, path, count=50, **kw):
+        # one message every 0.1 seconds, alternating directions
+        recorder = record.Recorder(path, **kw)
+        for i in range(count):
+            recorder.write_frame(i % 2, robot_state(i), timestamp=i * 0.1)
+        return recorder
+
+    def test_round_trip(self):
+        self.write_recording(self.path).close()
+        with record.Recording(self.path) as recording:
+            frames = list(recording.frames())
+            self.assertEqual(len(frames), 50)
+            self.assertEqual([f[1] for f in frames[:4]], [record.FROM_ENGINE, record.TO_ENGINE] * 2)
+            self.assertEqual(frames[7][2], robot_state(7))
+            self.assertAlmostEqual(frames[7][0], 0.7, places=5)
+            self.assertAlmostEqual(recording.duration, 4.9, places=5)
+            # blocks are indexed once a second
+            self.assertEqual(len(recording._index_offsets), 5)
+
+            later = list(recording.frames(start=2.55, end=3.05))
+            self.assertEqual([f[2] for f in later], [robot_state(i) for i in range(26, 31)])
+
+    def test_unclosed_recording(self):
+        recorder = self.write_recording(self.path)
+        recorder.flush()
+        partial = os.path.join(self.dir, 'partial.cozrec')
+        shutil.copy(self.path, partial)
+        recorder.close()
+        # chop part of the last block off as well
+        with open(partial, 'ab') as f:
+            f.truncate(os.path.getsize(partial) - 10)
+
+        with record.Recording(partial) as recording:
+            frames = list(recording.frames())
+        self.assertEqual(len(frames), 40)
+
+    @unittest.skipIf(record.zstandard is None, 'zstandard not installed')
+    def test_compression(self):
+        self.write_recording(self.path, count=500, compression=record.COMPRESSION_ZSTD).close()
+        plain = os.path.join(self.dir, 'plain.cozrec')
+        self.write_recording(plain, count=500).close()
+        self.assertLess(os.path.getsize(self.path), os.path.getsize(plain) / 2)
+        with record.Recording(self.path) as recording:
+            self.assertEqual(recording.compression, record.COMPRESSION_ZSTD)
+            self.assertEqual([f[2] for f in recording.frames()], [robot_state(i) for i in range(500)])
+
+    def test_protocol_records_messages(self):
+        proto = RecordingProtocol()
+        proto.transport = WriteTransport()
+        proto._recorder = record.Recorder(self.path)
+        frames = b''.join(struct.pack('H', len(m)) + m for m in (robot_state(1), robot_state(2)))
+        proto.data_received(frames)
+        proto.send_msg(_clad_to_engine_iface.SetHeadAngle(angle_rad=0.5))
+        proto.connection_lost(None)
+        self.assertTrue(proto._recorder.closed)
+
+        with record.Recording(self.path) as recording:
+            frames = list(recording.frames())
+        self.assertEqual([(f[1], f[2]) for f in frames[:2]],
+                         [(record.FROM_ENGINE, robot_state(1)), (record.FROM_ENGINE, robot_state(2))])
+        self.assertEqual(frames[2][1], record.TO_ENGINE)
+        self.assertEqual(frames[2][2], proto.transport.written[1])
+
+    def test_replay(self):
+        self.write_recording(self.path, count=400).close()
+        loop = asyncio.new_event_loop()
+        try:
+            async def replay(speed, start=0.0):
+                proto = RecordingProtocol()
+                transport = record.ReplayTransport(loop, proto, record.Recording(self.path),
+                                                   speed=speed, start=start)
+                transport.start()
+                began = loop.time()
+                delivered = await transport.finished
+                await proto.lost.wait()
+                return proto, delivered, loop.time() - began
+
+            proto, delivered, elapsed = loop.run_until_complete(replay(None))
+            self.assertEqual(delivered, 200)
+            self.assertEqual(proto.received, [float(i) for i in range(0, 400, 2)])
+
+            # 1 second of messages at 10x
+            proto, delivered, elapsed = loop.run_until_complete(replay(10, start=38.95))
+            self.assertEqual(proto.received, [float(i) for i in range(390, 400, 2)])
+            self.assertGreaterEqual(elapsed, 0.08)
+        finally:
+            loop.close()
@@ -0,0 +1,153 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+from cozmo import robot
+from cozmo import telemetry
+from cozmo._clad import _clad_to_game_anki, _clad_to_game_iface
+
+
+class FakeConn:
+    def send_msg(self, msg):
+        pass
+
+
+def make_state(**kw):
+    return _clad_to_game_iface.RobotState(**kw)
+
+
+class RobotStateTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.robot = robot.Robot(FakeConn(), 1, True, loop=self.loop)
+        self.updates = []
+        self.robot.add_event_handler(robot.EvtRobotStateUpdated,
+                lambda evt, **kw: self.updates.append(evt.robot.head_angle.radians))
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_defaults_before_first_update(self):
+        self.assertIsNone(self.robot.pose)
+        self.assertIsNone(self.robot.gyro)
+        self.assertAlmostEqual(self.robot.lift_height.distance_mm, robot.MIN_LIFT_HEIGHT_MM)
+
+    def test_values_built_when_read(self):
+        self.robot._recv_msg_robot_state(None, msg=make_state(
+                headAngle_rad=0.25, liftHeight_mm=60.0, leftWheelSpeed_mmps=12.0,
+                pose=_clad_to_game_anki.PoseStruct3d(x=10.0, q0=1.0, originID=3)))
+        self.assertNotIn('pose', self.robot._robot_state_values)
+        self.assertAlmostEqual(self.robot.head_angle.radians, 0.25)
+        self.assertAlmostEqual(self.robot.lift_height.distance_mm, 60.0)
+        self.assertAlmostEqual(self.robot.left_wheel_speed.speed_mmps, 12.0)
+        self.assertAlmostEqual(self.robot.pose.position.x, 10.0)
+        self.assertEqual(self.robot.pose.origin_id, 3)
+        self.assertIs(self.robot.pose, self.robot.pose)
+
+        self.robot._recv_msg_robot_state(None, msg=make_state(headAngle_rad=-0.1))
+        self.assertAlmostEqual(self.robot.head_angle.radians, -0.1)
+        self.assertAlmostEqual(self.robot.pose.position.x, 0.0)
+
+    def test_every_update_dispatched_by_default(self):
+        for i in range(5):
+            self.robot._recv_msg_robot_state(None, msg=make_state(headAngle_rad=i * 0.1))
+        self.assertEqual(len(self.updates), 5)
+
+    def test_coalesced_updates(self):
+        self.robot.robot_state_event_rate = 20
+        for i in range(5):
+            self.robot._recv_msg_robot_state(None, msg=make_state(headAngle_rad=i * 0.1))
+        self.assertEqual(len(self.updates), 1)
+
+        self.loop.run_until_complete(asyncio.sleep(0.1))
+        self.assertEqual(len(self.updates), 2)
+        self.assertAlmostEqual(self.updates[1], 0.4)
+
+    def test_pending_update_cancelled(self):
+        for stop in (lambda: setattr(self.robot, 'robot_state_event_rate', None),
+                     self.robot._stop_dispatcher):
+            self.updates = []
+            self.robot.robot_state_event_rate = 20
+            self.robot._robot_state_event_time = None
+            for i in range(2):
+                self.robot._recv_msg_robot_state(None, msg=make_state(headAngle_rad=i * 0.1))
+            stop()
+            self.assertIsNone(self.robot._robot_state_event_handle)
+            self.loop.run_until_complete(asyncio.sleep(0.1))
+            self.assertEqual(len(self.updates), 1)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            self.robot.robot_state_event_rate = 0
+
+
+class TelemetryTests(unittest.TestCase):
+    def setUp(self):
+        self.recorder = telemetry.TelemetryRecorder(capacity=8)
+
+    def record(self, count, start=0):
+        for i in range(start, start + count):
+            self.recorder.record(i * 0.1, make_state(headAngle_rad=i * 0.01, liftHeight_mm=40.0 + i))
+
+    def test_last_before_full(self):
+        self.record(3)
+        window = self.recorder.last()
+        self.assertEqual(len(window), 3)
+        self.assertEqual(list(window['lift_height']), [40.0, 41.0, 42.0])
+
+    def test_last_after_wrapping(self):
+        self.record(13)
+        self.assertEqual(len(self.recorder), 8)
+        window = self.recorder.last()
+        self.assertEqual(list(window['lift_height']), [40.0 + i for i in range(5, 13)])
+        self.assertIsNotNone(window['lift_height'].base)
+        self.assertFalse(window['lift_height'].flags.writeable)
+
+        self.assertEqual(list(self.recorder.last(samples=2)['lift_height']), [51.0, 52.0])
+        self.assertEqual(list(self.recorder.last(seconds=0.25)['lift_height']), [50.0, 51.0, 52.0])
+
+    def test_derivative(self):
+        self.record(5)
+        window = self.recorder.last()
+        for rate in window.derivative('lift_height'):
+            self.assertAlmostEqual(rate, 10.0)
+        for rate in window.derivative('head_angle'):
+            self.assertAlmostEqual(rate, 0.1)
+
+    def test_angle_derivative_unwrapped(self):
+        for i, angle in enumerate((3.0, 3.1, -3.1, -3.0)):
+            self.recorder.record(i * 0.1, make_state(poseAngle_rad=angle))
+        window = self.recorder.last()
+        self.assertTrue(all(0.5 < r < 2.0 for r in window.derivative('pose_angle')))
+
+    def test_resample(self):
+        self.record(5)
+        window = self.recorder.last().resample(20)
+        self.assertEqual(len(window), 9)
+        self.assertAlmostEqual(window['lift_height'][1], 40.5)
+        self.assertAlmostEqual(window.time[-1], 0.4)
+
+    def test_robot_records_when_enabled(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        r = robot.Robot(FakeConn(), 1, True, loop=loop)
+        r._recv_msg_robot_state(None, msg=make_state())
+        recorder = r.enable_telemetry(capacity=4)
+        r._recv_msg_robot_state(None, msg=make_state(headAngle_rad=0.3))
+        self.assertEqual(len(recorder), 1)
+        self.assertAlmostEqual(recorder.last()['head_angle'][0], 0.3)
+        r.disable_telemetry()
+        self.assertIsNone(r.telemetry)
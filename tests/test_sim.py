@@ -0,0 +1,139 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import collections
+import unittest
+
+import cozmoclad
+
+from cozmo import clad_protocol
+from cozmo import sim
+from cozmo._clad import _clad_to_engine_cozmo, _clad_to_engine_iface
+from cozmo._clad import _clad_to_game_cozmo, _clad_to_game_iface
+
+
+class ClientProtocol(clad_protocol.CLADProtocol):
+    '''Records the messages received from the simulated engine.'''
+    clad_decode_union = _clad_to_game_iface.MessageEngineToGame
+    clad_encode_union = _clad_to_engine_iface.MessageGameToEngine
+
+    def __init__(self):
+        super().__init__()
+        self.received = collections.defaultdict(list)
+        self.updated = asyncio.Event()
+
+    def msg_received(self, msg):
+        self.received[msg.tag_name].append(msg._data)
+        self.updated.set()
+
+    async def wait_until(self, predicate, timeout=2):
+        async def wait():
+            while not predicate():
+                self.updated.clear()
+                await self.updated.wait()
+        await asyncio.wait_for(wait(), timeout)
+
+
+class SimulatedEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.engine = sim.SimulatedEngine(self.loop, robot_state_rate=100, ping_interval=0.02,
+                                          image_rate=50, action_duration=0.05)
+        self.loop.run_until_complete(self.engine.start())
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.engine.close())
+        self.loop.close()
+
+    def run_client(self, client_coro, count=1):
+        async def run_one():
+            transport, client = await self.loop.create_connection(
+                ClientProtocol, self.engine.host, self.engine.port)
+            try:
+                await client.wait_until(lambda: client.received['UiDeviceConnected'])
+                msg = client.received['UiDeviceConnected'][0]
+                cozmoclad.assert_clad_match(msg.toGameCLADHash, msg.toEngineCLADHash)
+                client.send_msg(_clad_to_engine_iface.UiDeviceConnectionSuccess(
+                    connectionType=msg.connectionType, deviceID=msg.deviceID))
+                return await client_coro(client)
+            finally:
+                transport.close()
+
+        async def run_all():
+            return await asyncio.gather(*[run_one() for _ in range(count)])
+
+        return self.loop.run_until_complete(run_all())
+
+    def test_robot_state_and_ping(self):
+        async def client_coro(client):
+            await client.wait_until(lambda: len(client.received['RobotState']) >= 5
+                                    and client.received['Ping'])
+            ping = client.received['Ping'][0]
+            self.assertFalse(ping.isResponse)
+            client.send_msg(_clad_to_engine_iface.Ping(counter=ping.counter,
+                                                       timeSent_ms=ping.timeSent_ms, isResponse=True))
+            client.send_msg(_clad_to_engine_iface.RequestAvailableAnimations())
+            await client.wait_until(lambda: client.received['EndOfMessage'])
+            return client.received
+
+        received = self.run_client(client_coro)[0]
+        self.assertEqual([m.animName for m in received['AnimationAvailable']],
+                         list(sim._DEFAULT_ANIMATION_NAMES))
+        self.assertEqual(len(self.engine.ping_latencies), 1)
+
+    def test_actions(self):
+        async def client_coro(client):
+            turn = _clad_to_engine_iface.RobotActionUnion(turnInPlace=_clad_to_engine_iface.TurnInPlace())
+            client.send_msg(_clad_to_engine_iface.QueueSingleAction(idTag=7, action=turn))
+            client.send_msg(_clad_to_engine_iface.QueueSingleAction(idTag=8, action=turn))
+            client.send_msg(_clad_to_engine_iface.CancelActionByIdTag(idTag=8))
+            await client.wait_until(lambda: len(client.received['RobotCompletedAction']) == 2)
+            return [(m.idTag, m.result) for m in client.received['RobotCompletedAction']]
+
+        results = self.run_client(client_coro)[0]
+        self.assertEqual(results, [(8, _clad_to_game_cozmo.ActionResult.CANCELLED_WHILE_RUNNING),
+                                   (7, _clad_to_game_cozmo.ActionResult.SUCCESS)])
+
+    @unittest.skipIf(sim.Image is None, 'Pillow not installed')
+    def test_image_stream(self):
+        async def client_coro(client):
+            client.send_msg(_clad_to_engine_iface.ImageRequest(
+                mode=_clad_to_engine_cozmo.ImageSendMode.Stream))
+            await client.wait_until(lambda: len(client.received['ImageChunk']) >= 3
+                                    and client.received['ImageChunk'][-1].imageId > 1)
+            return client.received['ImageChunk']
+
+        chunks = self.run_client(client_coro)[0]
+        first = [c for c in chunks if c.imageId == 1]
+        self.assertEqual([c.chunkId for c in first], list(range(first[0].imageChunkCount)))
+        jpeg = bytes(b for c in first for b in c.data)
+        self.assertEqual(jpeg, self.engine._get_jpeg(_clad_to_game_cozmo.ImageResolution.QVGA))
+
+    def test_concurrent_robots(self):
+        # Clients disconnect as they finish, so remember that all were connected
+        all_connected = []
+
+        def ready(client):
+            if len(self.engine.robots) == 8:
+                all_connected.append(True)
+            return len(client.received['RobotState']) >= 3 and all_connected
+
+        async def client_coro(client):
+            await client.wait_until(lambda: ready(client))
+            return client.received['RobotState'][-1].batteryVoltage
+
+        self.assertEqual(self.run_client(client_coro, count=8), [4.5] * 8)
+        self.loop.run_until_complete(asyncio.sleep(0.01))
+        self.assertEqual(self.engine.robots, [])
@@ -0,0 +1,172 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import io
+import unittest
+
+from PIL import Image
+
+from cozmo import annotate
+from cozmo import event
+from cozmo import streaming
+from cozmo import world
+
+
+class World(event.Dispatcher):
+    def __init__(self, loop):
+        super().__init__(loop=loop)
+        self.visible_objects = []
+        self.visible_faces = []
+        self.visible_pets = []
+
+
+class Frame:
+    def __init__(self, jpeg_bytes, is_color_image=False):
+        self.jpeg_bytes = jpeg_bytes
+        self.is_color_image = is_color_image
+        self.image = Image.open(io.BytesIO(jpeg_bytes))
+        if is_color_image:
+            self.image = self.image.resize((320, 240))
+
+
+def make_jpeg(color, size=(320, 240)):
+    buf = io.BytesIO()
+    Image.new('RGB', size, color).save(buf, 'JPEG')
+    return buf.getvalue()
+
+
+class MJPEGServerTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.world = World(self.loop)
+        self.annotator = annotate.ImageAnnotator(self.world, loop=self.loop)
+        self.jpegs = [make_jpeg((i * 60, 0, 0)) for i in range(4)]
+        self.server = streaming.MJPEGServer(self.world)
+        self.loop.run_until_complete(self.server.start())
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.server.close())
+        self.loop.close()
+
+    def new_image(self, i):
+        image = world.CameraImage(None, self.annotator, i, frame=Frame(self.jpegs[i]))
+        self.world.dispatch_event(world.EvtNewCameraImage, image=image)
+
+    async def connect(self, path):
+        reader, writer = await asyncio.open_connection(self.server.host, self.server.port)
+        writer.write(('GET %s HTTP/1.1\r\nHost: localhost\r\n\r\n' % path).encode('ascii'))
+        status = await reader.readline()
+        headers = await reader.readuntil(b'\r\n\r\n')
+        return reader, writer, status, headers
+
+    async def read_part(self, reader):
+        self.assertEqual(await reader.readline(), b'--frame\r\n')
+        headers = await reader.readuntil(b'\r\n\r\n')
+        length = int(headers.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+
+    async def wait_for_clients(self, count):
+        while len(self.server.clients) != count:
+            await asyncio.sleep(0.01)
+
+    def test_stream_to_many_clients(self):
+        async def run():
+            clients = [await self.connect('/stream.mjpg') for _ in range(3)]
+            for _, _, status, headers in clients:
+                self.assertEqual(status, b'HTTP/1.0 200 OK\r\n')
+                self.assertIn(b'multipart/x-mixed-replace; boundary=frame', headers)
+            await self.wait_for_clients(3)
+            for i in range(3):
+                self.new_image(i)
+                for reader, _, _, _ in clients:
+                    self.assertEqual(await self.read_part(reader), self.jpegs[i])
+            for _, writer, _, _ in clients:
+                writer.close()
+            await self.wait_for_clients(0)
+        self.loop.run_until_complete(run())
+        # the robot's JPEG data was passed through
+        self.assertEqual(self.server.frames_encoded, 0)
+
+    def test_new_client_gets_latest_image(self):
+        async def run():
+            self.new_image(1)
+            reader, writer, _, _ = await self.connect('/stream.mjpg')
+            self.assertEqual(await self.read_part(reader), self.jpegs[1])
+            await self.wait_for_clients(1)
+            client = self.server.clients[0]
+            self.assertEqual(client.frames_sent, 1)
+            self.assertGreaterEqual(client.lag, 0)
+            writer.close()
+        self.loop.run_until_complete(run())
+
+    def test_snapshot(self):
+        async def run():
+            reader, writer, status, _ = await self.connect('/snapshot.jpg')
+            self.assertEqual(status, b'HTTP/1.0 503 Service Unavailable\r\n')
+            writer.close()
+            self.new_image(2)
+            reader, writer, status, headers = await self.connect('/snapshot.jpg')
+            self.assertEqual(status, b'HTTP/1.0 200 OK\r\n')
+            self.assertEqual(await reader.read(), self.jpegs[2])
+            writer.close()
+            reader, writer, status, _ = await self.connect('/missing')
+            self.assertEqual(status, b'HTTP/1.0 404 Not Found\r\n')
+            writer.close()
+        self.loop.run_until_complete(run())
+
+    def test_scaled_images_encoded_once(self):
+        self.server.scale = 0.5
+        async def run():
+            clients = [await self.connect('/stream.mjpg') for _ in range(2)]
+            await self.wait_for_clients(2)
+            self.new_image(3)
+            for reader, writer, _, _ in clients:
+                image = Image.open(io.BytesIO(await self.read_part(reader)))
+                self.assertEqual(image.size, (160, 120))
+                writer.close()
+        self.loop.run_until_complete(run())
+        self.assertEqual(self.server.frames_encoded, 1)
+
+    def test_color_images_encoded_full_width(self):
+        async def run():
+            reader, writer, _, _ = await self.connect('/stream.mjpg')
+            await self.wait_for_clients(1)
+            # color images are received at half width
+            frame = Frame(make_jpeg((0, 120, 0), size=(160, 240)), is_color_image=True)
+            image = world.CameraImage(None, self.annotator, 0, frame=frame)
+            self.world.dispatch_event(world.EvtNewCameraImage, image=image)
+            image = Image.open(io.BytesIO(await self.read_part(reader)))
+            self.assertEqual(image.size, (320, 240))
+            writer.close()
+        self.loop.run_until_complete(run())
+        self.assertEqual(self.server.frames_encoded, 1)
+
+    def test_slow_client_drops_oldest_frames(self):
+        async def run():
+            reader, writer, _, _ = await self.connect('/stream.mjpg')
+            await self.wait_for_clients(1)
+            client = self.server.clients[0]
+            # as if the client's connection had stopped accepting data
+            client.pause_writing()
+            for i in range(4):
+                self.new_image(i)
+            self.assertEqual((client.frames_sent, client.frames_dropped, client.queued_frames), (0, 2, 2))
+            client.resume_writing()
+            self.assertEqual(await self.read_part(reader), self.jpegs[2])
+            self.assertEqual(await self.read_part(reader), self.jpegs[3])
+            self.assertEqual(client.frames_sent, 2)
+            writer.close()
+        self.loop.run_until_complete(run())
@@ -0,0 +1,127 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import random
+import unittest
+
+import numpy as np
+
+from cozmo import util
+
+
+def random_poses(rng, count, origin_id=1):
+    return [util.pose_z_angle(rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(0, 50),
+                              util.radians(rng.uniform(-math.pi, math.pi)), origin_id=origin_id)
+            for _ in range(count)]
+
+
+class ValueTypeTests(unittest.TestCase):
+    def test_operators(self):
+        angle = util.degrees(90) + util.radians(math.pi / 2) - util.degrees(45)
+        self.assertIsInstance(angle, util.Angle)
+        self.assertAlmostEqual(angle.degrees, 135)
+        self.assertIsInstance((angle * 2).radians, float)
+        self.assertAlmostEqual((util.degrees(-30)).abs_value.degrees, 30)
+        self.assertAlmostEqual((util.distance_mm(10) * 2 + util.distance_inches(1)).distance_mm, 45.4)
+        self.assertAlmostEqual((util.speed_mmps(50) - util.speed_mmps(20)).speed_mmps / 3, 10)
+        vector = util.Vector3(1, 2, 3) + util.Vector3(1, 1, 1) * 2
+        self.assertEqual(vector.x_y_z, (3, 4, 5))
+
+    def test_pose_operators(self):
+        a = util.pose_z_angle(10, 20, 0, util.degrees(30), origin_id=2)
+        b = util.pose_z_angle(1, 2, 3, util.degrees(15), origin_id=2)
+        total = a + b
+        self.assertIsInstance(total.position, util.Position)
+        self.assertEqual(total.position.x_y_z, (11, 22, 3))
+        self.assertAlmostEqual(total.rotation.angle_z.degrees, 45)
+        self.assertEqual(total.origin_id, 0)
+        relative = a.define_pose_relative_this(b)
+        self.assertEqual(relative.origin_id, 2)
+        self.assertAlmostEqual(relative.rotation.angle_z.degrees, 45)
+        self.assertAlmostEqual(relative.position.x, 10 + math.cos(math.radians(30)) - 2 * math.sin(math.radians(30)))
+        self.assertTrue(relative.is_comparable(a))
+        self.assertTrue(relative.is_accurate)
+
+    def test_slots(self):
+        for value in (util.degrees(1), util.distance_mm(1), util.speed_mmps(1), util.Vector2(1, 2),
+                      util.Position(1, 2, 3), util.rotation_z_angle(util.degrees(1)),
+                      util.pose_z_angle(1, 2, 3, util.degrees(1))):
+            with self.assertRaises(AttributeError):
+                value.extra = 1
+
+
+class PoseArrayTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.poses = random_poses(rng, 20)
+        self.robot = random_poses(rng, 1)[0]
+        self.array = util.PoseArray.from_poses(self.poses)
+
+    def assertPosesAlmostEqual(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            np.testing.assert_allclose(a.position.x_y_z, e.position.x_y_z, atol=1e-9)
+            self.assertAlmostEqual(a.rotation.angle_z.radians, e.rotation.angle_z.radians)
+            self.assertEqual(a.origin_id, e.origin_id)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.array), 20)
+        self.assertEqual(self.array.data.shape, (20, 7))
+        self.assertPosesAlmostEqual(self.array.to_poses(), self.poses)
+        self.assertPosesAlmostEqual([self.array[3]], [self.poses[3]])
+        self.assertPosesAlmostEqual(self.array[2:5].to_poses(), self.poses[2:5])
+        np.testing.assert_allclose(self.array.angle_z, [p.rotation.angle_z.radians for p in self.poses])
+
+    def test_compose_matches_define_pose_relative_this(self):
+        expected = [self.robot.define_pose_relative_this(p) for p in self.poses]
+        robot = util.PoseArray.from_poses([self.robot] * len(self.poses))
+        self.assertPosesAlmostEqual(robot.compose(self.array).to_poses(), expected)
+
+        # a single Pose is applied to every row
+        expected = [p.define_pose_relative_this(self.robot) for p in self.poses]
+        self.assertPosesAlmostEqual(self.array.compose(self.robot).to_poses(), expected)
+
+    def test_inverse_and_relative_to(self):
+        identity = self.array.compose(self.array.inverse())
+        np.testing.assert_allclose(identity.positions, 0, atol=1e-9)
+        np.testing.assert_allclose(np.abs(identity.quaternions[:, 0]), 1)
+
+        relative = self.array.relative_to(self.robot)
+        back = [self.robot.define_pose_relative_this(p) for p in relative.to_poses()]
+        self.assertPosesAlmostEqual(back, self.poses)
+
+    def test_distance_and_angle(self):
+        expected = [math.sqrt(sum((a - b) ** 2 for a, b in zip(p.position.x_y_z, self.robot.position.x_y_z)))
+                    for p in self.poses]
+        np.testing.assert_allclose(self.array.distance_to(self.robot), expected)
+
+        turned = [util.pose_z_angle(0, 0, 0, p.rotation.angle_z + util.degrees(30)) for p in self.poses]
+        angles = self.array.angle_to(util.PoseArray.from_poses(turned))
+        np.testing.assert_allclose(angles, math.radians(30))
+
+    def test_to_matrices(self):
+        matrices = self.array.to_matrices()
+        for pose, matrix in zip(self.poses, matrices):
+            np.testing.assert_allclose(matrix.ravel(), pose.to_matrix().in_row_order, atol=1e-9)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            util.PoseArray.from_poses(self.poses + random_poses(random.Random(1), 1, origin_id=2))
+        with self.assertRaises(ValueError):
+            util.PoseArray(np.zeros((3, 6)))
+        with self.assertRaises(ValueError):
+            self.array.compose(self.array[:5])
+        with self.assertRaises(TypeError):
+            self.array.distance_to((0, 0, 0))